@@ -0,0 +1,168 @@
+"""
+ParentBud Article Store
+-----------------------
+One store of extracted articles shared by every pipeline.
+
+scraper_v2, curated_scraper, suggested_articles_scraper, scraper.py,
+enhanced_scraper_v2 and enhanced_card_generator list many of the same
+pages. Each used to download and extract its own copy and keep it in its
+own format (data/raw, data/suggested_articles, data/url_cache). Now an
+article extracted by the shared extraction chain (extraction) is stored
+once and is a hit for all:
+
+- By canonical URL (url_index.page_key): get(url) returns the page's
+  article without a download while it is fresher than FRESH_TTL - the
+  same freshness as a cached page, so revalidation (http_cache) keeps
+  working once it expires
+- By content hash (SHA-256 of the page HTML): find(url, html) returns
+  the article already extracted from identical HTML - a re-downloaded
+  page that hasn't changed, or the same page under another URL - so it
+  is never extracted twice
+
+Articles live in the page cache (key "article:<content hash>", kept for
+ARTICLE_TTL); the URL → content hash index is saved to
+data/article_store.json - the hash lives there, never in the article, so
+a stored article has the same keys as a freshly extracted one. With
+page_cache.ENABLED = False (--refresh)
+only articles stored during this run are served.
+
+Only the extraction chain put()s articles - they carry its cleaned text,
+authors, publish_date and top_image. The cruder extractors of
+enhanced_scraper_v2 and enhanced_card_generator read from the store but
+never write to it, so no pipeline's output depends on which one ran
+first.
+
+Usage:
+    article = article_store.get(url)                # None → download
+    article = article_store.find(url, html)         # None → extract
+    article_store.put(url, html, article)
+"""
+
+import atexit
+import hashlib
+import os
+import threading
+import time
+
+import page_cache
+import shared_index
+import url_index
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+INDEX_FILE = os.path.join(BASE_DIR, "data", "article_store.json")
+
+FRESH_TTL = page_cache.PAGE_TTL        # get(url) serves articles this young without a download
+ARTICLE_TTL = page_cache.EXTRACT_TTL   # Articles are kept (and found by content hash) this long
+MIN_TEXT_CHARS = 300                   # Thinner extractions aren't shared
+
+# ─────────────────────────────────────────────────────────────
+# INDEX (persisted)
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_index = None   # {page key: {'hash', 'method', 'stored_at', 'expires_at'}}
+_stats = {'url_hits': 0, 'content_hits': 0, 'stored': 0}
+_changes = shared_index.Changes()
+
+
+def _load():
+    global _index
+    if _index is None:
+        _index = shared_index.load(INDEX_FILE)
+        _drop_expired(_index)
+    return _index
+
+
+def _drop_expired(entries):
+    now = time.time()
+    for key in [k for k, e in entries.items() if e['expires_at'] <= now]:
+        del entries[key]
+
+
+def save():
+    """Write the URL index to disk (merged with other processes' changes)"""
+    global _index
+    with _lock:
+        if not _changes:
+            return
+        _index = shared_index.merge_save(INDEX_FILE, _index, _changes, prepare=_drop_expired, indent=2)
+
+
+atexit.register(save)
+
+
+def content_hash(html):
+    """SHA-256 of a page's HTML"""
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+def _article(digest):
+    return page_cache.get_json(f"article:{digest}")
+
+
+# ─────────────────────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────────────────────
+def get(url, max_age=FRESH_TTL):
+    """The article stored for url's page if it is younger than max_age, else None"""
+    with _lock:
+        entry = _load().get(url_index.page_key(url))
+    if entry is None or entry['stored_at'] < time.time() - max_age:
+        return None
+    article = _article(entry['hash'])
+    if article is not None:
+        with _lock:
+            _stats['url_hits'] += 1
+    return article
+
+
+def find(url, html):
+    """The article already extracted from this exact HTML (under any URL), else None"""
+    if not html:
+        return None
+    digest = content_hash(html)
+    article = _article(digest)
+    if article is None:
+        return None
+    _index_url(url, digest, article)
+    with _lock:
+        _stats['content_hits'] += 1
+    return article
+
+
+def put(url, html, article):
+    """Store an article the extraction chain extracted from html for url's page"""
+    if not html or not article or len(article.get('text', '')) < MIN_TEXT_CHARS:
+        return
+    digest = content_hash(html)
+    page_cache.put_json(f"article:{digest}", article, ttl=ARTICLE_TTL)
+    _index_url(url, digest, article)
+    with _lock:
+        _stats['stored'] += 1
+
+
+def _index_url(url, digest, article):
+    """Point url's page at the article with this content hash (refreshing its age)"""
+    key = url_index.page_key(url)
+    now = time.time()
+    with _lock:
+        index = _load()
+        index[key] = {
+            'hash': digest,
+            'method': article.get('method'),
+            'stored_at': now,
+            'expires_at': now + ARTICLE_TTL,
+        }
+        _changes.set(key)
+
+
+def print_store_stats():
+    """Print how many articles came from the shared store instead of a download or extraction"""
+    with _lock:
+        stats = dict(_stats)
+    if any(stats.values()):
+        print(f"   📚 Article store: {stats['url_hits']} pages served without a download, "
+              f"{stats['content_hits']} unchanged pages not re-extracted, "
+              f"{stats['stored']} articles stored")
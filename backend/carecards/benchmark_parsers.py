@@ -0,0 +1,154 @@
+"""
+ParentBud Parser Benchmark
+--------------------------
+Compares the html_parsers backends on saved pages: per-page parse +
+main-content extraction time, and peak memory.
+
+Each backend runs in its own fresh process, so RSS growth isn't shared
+between them. "Py peak" is the largest Python-heap peak for a single page
+(tracemalloc - BeautifulSoup trees live here); "RSS growth" also covers
+lxml's C allocations.
+
+Usage:
+    python3 benchmark_parsers.py                      # Pages from data/page_cache
+    python3 benchmark_parsers.py saved/ page.html     # Saved HTML files / folders
+    python3 benchmark_parsers.py --repeat 5 --limit 50
+"""
+
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+import html_parsers
+import page_cache
+from html_parsers import CONTENT_SELECTORS
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+DEFAULT_REPEAT = 3
+DEFAULT_LIMIT = 200
+
+
+# ─────────────────────────────────────────────────────────────
+# PAGES
+# ─────────────────────────────────────────────────────────────
+def load_pages(paths, limit):
+    """[(name, html)] from files/folders, or from the page cache when no paths are given"""
+    pages = []
+    if paths:
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files += sorted(os.path.join(path, f) for f in os.listdir(path)
+                                if f.endswith(('.html', '.htm')))
+            else:
+                files.append(path)
+        for file_path in files[:limit]:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append((os.path.basename(file_path), f.read()))
+    else:
+        for url in page_cache.page_urls()[:limit]:
+            html = page_cache.get_page(url)
+            if html:
+                pages.append((url, html))
+    return pages
+
+
+# ─────────────────────────────────────────────────────────────
+# MEASUREMENT (runs in a child process per backend)
+# ─────────────────────────────────────────────────────────────
+def _extract(html, backend):
+    page = html_parsers.parse(html, backend=backend)
+    return page.text(page.main(CONTENT_SELECTORS))
+
+
+def _measure(backend, pages, repeat, results):
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Timing pass (no tracemalloc - it slows allocation-heavy parsers down)
+    times = []
+    chars = 0
+    for _, html in pages:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            text = _extract(html, backend)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        times.append(best)
+        chars += len(text)
+
+    # Memory pass
+    tracemalloc.start()
+    py_peak = 0
+    for _, html in pages:
+        tracemalloc.reset_peak()
+        _extract(html, backend)
+        py_peak = max(py_peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    rss_growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+    results.put({
+        'times': times,
+        'chars': chars,
+        'py_peak': py_peak,
+        'rss_growth': rss_growth_kb * 1024,
+    })
+
+
+def run_backend(backend, pages, repeat):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    worker = context.Process(target=_measure, args=(backend, pages, repeat, results))
+    worker.start()
+    result = results.get()
+    worker.join()
+    return result
+
+
+# ─────────────────────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────────────────────
+def _option(args, name, default):
+    if name in args:
+        i = args.index(name)
+        value = int(args[i + 1])
+        del args[i:i + 2]
+        return value
+    return default
+
+
+def main():
+    args = sys.argv[1:]
+    repeat = _option(args, '--repeat', DEFAULT_REPEAT)
+    limit = _option(args, '--limit', DEFAULT_LIMIT)
+
+    pages = load_pages(args, limit)
+    if not pages:
+        print("❌ No pages to benchmark - run a scraper first or pass saved HTML files")
+        return
+
+    total_kb = sum(len(html.encode('utf-8')) for _, html in pages) / 1024
+    print(f"\n⏱️  Parser benchmark: {len(pages)} pages ({total_kb:.0f} KB), best of {repeat}")
+    backends = [b for b in html_parsers.BACKENDS if b == 'html.parser' or html_parsers.HAS_LXML]
+    if not html_parsers.HAS_LXML:
+        print("   ⚠️  lxml not installed - only html.parser is measured")
+
+    print(f"\n   {'Backend':<12} {'Mean ms':>9} {'Median':>9} {'p95':>9} {'Py peak':>10} {'RSS growth':>11} {'Text chars':>11}")
+    print(f"   {'-' * 77}")
+    for backend in backends:
+        r = run_backend(backend, pages, repeat)
+        times_ms = sorted(t * 1000 for t in r['times'])
+        p95 = times_ms[min(len(times_ms) - 1, int(len(times_ms) * 0.95))]
+        print(f"   {backend:<12} {statistics.mean(times_ms):>9.2f} {statistics.median(times_ms):>9.2f} "
+              f"{p95:>9.2f} {r['py_peak'] / 1024 / 1024:>8.1f}MB {r['rss_growth'] / 1024 / 1024:>9.1f}MB "
+              f"{r['chars']:>11}")
+
+
+if __name__ == '__main__':
+    main()
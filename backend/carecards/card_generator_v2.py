@@ -52,6 +52,29 @@ if OPENAI_API_KEY:
 else:
     print("⚠️  OPENAI_API_KEY not set, using fallback templates")
 
+# ─────────────────────────────────────────────────────────────
+# NLP SUMMARIES (OPTIONAL)
+# ─────────────────────────────────────────────────────────────
+NLP_SUMMARIES = True   # --no-nlp: lead text only
+_extraction = None     # extraction pulls in newspaper/readability/lxml - imported on first NLP summary
+
+
+def article_summary(article: Dict) -> str:
+    """The article's NLP summary (computed on first read by extraction.get_summary), or its lead text"""
+    global _extraction
+    if not NLP_SUMMARIES:
+        return article.get('summary') or article.get('text', '')[:500]
+    if _extraction is None:
+        import extraction
+        _extraction = extraction
+    return _extraction.get_summary(article)
+
+
+def print_summary_stats():
+    if _extraction is not None:
+        _extraction.print_summary_stats()
+
+
 # ─────────────────────────────────────────────────────────────
 # TOPIC METADATA
 # ─────────────────────────────────────────────────────────────
@@ -1584,7 +1607,7 @@ def generate_cards_with_ai(articles: List[Dict], topic_id: str, count: int = 10)
         source_urls.append(article.get('url', ''))
         title = article.get('title', 'Untitled')
         text = article.get('text', '')[:1500]  # First 1500 chars
-        summary = article.get('summary', '')[:500]
+        summary = article_summary(article)[:500]  # NLP summary, computed on first read
         context_text += f"\n\n### Article {i+1}: {title}\n{summary}\n{text}"
     
     metadata = TOPIC_METADATA.get(topic_id, {"title": topic_id.replace('_', ' ').title(), "emoji": "📖"})
@@ -1816,6 +1839,7 @@ def generate_all_cards(use_ai: bool = True):
         print(f"   {title}: {len(cards)} cards | Ages: [{ages_str}]")
     print(f"\n   Total: {total} cards generated")
     print(f"   Saved to: {CARDS_DIR}")
+    print_summary_stats()
     
     return all_cards
 
@@ -1845,10 +1869,16 @@ def get_cards_for_age(age_group: str, topic_id: Optional[str] = None, count: int
 if __name__ == '__main__':
     import sys
     
-    if len(sys.argv) > 1:
-        topic = sys.argv[1]
+    args = sys.argv[1:]
+    if '--no-nlp' in args:
+        args.remove('--no-nlp')
+        NLP_SUMMARIES = False  # Lead text only - extraction is never imported
+    
+    if args:
+        topic = args[0]
         if topic in TOPIC_METADATA:
             generate_topic_cards(topic)
+            print_summary_stats()
         else:
             print(f"Unknown topic: {topic}")
             print(f"Available: {list(TOPIC_METADATA.keys())}")
@@ -0,0 +1,92 @@
+"""
+ParentBud Circuit Breaker
+-------------------------
+Per-domain circuit breaker used by http_pool.
+
+After FAILURE_THRESHOLD consecutive failures (timeouts, connection errors,
+5xx) a domain's circuit opens: requests to it fail immediately with
+CircuitOpenError for COOL_DOWN seconds instead of each waiting out a full
+timeout. After the cool-down one probe request is let through - success
+closes the circuit, another failure opens it again.
+
+Usage:
+    circuit_breaker.check(url)              # raises CircuitOpenError while open
+    circuit_breaker.record_success(url)
+    circuit_breaker.record_failure(url)
+"""
+
+import threading
+import time
+
+import requests
+
+from fetch_engine import domain_of
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+FAILURE_THRESHOLD = 3   # Consecutive failures before a domain is skipped
+COOL_DOWN = 120         # Seconds a tripped domain is skipped
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request to a domain that keeps failing"""
+
+
+# ─────────────────────────────────────────────────────────────
+# STATE
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_circuits = {}   # {domain: {'failures', 'opened_at', 'probing'}}
+_stats = {'tripped': 0, 'skipped': 0}
+
+
+def _circuit(domain):
+    return _circuits.setdefault(domain, {'failures': 0, 'opened_at': None, 'probing': False})
+
+
+def check(url):
+    """Raise CircuitOpenError if url's domain is cooling down"""
+    domain = domain_of(url)
+    with _lock:
+        circuit = _circuit(domain)
+        if circuit['opened_at'] is None:
+            return
+        cooling = time.monotonic() - circuit['opened_at'] < COOL_DOWN
+        if cooling or circuit['probing']:
+            _stats['skipped'] += 1
+            raise CircuitOpenError(f"circuit open: {domain}")
+        circuit['probing'] = True  # Half-open: let this one request through
+
+
+def record_success(url):
+    with _lock:
+        circuit = _circuit(domain_of(url))
+        circuit.update(failures=0, opened_at=None, probing=False)
+
+
+def record_failure(url):
+    domain = domain_of(url)
+    with _lock:
+        circuit = _circuit(domain)
+        circuit['failures'] += 1
+        if circuit['probing'] or circuit['failures'] >= FAILURE_THRESHOLD:
+            if circuit['opened_at'] is None:
+                _stats['tripped'] += 1
+                print(f"   🔌 {domain} keeps failing - skipping it for {COOL_DOWN}s")
+            circuit.update(opened_at=time.monotonic(), probing=False)
+
+
+def is_open(url):
+    """True while url's domain is being skipped"""
+    with _lock:
+        circuit = _circuits.get(domain_of(url))
+        return bool(circuit and circuit['opened_at'] is not None)
+
+
+def print_breaker_stats():
+    """Print how many domains tripped and how many requests were skipped"""
+    with _lock:
+        stats = dict(_stats)
+    if stats['tripped']:
+        print(f"   ⚡ Circuit breaker: {stats['tripped']} domains tripped, {stats['skipped']} requests skipped")
@@ -0,0 +1,249 @@
+"""
+ParentBud Crawl Frontier
+------------------------
+Priority-ordered crawl frontier for scraper.py's link discovery.
+
+Instead of collecting every article-looking link into a set and taking
+the first few in arbitrary order, candidate links go into a priority
+queue ranked by:
+
+- Article-likeness of the URL (article/advice/guide paths, a multi-word
+  slug) minus listing/utility pages (tags, categories, search, login)
+- Topic keywords in the URL slug and in the link's anchor text
+
+The best candidates are crawled first, links are followed up to
+MAX_DEPTH hops from the seed pages, and the caller stops popping as soon
+as it has enough articles.
+
+Article pages that were already crawled for a scope (a topic, or 'all')
+are remembered in data/crawl_seen.json for SEEN_TTL, so later runs skip
+them and spend their requests on pages they haven't seen. Only pages that
+produced an article are marked: hub and listing pages (/toddler/, tag
+pages) keep being crawled, since that is where new articles show up.
+
+Usage:
+    frontier = Frontier(topic['keywords'], scope=topic['id'])
+    frontier.add_seed(seed_url, source)
+    while frontier:
+        for entry in frontier.pop_batch(CRAWL_BATCH):
+            ...                                     # fetch, extract
+            frontier.add_links(links, entry['depth'] + 1, entry['source'])
+            if article:
+                frontier.mark_seen(entry['url'])
+"""
+
+import atexit
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from urllib.parse import urljoin, urlparse
+
+import html_parsers
+from fetch_engine import domain_of
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+SEEN_FILE = os.path.join(BASE_DIR, "data", "crawl_seen.json")
+
+MAX_DEPTH = 2            # Hops from a seed page that are still crawled
+MAX_QUEUED = 2000        # Candidates kept per frontier (lowest scores dropped)
+SEEN_TTL = 14 * 24 * 3600  # Crawled article pages are skipped for this long
+
+SEED_SCORE = 5.0         # Seed/listing pages sit between strong and weak candidates
+KEYWORD_WEIGHT = 3.0     # Per topic keyword in the URL slug or anchor text
+MIN_SCORE = 1.0          # Candidates below this are never queued
+
+ARTICLE_PATTERNS = ['/article', '/articles', '/advice', '/tips',
+                    '/how-to', '/guide', '/help', '/parenting',
+                    '/toddler', '/child', '/baby', '/kids']
+LISTING_PATTERNS = ['/tag/', '/tags/', '/category/', '/categories/', '/page/',
+                    '/search', '/author/', '/login', '/signin', '/signup',
+                    '/account', '/cart', '/shop', '/subscribe', '/newsletter']
+SKIP_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.pdf',
+                   '.zip', '.mp3', '.mp4', '.css', '.js', '.xml', '.json')
+
+
+# ─────────────────────────────────────────────────────────────
+# URL SCORING
+# ─────────────────────────────────────────────────────────────
+def normalize(href, base_url=None):
+    """Absolute http(s) URL without fragment or query, or None"""
+    url = urljoin(base_url, href.strip()) if base_url else href.strip()
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path or '/'}"
+
+
+def article_score(url):
+    """How much a URL looks like a single article rather than a listing or utility page"""
+    path = urlparse(url).path.lower()
+    if path.endswith(SKIP_EXTENSIONS):
+        return -100.0
+    score = 0.0
+    if any(pattern in path for pattern in ARTICLE_PATTERNS):
+        score += 3.0
+    if any(pattern in path for pattern in LISTING_PATTERNS):
+        score -= 5.0
+    slug = path.rstrip('/').rsplit('/', 1)[-1]
+    words = [w for w in slug.replace('_', '-').split('-') if w]
+    if len(words) >= 3:
+        score += 2.0   # Article slugs are titles: "how-to-handle-toddler-tantrums"
+    if path.count('/') >= 2:
+        score += 1.0
+    return score
+
+
+def keyword_score(text, keywords):
+    """Number of keywords found in text (hyphens and spaces both count as spaces)"""
+    text = text.lower().replace('-', ' ').replace('_', ' ')
+    return sum(1 for kw in keywords if kw.lower() in text)
+
+
+def score(url, keywords, anchor=''):
+    """Frontier priority of a candidate link (higher = crawl sooner)"""
+    hits = keyword_score(urlparse(url).path, keywords) + keyword_score(anchor, keywords)
+    return article_score(url) + KEYWORD_WEIGHT * hits
+
+
+def extract_links(html, page_url, domain):
+    """[(url, anchor_text)] for links on the page that stay on domain"""
+    try:
+        root = html_parsers.parse_tree(html)
+    except Exception:
+        return []
+    links = {}
+    for a in root.iter('a'):
+        url = normalize(a.get('href') or '', page_url)
+        if not url:
+            continue
+        host = domain_of(url)
+        if host != domain and not host.endswith('.' + domain):
+            continue
+        anchor = ' '.join(a.text_content().split())[:200]
+        if url not in links or len(anchor) > len(links[url]):
+            links[url] = anchor
+    return list(links.items())
+
+
+# ─────────────────────────────────────────────────────────────
+# SEEN SET (persisted)
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_seen = None    # {scope: {url: crawled_at}}
+_dirty = False
+
+
+def _load():
+    global _seen
+    if _seen is None:
+        try:
+            with open(SEEN_FILE, 'r', encoding='utf-8') as f:
+                _seen = json.load(f)
+        except (OSError, ValueError):
+            _seen = {}
+        cutoff = time.time() - SEEN_TTL
+        for scope, urls in _seen.items():
+            _seen[scope] = {url: at for url, at in urls.items() if at >= cutoff}
+    return _seen
+
+
+def save():
+    """Write the seen-set to disk"""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        os.makedirs(os.path.dirname(SEEN_FILE), exist_ok=True)
+        tmp_path = SEEN_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_seen, f)
+        os.replace(tmp_path, SEEN_FILE)
+        _dirty = False
+
+
+atexit.register(save)
+
+
+def was_seen(scope, url):
+    with _lock:
+        return url in _load().get(scope, {})
+
+
+def mark_seen(scope, url):
+    global _dirty
+    with _lock:
+        _load().setdefault(scope, {})[url] = time.time()
+        _dirty = True
+
+
+# ─────────────────────────────────────────────────────────────
+# FRONTIER
+# ─────────────────────────────────────────────────────────────
+class Frontier:
+    """Priority queue of URLs to crawl, deduplicated within the run and against the seen-set"""
+
+    def __init__(self, keywords, scope, max_depth=MAX_DEPTH):
+        self.keywords = keywords
+        self.scope = scope
+        self.max_depth = max_depth
+        self._heap = []
+        self._queued = set()
+        self._order = itertools.count()
+        self.stats = {'queued': 0, 'crawled': 0, 'skipped_seen': 0, 'dropped': 0}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, url, depth, source, anchor=''):
+        """Queue a discovered link unless it was queued this run, seen recently, too deep or too weak"""
+        url = normalize(url)
+        if not url or url in self._queued or depth > self.max_depth:
+            return False
+        if was_seen(self.scope, url):
+            self._queued.add(url)  # Count it once
+            self.stats['skipped_seen'] += 1
+            return False
+        priority = score(url, self.keywords, anchor)
+        if priority < MIN_SCORE:
+            return False
+        return self._push(url, depth, source, priority)
+
+    def add_seed(self, url, source):
+        """Queue a seed/listing page (kept as-is, query included, never skipped as seen)"""
+        if url in self._queued:
+            return False
+        return self._push(url, 0, source, SEED_SCORE)
+
+    def _push(self, url, depth, source, priority):
+        self._queued.add(url)
+        heapq.heappush(self._heap, (-priority, next(self._order), url, depth, source))
+        self.stats['queued'] += 1
+        if len(self._heap) > MAX_QUEUED:
+            # Drop the weakest candidate
+            weakest = max(self._heap)
+            self._heap.remove(weakest)
+            heapq.heapify(self._heap)
+            self.stats['dropped'] += 1
+        return True
+
+    def add_links(self, links, depth, source):
+        """Queue (url, anchor) pairs found on a page; returns how many were new"""
+        return sum(self.add(url, depth, source, anchor) for url, anchor in links)
+
+    def pop_batch(self, size):
+        """Up to size best-scored entries: {'url', 'depth', 'source', 'score'}"""
+        batch = []
+        while self._heap and len(batch) < size:
+            priority, _, url, depth, source = heapq.heappop(self._heap)
+            batch.append({'url': url, 'depth': depth, 'source': source, 'score': -priority})
+        self.stats['crawled'] += len(batch)
+        return batch
+
+    def mark_seen(self, url):
+        mark_seen(self.scope, url)
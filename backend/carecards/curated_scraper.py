@@ -8,18 +8,20 @@ Pipeline: Scrape → AI Summarize → Store → Show in App
 """
 
 import requests
-from bs4 import BeautifulSoup
-from newspaper import Article
-from readability import Document
 import json
 import os
 import hashlib
-import time
-import random
 import re
-from urllib.parse import urlparse
-from urllib.robotparser import RobotFileParser
 from datetime import datetime
+import article_store
+import downloads
+import http_pool
+import page_cache
+import pdf_extract
+import robots_service
+import shards
+import url_index
+from extraction import extract_from_html, print_extraction_stats
 
 # ─────────────────────────────────────────────────────────────
 # DIRECTORIES
@@ -44,37 +46,14 @@ HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.5',
-    'Accept-Encoding': 'gzip, deflate, br',
-    'Connection': 'keep-alive',
-}
-REQUEST_DELAY = (2, 4)  # Be polite: 2-4 seconds between requests
+}  # Accept-Encoding / keep-alive are negotiated by http_pool
 
 # ─────────────────────────────────────────────────────────────
 # ROBOTS.TXT CHECKER
 # ─────────────────────────────────────────────────────────────
-_robots_cache = {}
-
 def can_fetch(url):
     """Check if we're allowed to fetch this URL per robots.txt"""
-    try:
-        parsed = urlparse(url)
-        base = f"{parsed.scheme}://{parsed.netloc}"
-        
-        if base not in _robots_cache:
-            rp = RobotFileParser()
-            rp.set_url(f"{base}/robots.txt")
-            rp.read()
-            _robots_cache[base] = rp
-        
-        rp = _robots_cache[base]
-        return rp.can_fetch('*', url)
-    except:
-        return True  # If can't check, assume allowed
-
-
-def polite_delay():
-    """Wait between requests to be respectful"""
-    time.sleep(random.uniform(*REQUEST_DELAY))
+    return robots_service.can_fetch(url)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -82,16 +61,23 @@ def polite_delay():
 # ─────────────────────────────────────────────────────────────
 def fetch_html(url):
     """Fetch HTML content from URL"""
+    cached = page_cache.get_page(url)
+    if cached is not None:
+        return cached
+    
     if not can_fetch(url):
         print(f"   ⛔ Blocked by robots.txt: {url}")
         return None
     
     try:
-        polite_delay()
-        session = requests.Session()
-        response = session.get(url, headers=HEADERS, timeout=30, allow_redirects=True)
-        response.raise_for_status()
-        return response.text
+        download = downloads.fetch(url, headers=HEADERS, timeout=30, allow_redirects=True)
+        download.raise_for_status()
+        if download.kind != downloads.HTML:
+            print(f"   ⏭️  Not HTML ({download.kind}): {url}")
+            return None
+        html = download.text
+        page_cache.put_page(url, html)
+        return html
     except requests.exceptions.Timeout:
         print(f"   ⏱️  Timeout: {url}")
         return None
@@ -104,34 +90,18 @@ def fetch_html(url):
 
 
 def fetch_pdf(url):
-    """Fetch and extract text from PDF"""
+    """Download a PDF and start extracting its text in the PDF worker pool (a pdf_extract job, or None)"""
     try:
-        polite_delay()
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        
-        # Try to extract text from PDF using basic method
-        # For better results, you'd use PyPDF2 or pdfplumber
-        content = response.content
+        download = downloads.fetch(url, kinds=(downloads.PDF,), headers=HEADERS, timeout=30)
+        download.raise_for_status()
+        if download.kind != downloads.PDF:
+            print(f"   ⏭️  Not a PDF ({download.kind}): {url}")
+            return None
+        if download.truncated:
+            print(f"   ⏭️  PDF too large: {url}")
+            return None
         
-        # Basic text extraction from PDF (works for simple PDFs)
-        text = ""
-        try:
-            import io
-            # Try PyPDF2 if available
-            try:
-                import PyPDF2
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            except ImportError:
-                # Fallback: extract readable strings
-                text = re.sub(rb'[^\x20-\x7E\n]', b' ', content).decode('utf-8', errors='ignore')
-                text = ' '.join(text.split())
-        except:
-            pass
-        
-        return text if len(text) > 100 else None
+        return pdf_extract.submit(download.content)
     except Exception as e:
         print(f"   ❌ PDF failed: {url} - {str(e)[:50]}")
         return None
@@ -140,121 +110,13 @@ def fetch_pdf(url):
 # ─────────────────────────────────────────────────────────────
 # EXTRACTION FUNCTIONS
 # ─────────────────────────────────────────────────────────────
-def extract_with_newspaper(url):
-    """Extract article using newspaper3k library"""
-    try:
-        article = Article(url)
-        article.download()
-        article.parse()
-        
-        if article.text and len(article.text) > 200:
-            # Also try NLP for summary
-            try:
-                article.nlp()
-                summary = article.summary
-            except:
-                summary = article.text[:500]
-            
-            return {
-                'title': article.title or 'Untitled',
-                'text': article.text,
-                'summary': summary,
-                'authors': article.authors,
-                'publish_date': article.publish_date.isoformat() if article.publish_date else None,
-                'top_image': article.top_image,
-                'method': 'newspaper3k'
-            }
-    except Exception as e:
-        pass
-    return None
-
-
-def extract_with_readability(html, url):
-    """Extract article using readability library"""
-    try:
-        doc = Document(html)
-        content_html = doc.summary()
-        soup = BeautifulSoup(content_html, 'html.parser')
-        text = soup.get_text(separator='\n', strip=True)
-        
-        if text and len(text) > 200:
-            return {
-                'title': doc.title() or 'Untitled',
-                'text': text,
-                'summary': text[:500],
-                'method': 'readability'
-            }
-    except Exception as e:
-        pass
-    return None
-
-
-def extract_with_beautifulsoup(html, url):
-    """Manual extraction using BeautifulSoup"""
-    try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove unwanted elements
-        for tag in soup(['script', 'style', 'nav', 'header', 'footer', 
-                         'aside', 'form', 'iframe', 'noscript']):
-            tag.decompose()
-        
-        # Try to find main content
-        main_content = None
-        for selector in ['article', 'main', '[role="main"]', '.content', 
-                        '.article-body', '.post-content', '#content']:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-        
-        if not main_content:
-            main_content = soup.body if soup.body else soup
-        
-        # Get title
-        title = ''
-        title_tag = soup.find('h1') or soup.find('title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-        
-        # Get text
-        text = main_content.get_text(separator='\n', strip=True)
-        
-        # Clean up
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        text = '\n'.join(lines)
-        
-        if len(text) > 200:
-            return {
-                'title': title or 'Untitled',
-                'text': text,
-                'summary': text[:500],
-                'method': 'beautifulsoup'
-            }
-    except Exception as e:
-        pass
-    return None
-
-
 def extract_article(url):
-    """Try multiple extraction methods"""
-    # Method 1: newspaper3k (best for news/blog articles)
-    result = extract_with_newspaper(url)
-    if result and len(result.get('text', '')) > 300:
-        return result
-    
-    # Method 2: Fetch HTML and try readability
+    """Fetch the page once and run every extractor over the same HTML"""
+    stored = article_store.get(url)
+    if stored:
+        return stored
     html = fetch_html(url)
-    if html:
-        result = extract_with_readability(html, url)
-        if result and len(result.get('text', '')) > 300:
-            return result
-        
-        # Method 3: BeautifulSoup manual extraction
-        result = extract_with_beautifulsoup(html, url)
-        if result and len(result.get('text', '')) > 300:
-            return result
-    
-    return None
+    return extract_from_html(html, url)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -327,6 +189,9 @@ def scrape_topic(topic_id, topic_data):
     
     collected = []
     
+    # Download PDFs first - they are parsed in the PDF worker pool while the URLs are scraped
+    pdf_jobs = {url: fetch_pdf(url) for url in pdfs}
+    
     # Scrape regular URLs
     for i, url in enumerate(urls, 1):
         print(f"\n   [{i}/{len(urls)}] {url[:60]}...")
@@ -360,7 +225,7 @@ def scrape_topic(topic_id, topic_data):
     for i, url in enumerate(pdfs, 1):
         print(f"\n   [PDF {i}/{len(pdfs)}] {url[:60]}...")
         
-        text = fetch_pdf(url)
+        text = pdf_extract.result(pdf_jobs[url])
         if not text or len(text) < 200:
             print(f"      ⚠️  Could not extract PDF content")
             continue
@@ -387,54 +252,120 @@ def scrape_topic(topic_id, topic_data):
     return collected
 
 
-def scrape_all():
-    """Scrape all curated URLs for all topics"""
-    print("\n" + "="*60)
-    print("🚀 PARENTBUD CURATED SCRAPER")
-    print("="*60)
-    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Topics to scrape: {len(CURATED_URLS)}")
-    
-    total_urls = sum(len(t.get('urls', [])) + len(t.get('pdfs', [])) for t in CURATED_URLS.values())
-    print(f"Total URLs: {total_urls}")
-    
-    all_results = {}
-    total_collected = 0
-    
-    for topic_id, topic_data in CURATED_URLS.items():
-        results = scrape_topic(topic_id, topic_data)
-        all_results[topic_id] = results
-        total_collected += len(results)
-    
-    # Save summary
+def save_summary(all_results):
+    """Write scrape_summary.json from {topic_id: [records]} (or fingerprints)"""
     summary = {
         'scraped_at': datetime.now().isoformat(),
-        'total_articles': total_collected,
+        'total_articles': sum(len(articles) for articles in all_results.values()),
         'topics': {
             tid: {
                 'title': CURATED_URLS[tid].get('title', tid),
                 'count': len(articles),
                 'urls_attempted': len(CURATED_URLS[tid].get('urls', [])) + len(CURATED_URLS[tid].get('pdfs', []))
             }
-            for tid, articles in all_results.items()
+            for tid, articles in all_results.items() if tid in CURATED_URLS
         }
     }
     
     summary_path = os.path.join(DATA_DIR, 'scrape_summary.json')
     with open(summary_path, 'w') as f:
         json.dump(summary, f, indent=2)
+
+
+def use_shard(shard):
+    """Write this run's outputs to the shard's directory (shards.shard_dir) instead of data/"""
+    global DATA_DIR, RAW_DIR, TOPIC_DIR
+    DATA_DIR = shards.shard_dir('curated', shard)
+    RAW_DIR = os.path.join(DATA_DIR, "raw")
+    TOPIC_DIR = os.path.join(DATA_DIR, "by_topic")
+    os.makedirs(RAW_DIR, exist_ok=True)
+    os.makedirs(TOPIC_DIR, exist_ok=True)
+
+
+def output_files(all_results):
+    """Files save_article wrote for the records in {topic_id: [records]}, relative to DATA_DIR"""
+    files = []
+    for tid, records in all_results.items():
+        for record in records:
+            name = f"{record['fingerprint']}.json"
+            files += [os.path.relpath(os.path.join(RAW_DIR, name), DATA_DIR),
+                      os.path.relpath(os.path.join(TOPIC_DIR, tid, name), DATA_DIR)]
+    return files
+
+
+def scrape_all(shard=None):
+    """Scrape all curated URLs for all topics (shard (i, N): only this machine's share, see shards)"""
+    print("\n" + "="*60)
+    print("🚀 PARENTBUD CURATED SCRAPER")
+    print("="*60)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Topics to scrape: {len(CURATED_URLS)}")
+    
+    topics = shards.select_topics(CURATED_URLS, shard)
+    if shard:
+        use_shard(shard)
+        print(f"Shard: {shard[0]}/{shard[1]}")
+    all_urls = [url for t in topics.values() for url in t.get('urls', []) + t.get('pdfs', [])]
+    pages, _ = url_index.dedupe(all_urls)
+    print(f"Total URLs: {len(all_urls)} ({len(pages)} distinct pages - each downloaded once)")
+    robots_service.prefetch(url for t in topics.values() for url in t.get('urls', []))
+    
+    all_results = {}
+    total_collected = 0
+    
+    for topic_id, topic_data in topics.items():
+        results = scrape_topic(topic_id, topic_data)
+        all_results[topic_id] = results
+        total_collected += len(results)
+    
+    save_summary(all_results)
+    if shard:
+        shards.write_index('curated', shard, output_files(all_results),
+                           {tid: [r['fingerprint'] for r in records] for tid, records in all_results.items()})
     
     # Print summary
     print("\n" + "="*60)
     print("✅ SCRAPING COMPLETE")
     print("="*60)
     for tid, articles in all_results.items():
-        title = CURATED_URLS[tid].get('title', tid)
-        attempted = len(CURATED_URLS[tid].get('urls', [])) + len(CURATED_URLS[tid].get('pdfs', []))
+        title = topics[tid].get('title', tid)
+        attempted = len(topics[tid].get('urls', [])) + len(topics[tid].get('pdfs', []))
         print(f"   {title}: {len(articles)}/{attempted} articles")
     print(f"\n   Total: {total_collected} articles collected")
     print(f"   Data saved to: {DATA_DIR}")
+    http_pool.print_pool_stats()
+    downloads.print_download_stats()
+    print_extraction_stats()
+    pdf_extract.print_pdf_stats()
+    page_cache.print_cache_stats()
+    url_index.print_index_stats()
+    article_store.print_store_stats()
+    
+    return all_results
+
+
+def merge_shards():
+    """Combine the shards of a sharded run (--shard i/N on each machine) into data/"""
+    print("\n" + "="*60)
+    print("🧩 MERGING CURATED SCRAPER SHARDS")
+    print("="*60)
+    indexes = shards.read_indexes('curated')
+    if not indexes:
+        print(f"❌ No finished shards in {os.path.join(shards.SHARDS_DIR, 'curated')}")
+        return {}
+    
+    # The indexes list every file and fingerprint - nothing is rescanned
+    all_results = {tid: [] for tid in CURATED_URLS}
+    for index in indexes:
+        copied = shards.merge_files(index, DATA_DIR)
+        for tid, fingerprints in index['results'].items():
+            all_results.setdefault(tid, []).extend(fingerprints)
+        print(f"   Shard {index['shard']}/{index['count']}: {copied} files")
+    save_summary(all_results)
     
+    total = sum(len(fps) for fps in all_results.values())
+    print(f"\n   Total: {total} articles from {len(indexes)} shards")
+    print(f"   Data saved to: {DATA_DIR}")
     return all_results
 
 
@@ -457,10 +388,16 @@ def scrape_single_topic(topic_id):
 if __name__ == '__main__':
     import sys
     
-    if len(sys.argv) > 1:
+    # --shard i/N: scrape this machine's share only; --merge-shards combines them
+    shard, argv = shards.from_argv(sys.argv[1:])
+    args = [a for a in argv if not a.startswith('--')]
+    
+    if '--merge-shards' in argv:
+        merge_shards()
+    elif args:
         # Scrape specific topic
-        topic = sys.argv[1]
+        topic = args[0]
         scrape_single_topic(topic)
     else:
         # Scrape all topics
-        scrape_all()
+        scrape_all(shard=shard)
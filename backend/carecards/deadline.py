@@ -0,0 +1,244 @@
+"""
+ParentBud Deadline Scheduler
+----------------------------
+Time budget for a scrape run (--time-budget), spent on the URLs most
+likely to pay off.
+
+Every run records, per domain, how often its pages produced an article,
+how long the extracted text was and how long a page took to fetch
+(data/yield_history.json). With a Deadline:
+
+- plan() ranks URLs by expected yield per second - success rate x text
+  length / fetch time - boosted for topics with coverage gaps (fewer than
+  TARGET_PER_TOPIC URLs holding a record), so thin topics are filled
+  first and well-covered ones refreshed last
+- admit() is asked before each fetch. Once the time left (minus a
+  reserve for extraction and writing the outputs) falls inside the hedge
+  window, requests get a short timeout and no retries; a domain whose
+  pages take longer than the time left is dropped; at the reserve,
+  everything still queued is dropped
+- PDFs still being parsed when half the reserve is used up are dropped
+  too; the other half is kept for writing the outputs
+
+Dropped URLs come back as DROPPED. The pipeline keeps their earlier
+records and leaves the run journal open, so the output is complete for
+what was scraped and --resume finishes the rest.
+
+Usage:
+    budget, argv = deadline.from_argv(sys.argv[1:])   # --time-budget 45m
+    scheduler = deadline.Deadline(budget)
+    scheduler.plan(topics, held)          # held: {topic_id: URLs that have a record}
+    urls = scheduler.order(urls)
+    options = scheduler.admit(url)        # None → skip; else request kwargs
+    deadline.record(url, seconds, ok, chars)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import url_index
+from fetch_engine import domain_of
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+HISTORY_FILE = os.path.join(BASE_DIR, "data", "yield_history.json")
+
+RESERVE_FRACTION = 0.1   # Budget kept for extraction and writing the outputs
+HEDGE_FRACTION = 0.2     # Requests are hedged in this last part of the budget
+HEDGE_TIMEOUT = 10       # Seconds - request timeout (no retries) while hedging
+TARGET_PER_TOPIC = 5     # Topics with fewer records than this have a coverage gap
+GAP_WEIGHT = 2.0         # Priority boost for a URL that fills a whole gap
+
+DEFAULT_SECONDS = 5.0    # Guesses for a domain without history
+DEFAULT_CHARS = 3000
+FULL_CHARS = 8000        # Longer articles don't count as more yield
+SMOOTHING = 0.3          # Weight of the newest sample in the averages
+MIN_SAMPLE_SECONDS = 0.05   # Faster "fetches" were cache hits - they say nothing about the host
+
+DROPPED = object()       # Fetch result for a URL the deadline left out
+
+# ─────────────────────────────────────────────────────────────
+# YIELD HISTORY (persisted)
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_domains = None   # {domain: {'attempts', 'successes', 'chars', 'seconds', 'updated_at'}}
+_dirty = False
+
+
+def _load():
+    global _domains
+    if _domains is None:
+        try:
+            with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+                _domains = json.load(f)
+        except (OSError, ValueError):
+            _domains = {}
+    return _domains
+
+
+def save():
+    """Write the yield history to disk"""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        os.makedirs(os.path.dirname(HISTORY_FILE), exist_ok=True)
+        tmp_path = HISTORY_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_domains, f, indent=2)
+        os.replace(tmp_path, HISTORY_FILE)
+        _dirty = False
+
+
+atexit.register(save)
+
+
+def _average(old, sample):
+    return sample if old is None else old + SMOOTHING * (sample - old)
+
+
+def record(url, seconds, ok, chars=None):
+    """Remember one fetch of url: how long it took, whether it produced an article, its text length"""
+    global _dirty
+    with _lock:
+        state = _load().setdefault(domain_of(url), {'attempts': 0, 'successes': 0,
+                                                    'chars': None, 'seconds': None})
+        state['attempts'] += 1
+        state['successes'] += 1 if ok else 0
+        if ok and chars:
+            state['chars'] = _average(state['chars'], chars)
+        if seconds is not None and seconds >= MIN_SAMPLE_SECONDS:
+            state['seconds'] = _average(state['seconds'], seconds)
+        state['updated_at'] = datetime.now().isoformat()
+        _dirty = True
+
+
+def expected_seconds(url):
+    """Typical fetch time of a page on url's domain"""
+    with _lock:
+        state = _load().get(domain_of(url))
+    return (state or {}).get('seconds') or DEFAULT_SECONDS
+
+
+def expected_yield(url):
+    """Success rate x text length (0..1) expected from url's domain"""
+    with _lock:
+        state = _load().get(domain_of(url)) or {'attempts': 0, 'successes': 0, 'chars': None}
+    success_rate = (state['successes'] + 1) / (state['attempts'] + 2)   # Unknown domains start at 0.5
+    length = min(state['chars'] or DEFAULT_CHARS, FULL_CHARS) / FULL_CHARS
+    return success_rate * length
+
+
+def rate(url):
+    """Expected yield per second of fetching url"""
+    return expected_yield(url) / expected_seconds(url)
+
+
+# ─────────────────────────────────────────────────────────────
+# DEADLINE
+# ─────────────────────────────────────────────────────────────
+def parse_budget(value):
+    """'45m', '2h', '90s' or plain seconds → seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    try:
+        if value[-1:].lower() in units:
+            seconds = float(value[:-1]) * units[value[-1].lower()]
+        else:
+            seconds = float(value)
+    except ValueError:
+        raise ValueError(f"--time-budget expects e.g. 45m, 2h or 900, got {value!r}")
+    if seconds <= 0:
+        raise ValueError("--time-budget must be positive")
+    return seconds
+
+
+def from_argv(argv):
+    """(budget in seconds or None, argv without the --time-budget option)"""
+    rest = list(argv)
+    for at, arg in enumerate(rest):
+        if arg.startswith('--time-budget='):
+            del rest[at]
+            return parse_budget(arg.split('=', 1)[1]), rest
+        if arg == '--time-budget' and at + 1 < len(rest):
+            value = rest[at + 1]
+            del rest[at:at + 2]
+            return parse_budget(value), rest
+    return None, rest
+
+
+class Deadline:
+    """A run's time budget: URL order by expected yield, admission as the end nears"""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.ends = time.monotonic() + budget
+        self.reserve = budget * RESERVE_FRACTION
+        self.hedge_window = budget * HEDGE_FRACTION
+        self._priority = {}   # {page key: priority}
+        self._lock = threading.Lock()
+        self._slow_domains = set()
+        self.stats = {'dropped': 0, 'slow': 0, 'hedged': 0}
+
+    def left(self):
+        """Seconds left for fetching (the reserve excluded)"""
+        return self.ends - self.reserve - time.monotonic()
+
+    def extraction_left(self):
+        """Seconds left for collecting extraction results - the first half of the reserve"""
+        return self.ends - self.reserve / 2 - time.monotonic()
+
+    def plan(self, topics, held=None):
+        """
+        Rank the URLs of topics ({id: {'urls', 'pdfs'}}). held: {topic_id: URLs
+        that already have a record} - the rest fill the topic's coverage gap.
+        """
+        held = held or {}
+        boosts = {}
+        for topic_id, topic in topics.items():
+            have = held.get(topic_id, set())
+            urls = topic.get('urls', []) + topic.get('pdfs', [])
+            for url in urls:
+                boosts.setdefault(url_index.page_key(url), 0.0)
+            # The best URLs of a thin topic fill its gap; later ones add less
+            missing = sorted((url for url in urls if url not in have), key=rate, reverse=True)
+            for k, url in enumerate(missing):
+                gap = max(0, TARGET_PER_TOPIC - len(have) - k) / TARGET_PER_TOPIC
+                boosts[url_index.page_key(url)] += GAP_WEIGHT * gap
+        self._priority = {key: rate(key) * (1 + boost) for key, boost in boosts.items()}
+
+    def order(self, urls):
+        """urls, highest expected yield per second first"""
+        return sorted(urls, key=lambda url: -self._priority.get(url_index.page_key(url), rate(url)))
+
+    def admit(self, url):
+        """Request kwargs for fetching url now ({} normally, hedged near the end), or None to drop it"""
+        left = self.left()
+        with self._lock:
+            if left <= 0:
+                self.stats['dropped'] += 1
+                return None
+            expected = expected_seconds(url)
+            if expected > left:
+                domain = domain_of(url)
+                if domain not in self._slow_domains:
+                    self._slow_domains.add(domain)
+                    print(f"   ⏱️  Dropping {domain}: ~{expected:.1f}s per page, {left:.1f}s left")
+                self.stats['dropped'] += 1
+                self.stats['slow'] += 1
+                return None
+            if left < self.hedge_window:
+                self.stats['hedged'] += 1
+                return {'timeout': max(1, min(HEDGE_TIMEOUT, left)), 'retries': 0}
+        return {}
+
+    def print_stats(self):
+        used = self.budget - (self.ends - time.monotonic())
+        print(f"   ⏱️  Time budget: {used:.0f}s of {self.budget:.0f}s used | "
+              f"{self.stats['dropped']} URLs dropped ({self.stats['slow']} on slow domains), "
+              f"{self.stats['hedged']} hedged")
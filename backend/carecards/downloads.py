@@ -0,0 +1,173 @@
+"""
+ParentBud Downloads
+-------------------
+Streaming, size-capped downloads on top of http_pool.
+
+Instead of reading every response body into memory and only then looking
+at what it is, fetch() streams the response and decides from the headers
+(and the first chunk, for vague Content-Types) whether it is HTML, a PDF
+or something else:
+
+- Bodies of a kind the caller didn't ask for are never downloaded
+- A PDF whose Content-Length is over the cap is rejected before reading
+  anything (a cut-off PDF is useless)
+- Otherwise reading stops at the cap (MAX_BYTES per kind) - the start of
+  a huge HTML page still holds the article
+
+Video pages (YouTube, Vimeo) are recognised from the URL alone, so they
+are routed to their handler without any request.
+
+Redirects are remembered by url_index: the next request for the same URL
+goes straight to where it ended up last time.
+
+Usage:
+    kind = downloads.kind_from_url(url)          # VIDEO / PDF / None
+    download = downloads.fetch(url, headers=HEADERS, kinds=(downloads.HTML,))
+    download.raise_for_status()
+    if download.kind == downloads.HTML:
+        html = download.text
+"""
+
+import threading
+from urllib.parse import urlparse
+
+import http_pool
+import url_index
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+HTML = 'html'
+PDF = 'pdf'
+VIDEO = 'video'
+OTHER = 'other'
+
+MAX_BYTES = {
+    HTML: 3 * 1024 * 1024,
+    PDF: 20 * 1024 * 1024,
+    OTHER: 1024 * 1024,
+}
+CHUNK_SIZE = 64 * 1024
+
+VIDEO_HOSTS = ('youtube.com', 'youtu.be', 'vimeo.com')
+
+_stats_lock = threading.Lock()
+_stats = {'skipped': 0, 'capped': 0}
+
+
+# ─────────────────────────────────────────────────────────────
+# CONTENT ROUTING
+# ─────────────────────────────────────────────────────────────
+def kind_from_url(url):
+    """VIDEO or PDF when the URL alone says so, else None"""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if any(host == h or host.endswith('.' + h) for h in VIDEO_HOSTS):
+        return VIDEO
+    if parsed.path.lower().endswith('.pdf'):
+        return PDF
+    return None
+
+
+def kind_from_headers(content_type, first_chunk=b''):
+    """HTML / PDF / VIDEO / OTHER from a Content-Type, sniffing vague ones"""
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in ('text/html', 'application/xhtml+xml'):
+        return HTML
+    if content_type in ('application/pdf', 'application/x-pdf'):
+        return PDF
+    if content_type.startswith('video/'):
+        return VIDEO
+    if content_type in ('', 'application/octet-stream', 'binary/octet-stream', 'text/plain'):
+        head = first_chunk.lstrip()[:512].lower()
+        if head.startswith(b'%pdf'):
+            return PDF
+        if head.startswith((b'<!doctype html', b'<html')) or b'<body' in head:
+            return HTML
+    return OTHER
+
+
+class Download:
+    """A streamed response: status, headers, kind and the (possibly capped) body"""
+
+    def __init__(self, url, response, kind=None, content=b'', truncated=False):
+        self.url = url
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.kind = kind
+        self.content = content
+        self.truncated = truncated  # True if the body was cut off (or never read) at the cap
+
+    @property
+    def text(self):
+        return self.content.decode(self.response.encoding or 'utf-8', errors='replace')
+
+    def raise_for_status(self):
+        self.response.raise_for_status()
+
+
+def _bump(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+# ─────────────────────────────────────────────────────────────
+# FETCH
+# ─────────────────────────────────────────────────────────────
+def fetch(url, kinds=(HTML,), max_bytes=None, **kwargs):
+    """
+    Stream url through http_pool and read its body only if its kind is in kinds.
+
+    Non-2xx responses come back with an empty body and kind None (check
+    status_code / raise_for_status). max_bytes overrides MAX_BYTES.
+    """
+    response = http_pool.get(url_index.resolve(url), stream=True, **kwargs)
+    url_index.record_redirect(url, response.url)
+    try:
+        if not 200 <= response.status_code < 300:
+            return Download(url, response)
+
+        chunks = response.iter_content(CHUNK_SIZE)
+        first_chunk = b''
+        content_type = response.headers.get('Content-Type')
+        kind = kind_from_headers(content_type)
+        if kind == OTHER:
+            first_chunk = next(chunks, b'')
+            kind = kind_from_headers(content_type, first_chunk)
+
+        if kind not in kinds:
+            _bump('skipped')
+            return Download(url, response, kind)
+
+        cap = max_bytes or MAX_BYTES.get(kind, MAX_BYTES[OTHER])
+        try:
+            length = int(response.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = 0
+        if length > cap and kind != HTML:
+            _bump('skipped')
+            return Download(url, response, kind, truncated=True)
+
+        body = bytearray(first_chunk)
+        truncated = False
+        for chunk in chunks:
+            body.extend(chunk)
+            if len(body) >= cap:
+                truncated = len(body) > cap or next(chunks, b'') != b''
+                del body[cap:]
+                break
+        if truncated:
+            _bump('capped')
+        return Download(url, response, kind, bytes(body), truncated)
+    finally:
+        response.close()
+
+
+def print_download_stats():
+    """Print how many bodies were skipped or cut off at the size cap"""
+    with _stats_lock:
+        stats = dict(_stats)
+    if stats['skipped'] or stats['capped']:
+        print(f"   📦 Downloads: {stats['skipped']} bodies skipped by type/size, "
+              f"{stats['capped']} cut off at the size cap")
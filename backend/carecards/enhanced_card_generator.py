@@ -13,12 +13,14 @@ Each card now has:
 import os
 import json
 import hashlib
-import requests
-import time
 import re
 from datetime import datetime
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
+import article_store
+import downloads
+import http_pool
+import page_cache
 
 # Try to import newspaper for better extraction
 try:
@@ -41,9 +43,8 @@ except ImportError:
 # ─────────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(__file__)
 OUTPUT_DIR = os.path.join(BASE_DIR, "data", "enhanced_cards")
-CACHE_DIR = os.path.join(BASE_DIR, "data", "url_cache")
+LEGACY_CACHE_DIR = os.path.join(BASE_DIR, "data", "url_cache")  # Read-only, migrated into page_cache
 os.makedirs(OUTPUT_DIR, exist_ok=True)
-os.makedirs(CACHE_DIR, exist_ok=True)
 
 # Gemini API Key (set in environment)
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
@@ -179,32 +180,65 @@ TOPIC_META = {
 # URL SCRAPING
 # ─────────────────────────────────────────────────────────────
 
-def get_cache_path(url):
-    """Generate cache file path for URL"""
+def get_cache_key(url):
+    """page_cache key for this generator's extraction result"""
+    return f"extract:enhanced_card_generator:{url}"
+
+def load_legacy_cache(url):
+    """Result from the old one-file-per-URL cache, moved into page_cache"""
     url_hash = hashlib.md5(url.encode()).hexdigest()[:12]
-    return os.path.join(CACHE_DIR, f"{url_hash}.json")
+    legacy_path = os.path.join(LEGACY_CACHE_DIR, f"{url_hash}.json")
+    if not os.path.exists(legacy_path):
+        return None
+    with open(legacy_path, 'r') as f:
+        cached = json.load(f)
+    page_cache.put_json(get_cache_key(url), cached)
+    return cached
+
+def stored_result(url, article):
+    """This generator's result shape for an article from the shared store"""
+    return {
+        "url": url,
+        "title": article.get('title', ''),
+        "text": article.get('text', '')[:8000],
+        "domain": urlparse(url).netloc
+    }
 
 def scrape_url(url):
-    """Scrape content from URL with caching"""
-    cache_path = get_cache_path(url)
+    """Scrape content from URL with caching (shared article store first)"""
+    # Results were always reused for EXTRACT_TTL - same for articles other pipelines stored
+    stored = article_store.get(url, max_age=article_store.ARTICLE_TTL)
+    if stored:
+        print(f"  📚 From article store: {url[:50]}...")
+        return stored_result(url, stored)
     
     # Check cache first
-    if os.path.exists(cache_path):
-        with open(cache_path, 'r') as f:
-            cached = json.load(f)
-            print(f"  📦 Using cached: {url[:50]}...")
-            return cached
+    cached = page_cache.get_json(get_cache_key(url)) or load_legacy_cache(url)
+    if cached:
+        print(f"  📦 Using cached: {url[:50]}...")
+        return cached
     
     print(f"  🌐 Scraping: {url[:50]}...")
     
     try:
-        # Skip PDFs and videos
-        if url.endswith('.pdf') or 'youtube.com' in url:
-            return {"url": url, "text": "", "title": "", "error": "Skipped (PDF/Video)"}
+        # Skip PDFs and videos - from the URL, or from Content-Type before the body is read
+        skipped = {"url": url, "text": "", "title": "", "error": "Skipped (PDF/Video)"}
+        if downloads.kind_from_url(url) in (downloads.PDF, downloads.VIDEO):
+            return skipped
+        
+        download = downloads.fetch(url, headers=HEADERS, timeout=15)
+        download.raise_for_status()
+        if download.kind != downloads.HTML:
+            return skipped
+        html = download.text
+        
+        stored = article_store.find(url, html)
+        if stored:
+            return stored_result(url, stored)
         
         if HAS_NEWSPAPER:
             article = Article(url)
-            article.download()
+            article.download(input_html=html)
             article.parse()
             
             result = {
@@ -215,8 +249,7 @@ def scrape_url(url):
             }
         else:
             # Fallback to basic scraping
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Remove script and style
             for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
@@ -236,10 +269,8 @@ def scrape_url(url):
             }
         
         # Cache the result
-        with open(cache_path, 'w') as f:
-            json.dump(result, f)
+        page_cache.put_json(get_cache_key(url), result)
         
-        time.sleep(1)  # Be nice to servers
         return result
         
     except Exception as e:
@@ -765,6 +796,10 @@ def generate_all_cards(use_ai=True):
     print("="*60)
     print(f"Total cards: {len(all_cards)}")
     print(f"Output: {all_cards_path}")
+    http_pool.print_pool_stats()
+    downloads.print_download_stats()
+    page_cache.print_cache_stats()
+    article_store.print_store_stats()
     
     return all_cards
 
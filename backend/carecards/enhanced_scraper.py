@@ -9,11 +9,12 @@ import os
 import json
 import re
 import hashlib
-import time
 from datetime import datetime
 from urllib.parse import urlparse
-import requests
-from bs4 import BeautifulSoup
+import downloads
+import html_parsers
+import http_pool
+import page_cache
 
 # ─────────────────────────────────────────────────────────────
 # CONFIGURATION
@@ -159,46 +160,41 @@ TOPIC_METADATA = {
     },
 }
 
+CONTENT_SELECTORS = ['article', 'main', '.content', '.post-content', '.article-body', '#content', '.entry-content']
+
 
 def scrape_url(url, timeout=15):
     """Scrape content from a single URL"""
     try:
-        print(f"  📥 Fetching: {url[:60]}...")
-        response = requests.get(url, headers=HEADERS, timeout=timeout)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove unwanted elements
-        for tag in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'noscript']):
-            tag.decompose()
-        
-        # Try to find main content
-        main_content = None
-        for selector in ['article', 'main', '.content', '.post-content', '.article-body', '#content', '.entry-content']:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
+        html = page_cache.get_page(url)
+        if html is None:
+            print(f"  📥 Fetching: {url[:60]}...")
+            download = downloads.fetch(url, headers=HEADERS, timeout=timeout)
+            download.raise_for_status()
+            if download.kind != downloads.HTML:
+                print(f"  ⏭️ Not HTML ({download.kind}): {url[:60]}...")
+                return None
+            html = download.text
+            page_cache.put_page(url, html)
+        else:
+            print(f"  📦 Using cached: {url[:60]}...")
         
-        if not main_content:
-            main_content = soup.find('body')
+        # Parse with unwanted elements (script, nav, footer, ...) dropped
+        page = html_parsers.parse(html)
         
-        if not main_content:
-            return None
+        # Main content: first matching selector, else <body>
+        main_content = page.main(CONTENT_SELECTORS)
         
         # Extract text
-        paragraphs = main_content.find_all(['p', 'li', 'h2', 'h3'])
         text_parts = []
-        for p in paragraphs:
-            text = p.get_text(strip=True)
+        for text in page.blocks(main_content, ['p', 'li', 'h2', 'h3']):
             if len(text) > 30:  # Only meaningful content
                 text_parts.append(text)
         
         full_text = '\n'.join(text_parts)
         
         # Get title
-        title = soup.find('title')
-        title_text = title.get_text(strip=True) if title else urlparse(url).path.split('/')[-1]
+        title_text = page.find_text('title') or urlparse(url).path.split('/')[-1]
         
         return {
             'url': url,
@@ -358,7 +354,6 @@ def scrape_and_generate_all():
                 scrape_stats["successful"] += 1
             else:
                 scrape_stats["failed"] += 1
-            time.sleep(0.5)  # Be respectful to servers
         
         print(f"  ✅ Scraped {len(scraped_articles)}/{len(urls)} articles")
         
@@ -396,6 +391,9 @@ def scrape_and_generate_all():
     print(f"   - Total URLs: {scrape_stats['total_urls']}")
     print(f"   - Successful: {scrape_stats['successful']}")
     print(f"   - Failed: {scrape_stats['failed']}")
+    http_pool.print_pool_stats()
+    downloads.print_download_stats()
+    page_cache.print_cache_stats()
     print(f"🎴 Generated {len(all_cards)} care cards")
     print(f"💾 Saved to: {output_path}")
     print(f"📱 iOS Resources: {ios_resources_path}")
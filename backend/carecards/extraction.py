@@ -0,0 +1,425 @@
+"""
+ParentBud Article Extraction
+----------------------------
+Shared extraction chain for the curated scrapers.
+
+Each page is downloaded once and the same HTML is handed to every
+extractor in turn until one produces enough text:
+
+    newspaper3k → readability → BeautifulSoup    (default order)
+
+Previously newspaper3k downloaded the page itself and, when it came up
+short, the page was fetched a second time for readability/BeautifulSoup.
+Run stats track how many downloads (and bytes) the single fetch saves.
+
+readability and BeautifulSoup share one parsed lxml tree per page
+(PageContext): readability gets a cheap in-memory copy instead of parsing
+the HTML again, and its summary is read with lxml rather than a second
+BeautifulSoup. Run stats count the document parses per page.
+
+newspaper's NLP summary (tokenizing, sentence scoring) is not computed
+during extraction - most callers never read it. Articles carry a cheap
+lead summary (the first SUMMARY_CHARS of text) and get_summary() runs the
+NLP summarizer the first time a consumer actually asks for one, caching
+the result. NLP_SUMMARIES = False turns it off entirely.
+
+The order of the chain is learned per domain (extractor_order): whichever
+extractor last produced acceptable text on a site is tried first, so a
+known site usually needs a single extraction attempt. Run stats count the
+attempts per page.
+
+Accepted articles go into the shared article store (article_store), keyed
+by canonical URL and by the hash of the HTML they came from. HTML that
+was already extracted - by any pipeline, under any URL - is served from
+the store instead of running the chain again.
+
+Parsing is CPU-bound, so concurrent scrapers can hand it to a worker
+process pool (submit_extraction) instead of running it on their fetch
+threads. At most MAX_PENDING_PARSES pages wait for a worker - beyond
+that, submit_extraction blocks and the downloads slow down to match.
+
+Usage:
+    from extraction import extract_from_html, print_extraction_stats
+    article = extract_from_html(html, url)
+
+    future = submit_extraction(html, url)   # CPU stage, returns at once
+    article = extraction_result(future)
+
+    summary = get_summary(article)          # NLP summary, computed on first read
+"""
+
+import atexit
+import copy
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from newspaper import Article
+from newspaper import nlp as newspaper_nlp
+from readability import Document
+
+import article_store
+import extractor_order
+import html_parsers
+import page_cache
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+MIN_EXTRACTOR_CHARS = 200   # An extractor needs this much text to return anything
+MIN_ACCEPTED_CHARS = 300    # ...and this much for the chain to stop there
+SUMMARY_CHARS = 500
+NLP_SUMMARIES = True        # False = never run newspaper's NLP; summaries stay the lead text
+NLP_SUMMARY_SENTENCES = 5
+NLP_LANGUAGE = 'en'
+
+UNWANTED_TAGS = html_parsers.UNWANTED_TAGS
+CONTENT_SELECTORS = html_parsers.CONTENT_SELECTORS
+
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MAX_PENDING_PARSES = PARSE_WORKERS * 4   # Bounded queue between downloads and parsing
+
+
+# ─────────────────────────────────────────────────────────────
+# RUN STATS
+# ─────────────────────────────────────────────────────────────
+_stats_lock = threading.Lock()
+RUN_STATS = {
+    'pages': 0,             # Pages run through the chain
+    'bytes': 0,             # HTML bytes downloaded for them
+    'downloads_saved': 0,   # Extra downloads the old chain would have made
+    'bytes_saved': 0,
+    'doc_parses': 0,        # Full-document parses (newspaper's own + the shared tree)
+    'fragment_parses': 0,   # Small parses of readability's summary HTML
+    'attempts': 0,          # Extractors run
+    'first_try': 0,         # Pages accepted by the first extractor tried
+    'nlp_deferred': 0,      # Articles extracted without running the NLP summarizer
+    'nlp_summaries': 0,     # NLP summaries computed because a consumer read one
+    'nlp_cached': 0,        # ...served from the cache instead
+    'nlp_seconds': 0.0,     # Time spent computing them
+}
+
+
+def _bump(**counts):
+    with _stats_lock:
+        for key, value in counts.items():
+            RUN_STATS[key] += value
+
+
+def note_skipped_downloads(count, html):
+    """Record downloads avoided by a caller (e.g. a retry that reuses fetched HTML)"""
+    _bump(downloads_saved=count, bytes_saved=count * len(html.encode('utf-8')))
+
+
+def print_extraction_stats():
+    """Print how many downloads and bytes the single-fetch chain saved"""
+    with _stats_lock:
+        stats = dict(RUN_STATS)
+    if not stats['pages']:
+        return
+    print(f"\n   📥 Extraction: {stats['pages']} pages, {stats['bytes'] / 1024:.0f} KB downloaded")
+    print(f"      Saved {stats['downloads_saved']} duplicate downloads "
+          f"({stats['bytes_saved'] / 1024:.0f} KB)")
+    print(f"      {stats['doc_parses']} document parses ({stats['doc_parses'] / stats['pages']:.1f} per page), "
+          f"{stats['fragment_parses']} summary fragments")
+    print(f"      {stats['attempts']} extraction attempts ({stats['attempts'] / stats['pages']:.1f} per page), "
+          f"{stats['first_try']} pages accepted on the first try")
+    extractor_order.print_order_stats()
+    print_summary_stats(stats)
+
+
+def print_summary_stats(stats=None):
+    """Print how many articles skipped NLP and what the summaries that were read cost"""
+    if stats is None:
+        with _stats_lock:
+            stats = dict(RUN_STATS)
+    if stats['nlp_deferred']:
+        print(f"      🧠 NLP summarization skipped for {stats['nlp_deferred']} articles at extraction time")
+    if stats['nlp_summaries'] or stats['nlp_cached']:
+        per_article = stats['nlp_seconds'] / stats['nlp_summaries'] * 1000 if stats['nlp_summaries'] else 0
+        print(f"      🧠 NLP summaries read: {stats['nlp_summaries']} computed "
+              f"({per_article:.0f} ms per article), {stats['nlp_cached']} from cache")
+
+
+# ─────────────────────────────────────────────────────────────
+# PAGE CONTEXT (parse once, share the tree)
+# ─────────────────────────────────────────────────────────────
+class PageContext:
+    """One page's HTML plus its lxml tree, parsed on first use and shared by the extractors"""
+
+    def __init__(self, html, url):
+        self.html = html
+        self.url = url
+        self._tree = None
+
+    def tree(self):
+        """The shared tree - treat as read-only"""
+        if self._tree is None:
+            self._tree = html_parsers.parse_tree(self.html)
+            _bump(doc_parses=1)
+        return self._tree
+
+    def copy(self):
+        """A private copy of the tree for code that edits it (far cheaper than re-parsing)"""
+        return copy.deepcopy(self.tree())
+
+
+# ─────────────────────────────────────────────────────────────
+# EXTRACTORS (all work on already-downloaded HTML)
+# ─────────────────────────────────────────────────────────────
+def extract_with_newspaper(html, url, context=None):
+    """Extract article using newspaper3k library (no NLP - see get_summary)"""
+    try:
+        article = Article(url)
+        article.download(input_html=html)
+        article.parse()  # newspaper builds its own tree
+        _bump(doc_parses=1)
+
+        if article.text and len(article.text) > MIN_EXTRACTOR_CHARS:
+            _bump(nlp_deferred=1)
+            return {
+                'title': article.title or 'Untitled',
+                'text': article.text,
+                'summary': article.text[:SUMMARY_CHARS],
+                'authors': article.authors,
+                'publish_date': article.publish_date.isoformat() if article.publish_date else None,
+                'top_image': article.top_image,
+                'method': 'newspaper3k'
+            }
+    except Exception as e:
+        pass
+    return None
+
+
+def extract_with_readability(html, url, context=None):
+    """Extract article using readability library"""
+    try:
+        if html_parsers.HAS_LXML:
+            # readability edits the tree it is given (and re-reads it for title/summary)
+            context = context or PageContext(html, url)
+            doc = Document(context.copy())
+        else:
+            doc = Document(html)
+            _bump(doc_parses=1)
+        content_html = doc.summary()
+        text = html_parsers.fragment_text(content_html)
+        _bump(fragment_parses=1)
+
+        if text and len(text) > MIN_EXTRACTOR_CHARS:
+            return {
+                'title': doc.title() or 'Untitled',
+                'text': text,
+                'summary': text[:SUMMARY_CHARS],
+                'method': 'readability'
+            }
+    except Exception as e:
+        pass
+    return None
+
+
+def extract_with_beautifulsoup(html, url, context=None):
+    """Manual extraction (html_parsers.BACKEND - lxml fast path when available)"""
+    try:
+        if html_parsers.BACKEND == 'lxml-fast' and html_parsers.HAS_LXML:
+            # Reuse the page's shared tree; stripping unwanted tags edits it, so take a copy
+            context = context or PageContext(html, url)
+            page = html_parsers.page_from_tree(context.copy())
+        else:
+            # Unwanted elements are dropped by the parser
+            page = html_parsers.parse(html)
+            _bump(doc_parses=1)
+
+        # Main content: first matching selector, else <body>
+        main_content = page.main(CONTENT_SELECTORS)
+
+        # Get title
+        title = page.find_text('h1') or page.find_text('title') or ''
+
+        # Get text
+        text = page.text(main_content)
+
+        # Clean up
+        lines = [line.strip() for line in text.split('\n') if line.strip() and len(line.strip()) > 10]
+        text = '\n'.join(lines)
+
+        if len(text) > MIN_EXTRACTOR_CHARS:
+            return {
+                'title': title or 'Untitled',
+                'text': text,
+                'summary': text[:SUMMARY_CHARS],
+                'method': 'beautifulsoup'
+            }
+    except Exception as e:
+        pass
+    return None
+
+
+# ─────────────────────────────────────────────────────────────
+# CHAIN
+# ─────────────────────────────────────────────────────────────
+EXTRACTORS = {
+    'newspaper3k': extract_with_newspaper,
+    'readability': extract_with_readability,
+    'beautifulsoup': extract_with_beautifulsoup,
+}
+DEFAULT_ORDER = ['newspaper3k', 'readability', 'beautifulsoup']
+
+
+def extract_from_html(html, url, order=None, learn=True):
+    """
+    Run the extractors over the same HTML until one is accepted.
+
+    order defaults to the domain's learned order. learn=False leaves the
+    learned order and the article store to the caller (worker processes
+    can't update the parent's).
+    """
+    if not html:
+        return None
+    if learn:
+        stored = article_store.find(url, html)
+        if stored:
+            return stored
+
+    size = len(html.encode('utf-8'))
+    _bump(pages=1, bytes=size)
+
+    context = PageContext(html, url)   # readability + BeautifulSoup share one tree
+    for attempt, name in enumerate(order or extractor_order.order(url, DEFAULT_ORDER)):
+        _bump(attempts=1)
+        result = EXTRACTORS[name](html, url, context=context)
+        if result and len(result.get('text', '')) > MIN_ACCEPTED_CHARS:
+            if not attempt:
+                _bump(first_try=1)
+            if learn:
+                extractor_order.record(url, name)
+                article_store.put(url, html, result)
+            return result
+        if name == 'newspaper3k':
+            # The old chain downloaded the page again after newspaper3k came up short
+            _bump(downloads_saved=1, bytes_saved=size)
+
+    return None
+
+
+# ─────────────────────────────────────────────────────────────
+# SUMMARIES (newspaper NLP, computed on first read)
+# ─────────────────────────────────────────────────────────────
+def nlp_summary(title, text):
+    """newspaper3k's extractive summary: its top-scoring sentences, in order"""
+    newspaper_nlp.load_stopwords(NLP_LANGUAGE)
+    sentences = newspaper_nlp.summarize(title=title, text=text, max_sents=NLP_SUMMARY_SENTENCES)
+    return '\n'.join(sentences)
+
+
+def get_summary(article):
+    """
+    The article's summary, running the NLP summarizer the first time it is read.
+
+    The result is stored on the article (summary_method = 'nlp') and in the
+    page cache, so re-reads and later runs over the same text are free.
+    Falls back to the lead summary when NLP_SUMMARIES is off or NLP fails.
+    """
+    text = article.get('text', '')
+    lead = article.get('summary') or text[:SUMMARY_CHARS]
+    if not NLP_SUMMARIES or article.get('summary_method') == 'nlp' or not text or article.get('is_pdf'):
+        return lead
+
+    title = article.get('title', '')
+    key = 'nlp-summary:' + hashlib.sha256(f"{title}\n{text}".encode('utf-8')).hexdigest()
+    summary = page_cache.get_json(key)
+    if summary is not None:
+        _bump(nlp_cached=1)
+    else:
+        start = time.perf_counter()
+        try:
+            summary = nlp_summary(title, text)
+        except Exception:
+            return lead
+        _bump(nlp_summaries=1, nlp_seconds=time.perf_counter() - start)
+        page_cache.put_json(key, summary)
+
+    if not summary:
+        return lead
+    article['summary'] = summary
+    article['summary_method'] = 'nlp'
+    return summary
+
+
+# ─────────────────────────────────────────────────────────────
+# CPU STAGE (worker process pool)
+# ─────────────────────────────────────────────────────────────
+_pool_lock = threading.Lock()
+_pool = None
+_pending = threading.BoundedSemaphore(MAX_PENDING_PARSES)
+
+
+def _extract_job(html, url, order):
+    """Runs in a worker: extract, and return the run stats it added so the parent can count them"""
+    before = dict(RUN_STATS)
+    article = extract_from_html(html, url, order=order, learn=False)
+    return article, {key: RUN_STATS[key] - before[key] for key in RUN_STATS}
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: called from fetch threads, and forking a threaded process is unsafe
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown_pool)
+
+
+def _job_done(future, url, html):
+    _pending.release()
+    if not future.cancelled() and future.exception() is None:
+        article, stats = future.result()
+        _bump(**stats)
+        if article:
+            extractor_order.record(url, article['method'])
+            article_store.put(url, html, article)
+
+
+def submit_extraction(html, url):
+    """
+    Queue extract_from_html for a worker process (blocks while the queue is
+    full). HTML already in the article store comes back as a finished future.
+    """
+    stored = article_store.find(url, html)
+    if stored:
+        future = Future()
+        future.set_result((stored, {}))
+        return future
+
+    _pending.acquire()
+    try:
+        # The learned order lives in this process - hand it to the worker
+        order = extractor_order.order(url, DEFAULT_ORDER)
+        future = _get_pool().submit(_extract_job, html, url, order)
+    except Exception:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda done: _job_done(done, url, html))
+    return future
+
+
+def extraction_result(future):
+    """Article from a submit_extraction future (None if extraction failed)"""
+    try:
+        return future.result()[0]
+    except Exception:
+        return None
@@ -0,0 +1,111 @@
+"""
+ParentBud Extractor Order
+-------------------------
+Learned per-domain extractor ordering for the extraction chain.
+
+The chain used to try newspaper3k, then readability, then BeautifulSoup
+on every page. Sites are consistent, though - if readability is what
+works on zerotothree.org, it works on almost every page there. This
+module remembers which extractor last produced acceptable text for each
+domain and puts it first, so a known domain needs one extraction attempt
+instead of up to three. The remaining extractors keep their default order
+as fallbacks, and a domain that changes its layout simply learns again.
+
+Learned choices are saved to data/extractor_order.json.
+
+Usage:
+    names = extractor_order.order(url, DEFAULT_ORDER)   # learned best first
+    extractor_order.record(url, 'readability')          # the one that worked
+"""
+
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+
+from fetch_engine import domain_of
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+STATE_FILE = os.path.join(BASE_DIR, "data", "extractor_order.json")
+
+# ─────────────────────────────────────────────────────────────
+# STATE
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_domains = None   # {domain: {'best', 'wins': {method: n}, 'updated_at'}} - persisted
+_dirty = False
+
+
+def _load():
+    global _domains
+    if _domains is None:
+        try:
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                _domains = json.load(f)
+        except (OSError, ValueError):
+            _domains = {}
+    return _domains
+
+
+def save():
+    """Write the learned extractor choices to disk"""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        tmp_path = STATE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_domains, f, indent=2)
+        os.replace(tmp_path, STATE_FILE)
+        _dirty = False
+
+
+atexit.register(save)
+
+
+# ─────────────────────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────────────────────
+def best(url):
+    """The extractor that last worked for url's domain, or None"""
+    with _lock:
+        state = _load().get(domain_of(url))
+        return state['best'] if state else None
+
+
+def order(url, default_order):
+    """default_order with the domain's learned extractor moved to the front"""
+    method = best(url)
+    if method not in default_order:
+        return list(default_order)
+    return [method] + [m for m in default_order if m != method]
+
+
+def record(url, method):
+    """Remember that method produced acceptable text for url's domain"""
+    global _dirty
+    with _lock:
+        state = _load().setdefault(domain_of(url), {'best': None, 'wins': {}})
+        state['wins'][method] = state['wins'].get(method, 0) + 1
+        if state['best'] != method:
+            state['best'] = method
+            state['updated_at'] = datetime.now().isoformat()
+        _dirty = True
+
+
+def print_order_stats():
+    """Print which extractor the known domains prefer"""
+    with _lock:
+        domains = dict(_load())
+    if not domains:
+        return
+    counts = {}
+    for state in domains.values():
+        counts[state['best']] = counts.get(state['best'], 0) + 1
+    learned = ', '.join(f"{method} {n}" for method, n in sorted(counts.items(), key=lambda kv: -kv[1]))
+    print(f"      🧭 Learned extractor per domain ({len(domains)} domains): {learned}")
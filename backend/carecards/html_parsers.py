@@ -0,0 +1,205 @@
+"""
+ParentBud HTML Parser Backends
+------------------------------
+Pluggable HTML parsing for the BeautifulSoup-style extractors.
+
+Backends:
+    html.parser  BeautifulSoup + Python's html.parser (the original behaviour)
+    lxml         BeautifulSoup + lxml's C tokenizer, same tree API
+    lxml-fast    Plain lxml tree. Unwanted tags (script, nav, footer, ...) are
+                 dropped while the page is being parsed, and content selectors
+                 run as precompiled XPath instead of soupsieve CSS matching
+
+Every backend returns a page with the same small API, so extractors don't
+care which one parsed the HTML. benchmark_parsers.py compares them on saved
+pages.
+
+parse_tree() gives the full lxml.html document instead (nothing dropped),
+for code that parses a page once and shares the tree between extractors;
+page_from_tree() turns such a tree (or a copy of it) into an lxml-fast page.
+
+Usage:
+    page = html_parsers.parse(html)               # BACKEND, or backend='lxml'
+    main = page.main(CONTENT_SELECTORS)           # first match, else <body>
+    text = page.text(main)                        # '\\n'-joined strings
+    blocks = page.blocks(main, ['p', 'li'])       # text of each matching tag
+    title = page.find_text('h1') or page.find_text('title')
+"""
+
+import re
+from functools import lru_cache
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BACKENDS = ('html.parser', 'lxml', 'lxml-fast')
+BACKEND = 'lxml-fast' if HAS_LXML else 'html.parser'
+
+UNWANTED_TAGS = ['script', 'style', 'nav', 'header', 'footer',
+                 'aside', 'form', 'iframe', 'noscript']
+CONTENT_SELECTORS = ['article', 'main', '[role="main"]', '.content',
+                     '.article-body', '.post-content', '#content',
+                     '.entry-content', '.article-content']
+FEED_CHARS = 64 * 1024   # lxml-fast feeds the parser in chunks and prunes as it goes
+
+if HAS_LXML:
+    _TREE_PARSER = lxml.html.HTMLParser(remove_comments=True, remove_pis=True)
+    _TREE_PARSER_UTF8 = lxml.html.HTMLParser(remove_comments=True, remove_pis=True, encoding='utf-8')
+
+
+def _stripped(strings):
+    return [s.strip() for s in strings if s.strip()]
+
+
+# ─────────────────────────────────────────────────────────────
+# BEAUTIFULSOUP BACKENDS (html.parser, lxml)
+# ─────────────────────────────────────────────────────────────
+class SoupPage:
+    """BeautifulSoup tree with unwanted tags removed"""
+
+    def __init__(self, html, parser='html.parser', unwanted=UNWANTED_TAGS):
+        self.soup = BeautifulSoup(html, parser)
+        for tag in self.soup(unwanted):
+            tag.decompose()
+
+    def main(self, selectors):
+        for selector in selectors:
+            found = self.soup.select_one(selector)
+            if found:
+                return found
+        return self.soup.body or self.soup
+
+    def find_text(self, tag):
+        found = self.soup.find(tag)
+        return found.get_text(strip=True) if found else None
+
+    def text(self, element):
+        return element.get_text(separator='\n', strip=True)
+
+    def blocks(self, element, tags):
+        return [el.get_text(strip=True) for el in element.find_all(tags)]
+
+
+# ─────────────────────────────────────────────────────────────
+# LXML FAST PATH
+# ─────────────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
+def _xpath(selector):
+    """Compile a simple CSS selector (tag, .class, #id, [attr="value"]) to XPath"""
+    if selector.startswith('.'):
+        expr = f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+    elif selector.startswith('#'):
+        expr = f"//*[@id='{selector[1:]}']"
+    else:
+        attr = re.fullmatch(r'\[([\w-]+)="([^"]*)"\]', selector)
+        expr = f"//*[@{attr.group(1)}='{attr.group(2)}']" if attr else f"//{selector}"
+    return etree.XPath(f"({expr})[1]")
+
+
+def _drop(element):
+    """Remove an element but keep the text that follows it"""
+    parent = element.getparent()
+    if parent is None:
+        return
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or '') + element.tail
+        else:
+            parent.text = (parent.text or '') + element.tail
+    parent.remove(element)
+
+
+def _parse_stripped(html, unwanted):
+    """Incremental lxml parse that drops unwanted subtrees as soon as they close"""
+    parser = etree.HTMLPullParser(events=('end',), tag=unwanted,
+                                  remove_comments=True, remove_pis=True)
+    parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+    for start in range(0, len(html), FEED_CHARS):
+        parser.feed(html[start:start + FEED_CHARS])
+        for _, element in parser.read_events():
+            _drop(element)
+    root = parser.close()
+    for _, element in parser.read_events():
+        _drop(element)
+    return root
+
+
+class LxmlPage:
+    """lxml tree parsed with unwanted tags already gone"""
+
+    def __init__(self, html, unwanted=UNWANTED_TAGS):
+        if isinstance(html, bytes):
+            html = html.decode('utf-8', errors='replace')
+        self.root = _parse_stripped(html, unwanted)
+
+    @classmethod
+    def from_tree(cls, root, unwanted=UNWANTED_TAGS):
+        """Wrap an already-parsed tree (edited in place - pass a copy if it is shared)"""
+        page = cls.__new__(cls)
+        etree.strip_elements(root, *unwanted, with_tail=False)
+        page.root = root
+        return page
+
+    def main(self, selectors):
+        for selector in selectors:
+            found = _xpath(selector)(self.root)
+            if found:
+                return found[0]
+        body = self.root.find('body')
+        return body if body is not None else self.root
+
+    def find_text(self, tag):
+        found = self.root.find(f'.//{tag}')
+        return ''.join(_stripped(found.itertext())) if found is not None else None
+
+    def text(self, element):
+        return '\n'.join(_stripped(element.itertext()))
+
+    def blocks(self, element, tags):
+        return [''.join(_stripped(el.itertext())) for el in element.iterdescendants(*tags)]
+
+
+# ─────────────────────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────────────────────
+def parse_tree(html):
+    """Full lxml.html document tree - nothing removed"""
+    try:
+        return lxml.html.document_fromstring(html, parser=_TREE_PARSER)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return lxml.html.document_fromstring(html.encode('utf-8'), parser=_TREE_PARSER_UTF8)
+
+
+def page_from_tree(root, unwanted=UNWANTED_TAGS):
+    """lxml-fast page over a tree from parse_tree() (edits it - pass a copy if shared)"""
+    return LxmlPage.from_tree(root, unwanted)
+
+
+def fragment_text(html):
+    """'\n'-joined text of an HTML fragment (e.g. readability's summary)"""
+    if not HAS_LXML:
+        return BeautifulSoup(html, 'html.parser').get_text(separator='\n', strip=True)
+    return '\n'.join(_stripped(lxml.html.fromstring(html).itertext()))
+
+
+def parse(html, backend=None, unwanted=UNWANTED_TAGS):
+    """Parse html with the given backend (default BACKEND), dropping unwanted tags"""
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend} (choose from {', '.join(BACKENDS)})")
+    if backend != 'html.parser' and not HAS_LXML:
+        backend = 'html.parser'
+    if backend == 'lxml-fast':
+        return LxmlPage(html, unwanted)
+    return SoupPage(html, backend, unwanted)
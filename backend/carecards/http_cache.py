@@ -0,0 +1,183 @@
+"""
+ParentBud HTTP Revalidation Cache
+---------------------------------
+Remembers the ETag / Last-Modified validators of every scraped page together
+with the records built from it, so nightly re-scrapes ask the server "has
+this changed?" instead of downloading and re-extracting every page.
+
+A 304 Not Modified answer means the stored record is reused as-is - no
+extraction, cleaning or age detection.
+
+Records are kept per scope (e.g. "scraper_v2/tantrums", "suggested/sleep")
+because the same page produces a different record in each topic/category.
+Conditional headers are only sent when every scope that needs the page
+already has a record for it.
+
+Everything is keyed by the page (url_index.page_key), not the spelling:
+the page may be fetched under another topic's spelling or its remembered
+redirect target, and its record must still be found under the
+configured URL. The key the validators were sent under is remembered for
+the request: if the page starts redirecting and the target answers 304,
+the stored entry moves to the page's new key.
+
+Usage:
+    headers = {**HEADERS, **http_cache.conditional_headers(url, [scope])}
+    response = http_pool.get(url, headers=headers)
+    if response.status_code == 304:
+        http_cache.mark_not_modified(url)
+        record = http_cache.get_record(url, scope)
+    else:
+        http_cache.remember_response(url, response)
+        ...build record...
+        http_cache.store_record(url, scope, record)
+    http_cache.save()
+"""
+
+import copy
+import os
+import threading
+from datetime import datetime
+
+import shared_index
+import url_index
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+CACHE_DIR = os.path.join(BASE_DIR, "data", "http_cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "validators.json")
+
+ENABLED = True  # False = always download in full (records are still stored)
+
+
+class _NotModified:
+    """Returned by fetchers instead of HTML when the server answers 304"""
+
+    def __repr__(self):
+        return 'NOT_MODIFIED'
+
+
+NOT_MODIFIED = _NotModified()
+
+# ─────────────────────────────────────────────────────────────
+# STATE
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_entries = None   # {page key: {'etag', 'last_modified', 'size', 'stored_at', 'records': {scope: record}}}
+_pending = {}     # Validators from this run's 200 responses, committed with the record
+_sent = {}        # {url: page key} - where the validators of this run's conditional requests came from
+_changes = shared_index.Changes()
+_stats = {'not_modified': 0, 'bytes_saved': 0}
+
+
+def _load():
+    global _entries
+    if _entries is None:
+        _entries = shared_index.load(CACHE_FILE)
+    return _entries
+
+
+def save():
+    """Write the cache to disk (merged with other processes' changes)"""
+    global _entries
+    with _lock:
+        if not _changes:
+            return
+        _entries = shared_index.merge_save(CACHE_FILE, _load(), _changes, ensure_ascii=False)
+
+
+# ─────────────────────────────────────────────────────────────
+# VALIDATORS
+# ─────────────────────────────────────────────────────────────
+def conditional_headers(url, scopes):
+    """If-None-Match / If-Modified-Since headers, or {} if the page must be fetched in full"""
+    if not ENABLED or not scopes:
+        return {}
+    key = url_index.page_key(url)
+    with _lock:
+        entry = _load().get(key)
+        if not entry or any(scope not in entry['records'] for scope in scopes):
+            return {}
+        _sent[url] = key
+
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def remember_response(url, response):
+    """Hold the validators of a 200 response until its record is stored"""
+    with _lock:
+        _sent.pop(url, None)
+        _pending[url_index.page_key(url)] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'size': len(response.content),
+        }
+
+
+def mark_not_modified(url):
+    """Count a 304 and the bytes it saved (moving the entry if url redirected to a new page key)"""
+    key = url_index.page_key(url)
+    with _lock:
+        entries = _load()
+        sent = _sent.pop(url, key)
+        if sent != key and sent in entries:
+            entries[key] = entries.pop(sent)
+            _changes.remove(sent)
+            _changes.set(key)
+        entry = entries.get(key, {})
+        _stats['not_modified'] += 1
+        _stats['bytes_saved'] += entry.get('size', 0)
+
+
+# ─────────────────────────────────────────────────────────────
+# RECORDS
+# ─────────────────────────────────────────────────────────────
+def get_record(url, scope):
+    """Stored record for a page in a scope (a copy), or None"""
+    with _lock:
+        entry = _load().get(url_index.page_key(url))
+        record = entry['records'].get(scope) if entry else None
+        return copy.deepcopy(record)
+
+
+def store_record(url, scope, record):
+    """Store the record built from this run's download of url"""
+    key = url_index.page_key(url)
+    with _lock:
+        entries = _load()
+        validators = _pending.get(key)
+        if validators is None:
+            return  # Not downloaded this run (e.g. reused after a 304)
+
+        if not validators['etag'] and not validators['last_modified']:
+            entries.pop(key, None)  # Server gives us nothing to revalidate with
+            _changes.remove(key)
+            return
+
+        entry = entries.get(key)
+        changed = (not entry
+                   or entry.get('etag') != validators['etag']
+                   or entry.get('last_modified') != validators['last_modified'])
+        if changed:
+            # New page version - records from other scopes are now stale
+            entry = {**validators, 'records': {}}
+            entries[key] = entry
+
+        entry['records'][scope] = copy.deepcopy(record)
+        entry['stored_at'] = datetime.now().isoformat()
+        _changes.set(key)
+
+
+def print_cache_stats():
+    """Print how many pages were answered with 304 Not Modified"""
+    with _lock:
+        stats = dict(_stats)
+    if stats['not_modified']:
+        print(f"\n   ↺ Not modified: {stats['not_modified']} pages reused "
+              f"({stats['bytes_saved'] / 1024:.0f} KB not downloaded)")
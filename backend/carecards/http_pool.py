@@ -0,0 +1,227 @@
+"""
+ParentBud HTTP Pool
+-------------------
+One shared, pooled HTTP session for every scraper.
+
+Creating a new requests.Session() (or calling bare requests.get) per fetch
+pays for a fresh TCP + TLS handshake every time. This module keeps a single
+keep-alive session per process so repeat visits to the same host
+(healthychildren.org, zerotothree.org, ...) reuse open connections.
+
+Features:
+- Keep-alive connection pools, sized per host (HOST_POOL_SIZES)
+- gzip/deflate negotiation, plus brotli when the brotli package is installed
+- Per-host counters of connections opened vs. reused (pool_stats())
+- Adaptive per-domain rate limiting (rate_limiter) on every request, so
+  scrapers no longer sleep between fetches themselves
+- Retries with jittered exponential backoff for transient failures, and a
+  per-domain circuit breaker (circuit_breaker) that skips dead hosts
+
+Usage:
+    import http_pool
+    response = http_pool.get(url, headers=HEADERS, timeout=30)
+    http_pool.print_pool_stats()
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import circuit_breaker
+import rate_limiter
+
+# urllib3 only decodes brotli responses when a brotli module is importable
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+DEFAULT_TIMEOUT = 30
+DEFAULT_POOL_SIZE = 4     # Keep-alive connections kept per host
+MAX_HOST_POOLS = 128      # Host pools kept open before the oldest is recycled
+
+# Hosts we hit dozens of times per run get a bigger pool
+HOST_POOL_SIZES = {
+    'healthychildren.org': 8,
+    'zerotothree.org': 8,
+    'parents.com': 8,
+    'healthline.com': 6,
+    'verywellfamily.com': 6,
+}
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate'
+
+RETRIES = 2                    # Extra attempts after a transient failure
+BACKOFF_BASE = 1.0             # Seconds; attempt n sleeps up to BACKOFF_BASE * 2**n
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# ─────────────────────────────────────────────────────────────
+# SESSION
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_session = None
+_session_pid = None
+_retired_counts = {}  # Counters from sessions replaced by configure()
+
+
+def _build_session(pool_size, host_pool_sizes):
+    session = requests.Session()
+    session.headers.update({
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Connection': 'keep-alive',
+    })
+
+    default_adapter = HTTPAdapter(pool_connections=MAX_HOST_POOLS, pool_maxsize=pool_size)
+    session.mount('http://', default_adapter)
+    session.mount('https://', default_adapter)
+
+    # requests picks the adapter with the longest matching prefix
+    for host, size in host_pool_sizes.items():
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=size)
+        for prefix in (host, f"www.{host}"):
+            session.mount(f"https://{prefix}/", adapter)
+            session.mount(f"http://{prefix}/", adapter)
+    return session
+
+
+def configure(pool_size=DEFAULT_POOL_SIZE, host_pool_sizes=None):
+    """Rebuild the shared session with new pool sizes"""
+    global _session, _session_pid
+    sizes = HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes
+    with _lock:
+        if _session is not None and _session_pid == os.getpid():
+            for host, (opened, sent) in _live_pool_counts(_session).items():
+                host_counts = _retired_counts.setdefault(host, [0, 0])
+                host_counts[0] += opened
+                host_counts[1] += sent
+            _session.close()
+        _session = _build_session(pool_size, sizes)
+        _session_pid = os.getpid()
+    return _session
+
+
+def get_session():
+    """Shared session for this process (rebuilt after fork - sockets can't be shared)"""
+    if _session is None or _session_pid != os.getpid():
+        return configure()
+    return _session
+
+
+# ─────────────────────────────────────────────────────────────
+# CONNECTION COUNTERS
+# ─────────────────────────────────────────────────────────────
+def _live_pool_counts(session):
+    """{host: [opened, requests]} read from the urllib3 pools of a session"""
+    counts = {}
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host_counts = counts.setdefault(pool.host, [0, 0])
+            host_counts[0] += pool.num_connections
+            host_counts[1] += pool.num_requests
+    return counts
+
+
+def pool_stats():
+    """Per-host counters: {host: {'requests', 'opened', 'reused'}}"""
+    with _lock:
+        totals = {host: list(c) for host, c in _retired_counts.items()}
+        session = _session if _session_pid == os.getpid() else None
+    if session is not None:
+        for host, (opened, sent) in _live_pool_counts(session).items():
+            host_counts = totals.setdefault(host, [0, 0])
+            host_counts[0] += opened
+            host_counts[1] += sent
+    return {
+        host: {'requests': sent, 'opened': opened, 'reused': max(0, sent - opened)}
+        for host, (opened, sent) in totals.items()
+    }
+
+
+def print_pool_stats():
+    """Print a one-line connection summary plus the busiest hosts"""
+    stats = pool_stats()
+    if not stats:
+        return
+    opened = sum(s['opened'] for s in stats.values())
+    reused = sum(s['reused'] for s in stats.values())
+    print(f"\n   🔌 Connections: {opened} opened, {reused} reused across {len(stats)} hosts")
+    busiest = sorted(stats.items(), key=lambda kv: kv[1]['requests'], reverse=True)[:5]
+    for host, s in busiest:
+        print(f"      {host}: {s['requests']} requests | {s['opened']} opened, {s['reused']} reused")
+    rate_limiter.print_rate_stats()
+    circuit_breaker.print_breaker_stats()
+
+
+# ─────────────────────────────────────────────────────────────
+# REQUESTS
+# ─────────────────────────────────────────────────────────────
+def _send(method, url, rate_limit, **kwargs):
+    """One attempt: rate limit, send, feed the outcome to the limiter and breaker"""
+    circuit_breaker.check(url)
+    if rate_limit:
+        rate_limiter.acquire(url)
+    start = time.monotonic()
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.RequestException:
+        if rate_limit:
+            rate_limiter.observe(url, None, time.monotonic() - start)
+        circuit_breaker.record_failure(url)
+        raise
+
+    if rate_limit:
+        rate_limiter.observe(url, response.status_code, time.monotonic() - start,
+                             response.headers.get('Retry-After'))
+    if response.status_code >= 500:
+        circuit_breaker.record_failure(url)
+    else:
+        circuit_breaker.record_success(url)
+    return response
+
+
+def request(method, url, rate_limit=True, retries=RETRIES, **kwargs):
+    """
+    Send a request through the shared pool, paced by the domain's rate limit.
+
+    Timeouts, connection errors and RETRY_STATUSES are retried with jittered
+    exponential backoff; requests to a domain whose circuit is open raise
+    circuit_breaker.CircuitOpenError without touching the network.
+    """
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    for attempt in range(retries + 1):
+        last_attempt = attempt == retries
+        try:
+            response = _send(method, url, rate_limit, **kwargs)
+        except circuit_breaker.CircuitOpenError:
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if last_attempt or circuit_breaker.is_open(url):
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or last_attempt or circuit_breaker.is_open(url):
+                return response
+            response.close()
+        # 429/503 pauses are handled by the rate limiter's Retry-After
+        time.sleep(random.uniform(0, BACKOFF_BASE * 2 ** attempt))
+
+
+def get(url, **kwargs):
+    """Pooled replacement for requests.get"""
+    kwargs.setdefault('allow_redirects', True)
+    return request('GET', url, **kwargs)
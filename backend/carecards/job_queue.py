@@ -0,0 +1,534 @@
+"""
+ParentBud Job Queue
+-------------------
+Work queue in a local SQLite file, so several worker processes - or
+several machines sharing a volume - can scrape the same URL set at once
+without doing any URL twice.
+
+Jobs are URLs (one per canonical page, url_index) in a named queue:
+
+    curated     curated_urls_v2.json   → scraper_v2.scrape_topic
+    suggested   SUGGESTED_URLS         → suggested_articles_scraper.scrape_category
+    discovery   sources.json + topics  → scraper.crawl_page (found links are queued too)
+
+- Leases: a worker takes a job for LEASE_SECONDS and keeps extending it
+  with a heartbeat while it works. A worker that dies stops heart-beating;
+  its jobs go back to the queue when the lease runs out (up to
+  MAX_ATTEMPTS tries, then 'failed').
+- Priorities: higher first - the number of topics/categories that use a
+  page, or the crawl frontier's score for discovered links.
+- Per-domain politeness across workers and machines: at most
+  DOMAIN_LIMIT jobs of one domain are leased at a time, and a domain's
+  next job is only leased once its next_allowed_at has passed - the
+  domain's rate-limit interval (rate_limiter.interval) after its last
+  job was leased or finished. rate_limiter's buckets are per process, so
+  without this a worker's fresh bucket would fire right after another
+  worker's request.
+- Every job's result is kept; collect writes the pipeline's usual summary
+  files from them once the queue is drained.
+
+SQLite over a network filesystem: WAL needs shared memory, which only
+works on one machine - set JOURNAL_MODE = 'DELETE' for a shared volume.
+The indexes of page_cache, http_cache, article_store and url_index are
+merged on save under a file lock (shared_index), so no worker drops
+another's entries. What the other modules learn (rate limits, robots.txt,
+negative cache, ...) stays per process and the last worker to save wins.
+
+A job whose lease ran out is re-run by another worker; when the first
+worker finishes it anyway, complete() refuses it and it isn't counted.
+
+Usage:
+    python3 job_queue.py enqueue [curated|suggested|discovery]   # All three by default
+    python3 job_queue.py work curated --workers 4    # Run until the queue is drained
+    python3 job_queue.py collect curated             # Summary/category files from the results
+    python3 job_queue.py status
+    python3 job_queue.py clear curated
+"""
+
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+import rate_limiter
+import url_index
+from fetch_engine import domain_of
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+QUEUE_FILE = os.path.join(BASE_DIR, "data", "job_queue.sqlite")
+JOURNAL_MODE = 'WAL'       # 'DELETE' when the file is on a volume shared between machines
+
+LEASE_SECONDS = 120        # A job whose worker stops heart-beating this long is re-queued
+HEARTBEAT_SECONDS = 20
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 60           # Seconds before a failed job is tried again (times its attempts)
+DOMAIN_LIMIT = 1           # Jobs of one domain leased at a time (politeness)
+POLL_SECONDS = 2           # Idle wait while other workers still hold jobs
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    queue TEXT NOT NULL,
+    key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    payload TEXT,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    updated_at REAL,
+    UNIQUE (queue, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_pick ON jobs (queue, state, priority DESC, id);
+CREATE INDEX IF NOT EXISTS jobs_leased ON jobs (state, domain);
+CREATE TABLE IF NOT EXISTS domains (
+    domain TEXT PRIMARY KEY,
+    next_allowed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    queue TEXT,
+    heartbeat_at REAL
+);
+"""
+
+
+# ─────────────────────────────────────────────────────────────
+# QUEUE
+# ─────────────────────────────────────────────────────────────
+class JobQueue:
+    """URL jobs with leases in a SQLite file (one connection per thread)"""
+
+    def __init__(self, path=None, worker_id=None):
+        self.path = path or QUEUE_FILE
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db().executescript(SCHEMA)
+
+    def _db(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit - transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA journal_mode={JOURNAL_MODE}")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, work):
+        """Run work(conn) under the database write lock"""
+        conn = self._db()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(conn)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def enqueue_many(self, queue, jobs):
+        """Add (url, priority, payload) jobs; pages already in the queue are skipped. Returns how many were new"""
+        now = time.time()
+        rows = [(queue, url_index.page_key(url), url, domain_of(url), priority,
+                 json.dumps(payload) if payload is not None else None, now)
+                for url, priority, payload in jobs]
+
+        def insert(conn):
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO jobs (queue, key, url, domain, priority, payload, updated_at) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            return conn.total_changes - before
+        return self._transaction(insert)
+
+    def enqueue(self, queue, url, priority=0, payload=None):
+        return self.enqueue_many(queue, [(url, priority, payload)]) == 1
+
+    def _requeue_expired(self, conn, now):
+        """Jobs whose worker stopped heart-beating go back to the queue (or fail for good)"""
+        conn.execute("UPDATE jobs SET state = 'failed', worker = NULL, error = 'lease expired', updated_at = ? "
+                     "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?", (now, now, MAX_ATTEMPTS))
+        conn.execute("UPDATE jobs SET state = 'queued', worker = NULL, updated_at = ? "
+                     "WHERE state = 'leased' AND lease_expires < ?", (now, now))
+
+    def _space(self, conn, url, now):
+        """Hold the next lease of url's domain back by its rate-limit interval"""
+        conn.execute("INSERT INTO domains (domain, next_allowed_at) VALUES (?, ?) "
+                     "ON CONFLICT (domain) DO UPDATE SET "
+                     "next_allowed_at = MAX(next_allowed_at, excluded.next_allowed_at)",
+                     (domain_of(url), now + rate_limiter.interval(url)))
+
+    def lease(self, queue):
+        """
+        Take the best available job: {'id', 'url', 'payload', 'attempts'}, or None.
+        Skips jobs whose domain already has DOMAIN_LIMIT leased jobs or
+        isn't due for another request yet (next_allowed_at).
+        """
+        def take(conn):
+            now = time.time()
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT id, url, payload, attempts FROM jobs j "
+                "WHERE queue = ? AND state = 'queued' AND available_at <= ? "
+                "AND (SELECT COUNT(*) FROM jobs l WHERE l.state = 'leased' AND l.domain = j.domain) < ? "
+                "AND COALESCE((SELECT next_allowed_at FROM domains d WHERE d.domain = j.domain), 0) <= ? "
+                "ORDER BY priority DESC, id LIMIT 1", (queue, now, DOMAIN_LIMIT, now)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE jobs SET state = 'leased', worker = ?, lease_expires = ?, "
+                         "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                         (self.worker_id, now + LEASE_SECONDS, now, row['id']))
+            self._space(conn, row['url'], now)
+            return {'id': row['id'], 'url': row['url'], 'attempts': row['attempts'] + 1,
+                    'payload': json.loads(row['payload']) if row['payload'] else {}}
+        return self._transaction(take)
+
+    def heartbeat(self, queue=None):
+        """Extend the leases of this worker's jobs and mark it alive"""
+        def beat(conn):
+            now = time.time()
+            conn.execute("UPDATE jobs SET lease_expires = ? WHERE worker = ? AND state = 'leased'",
+                         (now + LEASE_SECONDS, self.worker_id))
+            conn.execute("INSERT OR REPLACE INTO workers (id, queue, heartbeat_at) VALUES (?, ?, ?)",
+                         (self.worker_id, queue, now))
+        self._transaction(beat)
+
+    def complete(self, job, result=None):
+        """Mark a leased job done; False if its lease was lost to another worker meanwhile"""
+        def finish(conn):
+            self._space(conn, job['url'], time.time())
+            return conn.execute("UPDATE jobs SET state = 'done', result = ?, worker = NULL, updated_at = ? "
+                                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                                (json.dumps(result, ensure_ascii=False), time.time(),
+                                 job['id'], self.worker_id)).rowcount == 1
+        return self._transaction(finish)
+
+    def fail(self, job, error):
+        """Give a leased job back for a later retry, or mark it failed after MAX_ATTEMPTS"""
+        def give_back(conn):
+            now = time.time()
+            self._space(conn, job['url'], now)
+            state = 'failed' if job['attempts'] >= MAX_ATTEMPTS else 'queued'
+            conn.execute("UPDATE jobs SET state = ?, error = ?, worker = NULL, available_at = ?, updated_at = ? "
+                         "WHERE id = ? AND worker = ? AND state = 'leased'",
+                         (state, str(error)[:500], now + RETRY_DELAY * job['attempts'], now,
+                          job['id'], self.worker_id))
+        self._transaction(give_back)
+
+    def pending(self, queue):
+        """Jobs not finished yet (queued or leased)"""
+        return self._db().execute("SELECT COUNT(*) FROM jobs WHERE queue = ? AND state IN ('queued', 'leased')",
+                                  (queue,)).fetchone()[0]
+
+    def size(self, queue):
+        return self._db().execute("SELECT COUNT(*) FROM jobs WHERE queue = ?", (queue,)).fetchone()[0]
+
+    def results(self, queue):
+        """[(url, payload, result)] of the queue's done jobs, in queue order"""
+        rows = self._db().execute("SELECT url, payload, result FROM jobs WHERE queue = ? AND state = 'done' "
+                                  "ORDER BY id", (queue,)).fetchall()
+        return [(r['url'], json.loads(r['payload']) if r['payload'] else {}, json.loads(r['result']))
+                for r in rows]
+
+    def clear(self, queue):
+        self._transaction(lambda conn: conn.execute("DELETE FROM jobs WHERE queue = ?", (queue,)))
+
+    def print_status(self):
+        """Jobs per queue and state, and how long ago each worker was heard from"""
+        db = self._db()
+        counts = {}
+        for row in db.execute("SELECT queue, state, COUNT(*) AS n FROM jobs GROUP BY queue, state"):
+            counts.setdefault(row['queue'], {})[row['state']] = row['n']
+        print("\n📋 Job queue:")
+        for queue, states in sorted(counts.items()):
+            print(f"   {queue}: " + ', '.join(f"{n} {state}" for state, n in sorted(states.items())))
+        now = time.time()
+        for row in db.execute("SELECT id, queue, heartbeat_at FROM workers ORDER BY heartbeat_at DESC"):
+            age = now - row['heartbeat_at']
+            status = '💚' if age < LEASE_SECONDS else '💀'
+            print(f"   {status} {row['id']} ({row['queue']}) - last heartbeat {age:.0f}s ago")
+
+
+# ─────────────────────────────────────────────────────────────
+# PRODUCERS
+# ─────────────────────────────────────────────────────────────
+def enqueue_curated(queue):
+    """One job per page of curated_urls_v2.json, with every topic that lists it"""
+    import scraper_v2
+    topics_by_url = {}
+    for topic_id, topic in scraper_v2.CURATED_URLS.items():
+        for kind in ('urls', 'pdfs'):
+            for url in topic.get(kind, []):
+                topics_by_url.setdefault(url, {'topics': [], 'kind': kind})['topics'].append(topic_id)
+    return _enqueue_pages(queue, 'curated', topics_by_url, 'topics')
+
+
+def enqueue_suggested(queue):
+    """One job per page of SUGGESTED_URLS, with every category that lists it"""
+    import suggested_articles_scraper
+    categories_by_url = {}
+    for category_id, category in suggested_articles_scraper.SUGGESTED_URLS.items():
+        for url in category['urls']:
+            categories_by_url.setdefault(url, {'categories': []})['categories'].append(category_id)
+    return _enqueue_pages(queue, 'suggested', categories_by_url, 'categories')
+
+
+def _enqueue_pages(queue, name, payload_by_url, field):
+    """Merge configured URLs that are one page; pages used by more groups go first"""
+    _, fetch_url_for = url_index.dedupe(payload_by_url)
+    pages = {}
+    for url, payload in payload_by_url.items():
+        page = pages.setdefault(fetch_url_for[url], {**payload, field: [], 'configured': {}})
+        for group in payload[field]:
+            if group not in page['configured']:
+                page[field].append(group)
+                page['configured'][group] = url   # The URL as that group's config spells it
+    added = queue.enqueue_many(name, [(url, len(payload[field]), payload) for url, payload in pages.items()])
+    print(f"   📥 {name}: {added} new jobs ({len(pages)} pages)")
+    return added
+
+
+def enqueue_discovery(queue):
+    """Seed pages of every source (home, sitemap articles, guessed topic pages) for a shared crawl"""
+    import crawl_frontier
+    import negative_cache
+    import scraper
+    import sitemaps
+    keywords = [kw for topic in scraper.TOPICS for kw in topic.get('keywords', [])]
+    jobs = []
+    for source in scraper.SOURCES:
+        jobs.append((source['seed'], crawl_frontier.SEED_SCORE, {'depth': 0, 'source': source}))
+        for url, _ in sitemaps.site_urls(source['seed'], headers=scraper.HEADERS):
+            jobs.append((url, crawl_frontier.score(url, keywords), {'depth': 1, 'source': source}))
+        for topic in scraper.TOPICS:
+            for search_url in scraper.build_search_urls(topic, source)[:scraper.SEARCH_URLS_PER_SOURCE]:
+                if not negative_cache.is_known_bad(search_url):
+                    jobs.append((search_url, crawl_frontier.SEED_SCORE, {'depth': 0, 'source': source}))
+    jobs = [job for job in jobs if job[1] >= crawl_frontier.MIN_SCORE][:scraper.MAX_PAGES_SINGLE_PASS]
+    added = queue.enqueue_many('discovery', jobs)
+    print(f"   📥 discovery: {added} new jobs ({len(jobs)} seed and sitemap pages)")
+    return added
+
+
+PRODUCERS = {'curated': enqueue_curated, 'suggested': enqueue_suggested, 'discovery': enqueue_discovery}
+
+
+# ─────────────────────────────────────────────────────────────
+# HANDLERS (run in the worker; the return value is the job's result)
+# ─────────────────────────────────────────────────────────────
+def handle_curated(queue, job):
+    """scraper_v2's per-topic scrape, for this one page"""
+    import scraper_v2
+    payload = job['payload']
+    saved = []
+    for topic_id in payload['topics']:
+        topic = scraper_v2.CURATED_URLS.get(topic_id)
+        if topic is None:
+            continue
+        url = payload['configured'][topic_id]
+        subset = {**topic, 'urls': [], 'pdfs': [], payload['kind']: [url]}
+        for record in scraper_v2.scrape_topic(topic_id, subset):
+            saved.append({'topic_id': topic_id, 'fingerprint': record.get('fingerprint')})
+    return {'saved': saved}
+
+
+def handle_suggested(queue, job):
+    """The suggested scraper's per-category scrape (Gemini summary included), for this one page"""
+    import suggested_articles_scraper as suggested
+    payload = job['payload']
+    records = []
+    for category_id in payload['categories']:
+        category = suggested.SUGGESTED_URLS.get(category_id)
+        if category is None:
+            continue
+        url = payload['configured'][category_id]
+        records += suggested.scrape_category(category_id, {**category, 'urls': [url]}, save=False)
+    return {'records': records}
+
+
+def handle_discovery(queue, job):
+    """Crawl one page: queue its links, save it under every topic it matches"""
+    import crawl_frontier
+    import scraper
+    entry = {'url': job['url'], **job['payload']}
+    article, links = scraper.crawl_page(entry, crawl_frontier.MAX_DEPTH)
+
+    keywords = [kw for topic in scraper.TOPICS for kw in topic.get('keywords', [])]
+    if links and queue.size('discovery') < scraper.MAX_PAGES_SINGLE_PASS:
+        jobs = []
+        for url, anchor in links:
+            url = crawl_frontier.normalize(url)
+            priority = crawl_frontier.score(url, keywords, anchor) if url else 0
+            if url and priority >= crawl_frontier.MIN_SCORE and not crawl_frontier.was_seen('all', url):
+                jobs.append((url, priority, {'depth': entry['depth'] + 1, 'source': entry['source']}))
+        queue.enqueue_many('discovery', jobs)
+    if not article or not article.get('text'):
+        return {'topic_ids': []}   # Hub/listing pages stay unseen, like in scraper.crawl
+    crawl_frontier.mark_seen('all', job['url'])
+    matched = [t['id'] for t in scraper.TOPICS if scraper.matches_topic(article['text'], t)]
+    if not matched:
+        return {'topic_ids': []}
+    record = scraper.build_record(job['url'], article, entry['source'], matched)
+    scraper.save_raw_article(record, matched)
+    return {'topic_ids': matched, 'fingerprint': record['fingerprint']}
+
+
+HANDLERS = {'curated': handle_curated, 'suggested': handle_suggested, 'discovery': handle_discovery}
+
+
+# ─────────────────────────────────────────────────────────────
+# WORKERS
+# ─────────────────────────────────────────────────────────────
+def run_worker(name):
+    """Lease and run jobs from a queue until no job is left anywhere (queued or leased)"""
+    queue = JobQueue()
+    handler = HANDLERS[name]
+    stop = threading.Event()
+
+    def keep_alive():
+        while not stop.wait(HEARTBEAT_SECONDS):
+            queue.heartbeat(name)
+
+    queue.heartbeat(name)
+    beat = threading.Thread(target=keep_alive, daemon=True)
+    beat.start()
+    done = failed = lost = 0
+    try:
+        while True:
+            job = queue.lease(name)
+            if job is None:
+                if not queue.pending(name):
+                    break
+                time.sleep(POLL_SECONDS)   # Other workers' jobs may still add links or fail back
+                continue
+            try:
+                result = handler(queue, job)
+            except Exception as e:
+                queue.fail(job, e)
+                failed += 1
+                print(f"   ❌ [{queue.worker_id}] {job['url'][:50]}... - {str(e)[:40]}")
+                continue
+            if queue.complete(job, result):
+                done += 1
+            else:
+                lost += 1
+                print(f"   ⌛ [{queue.worker_id}] Lease lost, another worker took over: {job['url'][:50]}...")
+    finally:
+        stop.set()
+    print(f"   🏁 Worker {queue.worker_id}: {done} jobs done, {failed} failed, {lost} leases lost")
+
+
+def _save_state():
+    """Save what a worker learned - multiprocessing children skip atexit handlers"""
+    import article_store
+    import crawl_frontier
+    import extraction
+    import extractor_order
+    import http_cache
+    import negative_cache
+    import page_cache
+    import pdf_extract
+    import robots_service
+    for module in (page_cache, http_cache, url_index, article_store, extractor_order,
+                   rate_limiter, robots_service, negative_cache, crawl_frontier):
+        module.save()
+    extraction.shutdown_pool()
+    pdf_extract.shutdown()
+
+
+def _worker_process(name):
+    run_worker(name)
+    _save_state()
+
+
+def run_workers(name, count):
+    """Run count worker processes on this machine (more can join from other machines)"""
+    if count <= 1:
+        run_worker(name)
+        return
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_worker_process, args=(name,)) for _ in range(count)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+# ─────────────────────────────────────────────────────────────
+# COLLECT (summary files from the job results)
+# ─────────────────────────────────────────────────────────────
+def collect_curated(queue):
+    import scraper_v2
+    saved = {topic_id: [] for topic_id in scraper_v2.CURATED_URLS}
+    for _, _, result in queue.results('curated'):
+        for entry in result['saved']:
+            saved.setdefault(entry['topic_id'], []).append(entry)
+    scraper_v2.save_summary(saved)
+
+
+def collect_suggested(queue):
+    import suggested_articles_scraper as suggested
+    by_url = {}
+    for _, payload, result in queue.results('suggested'):
+        for record in result['records']:
+            by_url[(record['category_id'], record['url'])] = record
+    all_articles = {}
+    for category_id, category in suggested.SUGGESTED_URLS.items():
+        articles = [by_url[(category_id, url)] for url in category['urls'] if (category_id, url) in by_url]
+        suggested.save_category(category_id, articles)
+        all_articles[category_id] = articles
+    suggested.save_outputs(all_articles)
+
+
+def collect_discovery(queue):
+    import scraper
+    articles = {topic['id']: set() for topic in scraper.TOPICS}
+    for _, _, result in queue.results('discovery'):
+        for topic_id in result['topic_ids']:
+            articles.setdefault(topic_id, set()).add(result['fingerprint'])   # Same text under two URLs counts once
+    scraper.save_summary({topic_id: len(fps) for topic_id, fps in articles.items()})
+
+
+COLLECTORS = {'curated': collect_curated, 'suggested': collect_suggested, 'discovery': collect_discovery}
+
+
+# ─────────────────────────────────────────────────────────────
+# ENTRY POINT
+# ─────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    argv = sys.argv[1:]
+    workers = 1
+    if '--workers' in argv:
+        at = argv.index('--workers')
+        workers = int(argv[at + 1])
+        del argv[at:at + 2]
+    args = [a for a in argv if not a.startswith('--')]
+    command = args[0] if args else 'status'
+    names = args[1:] or list(PRODUCERS)
+    queue = JobQueue()
+
+    if command == 'enqueue':
+        for name in names:
+            PRODUCERS[name](queue)
+    elif command == 'work':
+        run_workers(names[0], workers)
+    elif command == 'collect':
+        for name in names:
+            COLLECTORS[name](queue)
+    elif command == 'clear':
+        for name in names:
+            queue.clear(name)
+    queue.print_status()
@@ -0,0 +1,108 @@
+"""
+ParentBud Negative Cache
+------------------------
+Remembers URLs that recently failed with a definite client error, so
+guessed paths like {base}articles/{kw_slug} (mostly 404s) aren't
+requested again on every run.
+
+Entries expire - NOT_FOUND_TTL for 404/410, ERROR_TTL for other 4xx
+answers (403, 400, ...) - so a page that appears later is picked up.
+Timeouts and 5xx are not cached here; the circuit breaker handles hosts
+that are down.
+
+The cache is saved to data/negative_cache.json.
+
+Usage:
+    if negative_cache.is_known_bad(url): ...    # skip it
+    negative_cache.record(url, status)          # after a failed request
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+CACHE_FILE = os.path.join(BASE_DIR, "data", "negative_cache.json")
+
+NOT_FOUND_TTL = 7 * 24 * 3600   # 404 / 410
+ERROR_TTL = 24 * 3600           # Other client errors
+NOT_FOUND_STATUSES = (404, 410)
+TRANSIENT_STATUSES = (408, 429)  # Client errors that say "try again", never cached
+
+# ─────────────────────────────────────────────────────────────
+# STATE
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_entries = None   # {url: {'status', 'expires_at'}} - persisted
+_stats = {'recorded': 0, 'skipped': 0}
+_dirty = False
+
+
+def _load():
+    global _entries
+    if _entries is None:
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                _entries = json.load(f)
+        except (OSError, ValueError):
+            _entries = {}
+        now = time.time()
+        _entries = {url: e for url, e in _entries.items() if e['expires_at'] > now}
+    return _entries
+
+
+def save():
+    """Write the negative cache to disk"""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        tmp_path = CACHE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_entries, f, indent=2)
+        os.replace(tmp_path, CACHE_FILE)
+        _dirty = False
+
+
+atexit.register(save)
+
+
+# ─────────────────────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────────────────────
+def is_known_bad(url):
+    """True if url failed recently and its entry hasn't expired"""
+    with _lock:
+        entry = _load().get(url)
+        if entry is None or entry['expires_at'] <= time.time():
+            return False
+        _stats['skipped'] += 1
+        return True
+
+
+def record(url, status):
+    """Remember a failed URL if status is a definite client error; returns True if cached"""
+    global _dirty
+    if status is None or not 400 <= status < 500 or status in TRANSIENT_STATUSES:
+        return False
+    ttl = NOT_FOUND_TTL if status in NOT_FOUND_STATUSES else ERROR_TTL
+    with _lock:
+        _load()[url] = {'status': status, 'expires_at': time.time() + ttl}
+        _stats['recorded'] += 1
+        _dirty = True
+    return True
+
+
+def print_negative_stats():
+    """Print how many failed URLs were remembered and how many requests that saved"""
+    with _lock:
+        stats = dict(_stats)
+    if stats['recorded'] or stats['skipped']:
+        print(f"   🚫 Negative cache: {stats['skipped']} known-bad URLs skipped, "
+              f"{stats['recorded']} new failures remembered")
@@ -0,0 +1,250 @@
+"""
+ParentBud Page Cache
+--------------------
+Shared, content-addressed cache for downloaded pages and extraction
+results, used by every scraper.
+
+Layout (data/page_cache/):
+    index.json              # One index for every entry: key → object + timing
+    objects/ab/abcdef....gz # gzip-compressed bodies, named by SHA-256
+
+- Keys are strings like "page:<url>" (raw HTML) or "extract:<pipeline>:<url>"
+  (JSON extraction results). Identical bodies are stored once. Pages are
+  keyed by canonical URL (url_index), so every spelling of a URL - and
+  every URL that redirects to the same page - shares one entry.
+- Every entry has its own TTL; expired entries are never returned.
+- When the objects exceed MAX_CACHE_BYTES the least recently used entries are
+  evicted until the cache fits again.
+- The index lives in memory and is written back every SAVE_EVERY writes and
+  at exit, so lookups never touch more than one object file. Each write
+  merges in what other worker processes saved meanwhile (shared_index)
+  and evicts over the merged index, so the budget holds for all of them.
+- With ENABLED = False, entries written during this run are still served,
+  so a full refresh still downloads each page only once.
+
+Usage:
+    html = page_cache.get_page(url)
+    if html is None:
+        html = download(url)
+        page_cache.put_page(url, html)
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import shared_index
+import url_index
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+CACHE_DIR = os.path.join(BASE_DIR, "data", "page_cache")
+OBJECTS_DIR = os.path.join(CACHE_DIR, "objects")
+INDEX_FILE = os.path.join(CACHE_DIR, "index.json")
+
+PAGE_TTL = 12 * 3600             # Raw HTML: good for a day's re-runs
+EXTRACT_TTL = 30 * 24 * 3600     # Extraction results
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+SAVE_EVERY = 25                  # Index writes are batched
+
+ENABLED = True  # False = lookups miss unless written this run (writes still refresh the cache)
+
+# ─────────────────────────────────────────────────────────────
+# INDEX
+# ─────────────────────────────────────────────────────────────
+_lock = threading.RLock()
+_index = None          # {key: {'hash', 'size', 'stored_at', 'expires_at', 'last_access'}}
+_unsaved_writes = 0
+_written_this_run = set()
+_changes = shared_index.Changes()
+_stats = {'hits': 0, 'misses': 0, 'evicted': 0}
+
+
+def _load():
+    global _index
+    if _index is None:
+        _index = shared_index.load(INDEX_FILE)
+    return _index
+
+
+def save():
+    """Write the index to disk, merged with other processes' changes and evicted to the budget"""
+    global _index, _unsaved_writes
+    with _lock:
+        if _index is None or not _changes:
+            return
+        _index = shared_index.merge_save(INDEX_FILE, _index, _changes, prepare=_evict)
+        _unsaved_writes = 0
+
+
+atexit.register(save)
+
+
+def _object_path(digest):
+    return os.path.join(OBJECTS_DIR, digest[:2], f"{digest}.gz")
+
+
+def _total_bytes(index):
+    """Compressed bytes on disk - shared objects are counted once"""
+    return sum({e['hash']: e['size'] for e in index.values()}.values())
+
+
+def _remove_object(digest):
+    try:
+        os.remove(_object_path(digest))
+    except OSError:
+        pass
+
+
+def _drop(index, key):
+    """Remove an entry, and its object if no other entry points at it"""
+    entry = index.pop(key, None)
+    _changes.remove(key)
+    if entry and not any(e['hash'] == entry['hash'] for e in index.values()):
+        _remove_object(entry['hash'])
+
+
+def _evict(index):
+    """Drop expired entries, then least recently used ones until under budget"""
+    now = time.time()
+    for key in [k for k, e in index.items() if e['expires_at'] < now]:
+        _drop(index, key)
+
+    sizes = {e['hash']: e['size'] for e in index.values()}
+    total = sum(sizes.values())
+    if total <= MAX_CACHE_BYTES:
+        return
+
+    refs = Counter(e['hash'] for e in index.values())
+    for key in sorted(index, key=lambda k: index[k]['last_access']):
+        digest = index.pop(key)['hash']
+        _changes.remove(key)
+        _stats['evicted'] += 1
+        refs[digest] -= 1
+        if not refs[digest]:
+            _remove_object(digest)
+            total -= sizes[digest]
+            if total <= MAX_CACHE_BYTES:
+                break
+
+
+# ─────────────────────────────────────────────────────────────
+# GET / PUT
+# ─────────────────────────────────────────────────────────────
+def get(key):
+    """Cached text for key, or None if missing/expired"""
+    with _lock:
+        index = _load()
+        entry = index.get(key)
+        if entry is None or not (ENABLED or key in _written_this_run):
+            _stats['misses'] += 1
+            return None
+        if entry['expires_at'] < time.time():
+            _drop(index, key)
+            _stats['misses'] += 1
+            return None
+        entry['last_access'] = time.time()
+        _changes.set(key)
+        digest = entry['hash']
+
+    try:
+        with gzip.open(_object_path(digest), 'rb') as f:
+            body = f.read()
+    except OSError:
+        with _lock:
+            _drop(_load(), key)
+            _stats['misses'] += 1
+        return None
+
+    with _lock:
+        _stats['hits'] += 1
+    return body.decode('utf-8')
+
+
+def put(key, text, ttl=PAGE_TTL):
+    """Store text under key for ttl seconds"""
+    global _unsaved_writes
+    body = text.encode('utf-8')
+    digest = hashlib.sha256(body).hexdigest()
+    path = _object_path(digest)
+    compressed = gzip.compress(body)
+
+    now = time.time()
+    with _lock:
+        # Under the lock, so a concurrent put/_evict can't remove the object in between
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Several worker processes (job_queue) share the objects directory
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+        index = _load()
+        old = index.get(key)
+        index[key] = {
+            'hash': digest,
+            'size': len(compressed),
+            'stored_at': now,
+            'expires_at': now + ttl,
+            'last_access': now,
+        }
+        _changes.set(key)
+        if old and old['hash'] != digest and not any(e['hash'] == old['hash'] for e in index.values()):
+            _remove_object(old['hash'])
+        _evict(index)
+
+        _written_this_run.add(key)
+        _unsaved_writes += 1
+        if _unsaved_writes >= SAVE_EVERY:
+            save()
+
+
+# ─────────────────────────────────────────────────────────────
+# HELPERS
+# ─────────────────────────────────────────────────────────────
+def get_page(url):
+    """Cached HTML for url (any spelling of it)"""
+    return get(f"page:{url_index.page_key(url)}")
+
+
+def put_page(url, html, ttl=PAGE_TTL):
+    put(f"page:{url_index.page_key(url)}", html, ttl)
+
+
+def page_urls():
+    """Canonical URLs of every unexpired cached page"""
+    now = time.time()
+    with _lock:
+        return [key[len('page:'):] for key, e in _load().items()
+                if key.startswith('page:') and e['expires_at'] >= now]
+
+
+def get_json(key):
+    """Cached JSON value for key"""
+    text = get(key)
+    return json.loads(text) if text is not None else None
+
+
+def put_json(key, value, ttl=EXTRACT_TTL):
+    put(key, json.dumps(value, ensure_ascii=False), ttl)
+
+
+def print_cache_stats():
+    """Print hit rate and size of the page cache"""
+    with _lock:
+        stats = dict(_stats)
+        index = _load()
+        total = _total_bytes(index)
+    lookups = stats['hits'] + stats['misses']
+    if not lookups:
+        return
+    print(f"\n   🗄️  Page cache: {stats['hits']}/{lookups} hits | {len(index)} entries, "
+          f"{total / (1024 * 1024):.1f} MB | {stats['evicted']} evicted")
@@ -0,0 +1,173 @@
+"""
+ParentBud PDF Extraction
+------------------------
+PDF text extraction in a worker process pool (multiprocessing.Pool).
+
+PDFs are parsed page by page with PyPDF2 in separate processes, so a long
+document never holds up the scrape loop (or the GIL) while pages are
+turned into text. Each document is limited to MAX_PAGES pages and
+TIME_BUDGET seconds - whatever was extracted by then is returned. The
+budget is checked between pages, so a worker stuck inside one page is
+terminated once RESULT_GRACE has passed as well: its pool is terminated
+(the other documents in it fail) and the next submit() starts a new one.
+
+Usage:
+    job = pdf_extract.submit(pdf_bytes)       # returns at once
+    ...
+    text = pdf_extract.result(job)            # text, or None if too little
+"""
+
+import atexit
+import io
+import multiprocessing
+import os
+import re
+import threading
+import time
+import weakref
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+MAX_PAGES = 60          # Pages read per document
+TIME_BUDGET = 45        # Seconds per document, checked between pages
+RESULT_GRACE = 15       # Extra seconds to wait for a worker stuck inside one page
+MIN_TEXT_CHARS = 100    # Less than this is treated as "no text" (scanned PDFs)
+WORKERS = min(4, os.cpu_count() or 1)
+
+_lock = threading.Lock()
+_pool = None
+_pool_of = weakref.WeakKeyDictionary()   # {job: the pool running it}
+_stats = {'documents': 0, 'pages': 0, 'capped': 0, 'timed_out': 0, 'failed': 0}
+
+
+# ─────────────────────────────────────────────────────────────
+# WORKER (runs in the pool processes)
+# ─────────────────────────────────────────────────────────────
+def _extract(content, max_pages, time_budget):
+    """Extract text page by page; stops at max_pages or when time_budget runs out"""
+    deadline = time.monotonic() + time_budget
+    try:
+        import PyPDF2
+    except ImportError:
+        # Fallback: extract readable strings
+        text = re.sub(rb'[^\x20-\x7E\n]', b' ', content).decode('utf-8', errors='ignore')
+        return {'text': ' '.join(text.split()), 'pages': 0, 'total_pages': 0, 'timed_out': False}
+
+    reader = PyPDF2.PdfReader(io.BytesIO(content), strict=False)
+    total_pages = len(reader.pages)
+    parts = []
+    pages = 0
+    timed_out = False
+    for page in reader.pages[:max_pages]:
+        if time.monotonic() > deadline:
+            timed_out = True
+            break
+        page_text = page.extract_text()
+        if page_text:
+            parts.append(page_text)
+        pages += 1
+    return {'text': '\n'.join(parts), 'pages': pages, 'total_pages': total_pages, 'timed_out': timed_out}
+
+
+# ─────────────────────────────────────────────────────────────
+# POOL
+# ─────────────────────────────────────────────────────────────
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # spawn: the scrapers call this from fetch threads, and forking a threaded process is unsafe
+            _pool = multiprocessing.get_context('spawn').Pool(WORKERS)
+        return _pool
+
+
+def shutdown():
+    """Stop the worker processes (abandoned documents included)"""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.terminate()
+
+
+atexit.register(shutdown)
+
+
+def _recycle(job):
+    """Terminate the pool running job - the only way to stop a worker stuck inside one page"""
+    global _pool
+    with _lock:
+        pool = _pool_of.get(job)
+        if pool is None or pool is not _pool:
+            return   # Already terminated
+        _pool = None
+    pool.terminate()
+
+
+def _bump(**counts):
+    with _lock:
+        for key, value in counts.items():
+            _stats[key] += value
+
+
+# ─────────────────────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────────────────────
+def submit(content, max_pages=MAX_PAGES, time_budget=TIME_BUDGET):
+    """Start extracting a PDF (bytes) in the pool; returns a job for result()"""
+    pool = _get_pool()
+    job = pool.apply_async(_extract, (content, max_pages, time_budget))
+    with _lock:
+        _pool_of[job] = pool
+    return job
+
+
+def done(job, timeout=0):
+    """True once job has finished, waiting up to timeout seconds for it"""
+    job.wait(max(0, timeout))
+    return job.ready()
+
+
+def result(job, timeout=TIME_BUDGET + RESULT_GRACE):
+    """Text of a submitted PDF, or None if it failed or had too little text"""
+    if job is None:
+        return None
+    with _lock:
+        terminated = _pool_of.get(job) is not _pool
+    if terminated and not job.ready():
+        # Its pool was torn down for another document - it will never finish
+        _bump(documents=1, failed=1)
+        print(f"   ⚠️  PDF worker pool was restarted - skipped")
+        return None
+    try:
+        extracted = job.get(timeout=timeout)
+    except multiprocessing.TimeoutError:
+        _recycle(job)
+        _bump(documents=1, timed_out=1)
+        print(f"   ⏱️  PDF extraction took over {timeout}s - skipped")
+        return None
+    except Exception as e:
+        _bump(documents=1, failed=1)
+        print(f"   ⚠️  PDF parse error: {str(e)[:30]}")
+        return None
+
+    _bump(documents=1, pages=extracted['pages'],
+          capped=int(extracted['total_pages'] > extracted['pages'] and not extracted['timed_out']),
+          timed_out=int(extracted['timed_out']))
+    text = extracted['text']
+    return text if len(text) > MIN_TEXT_CHARS else None
+
+
+def extract_text(content):
+    """Blocking helper: extract a PDF in the pool and wait for its text"""
+    return result(submit(content))
+
+
+def print_pdf_stats():
+    """Print how many PDFs and pages were extracted"""
+    with _lock:
+        stats = dict(_stats)
+    if stats['documents']:
+        print(f"\n   📄 PDFs: {stats['documents']} documents, {stats['pages']} pages extracted | "
+              f"{stats['capped']} page-capped, {stats['timed_out']} timed out, {stats['failed']} failed")
@@ -0,0 +1,194 @@
+"""
+ParentBud Rate Limiter
+----------------------
+Adaptive per-domain token buckets, applied to every request that goes
+through http_pool.
+
+Each domain has its own request interval (1 / rate) and a small burst:
+- Fast, successful responses slowly shorten the interval (down to MIN_INTERVAL)
+- Slow responses, errors and timeouts lengthen it
+- 429 / 503 halve the rate and pause the domain for its Retry-After
+- A robots.txt Crawl-delay is a floor the interval never goes under
+
+Learned intervals are saved to data/rate_limits.json, so every run starts
+each domain at its last known good rate instead of a fixed guess.
+
+Usage:
+    rate_limiter.acquire(url)                       # blocks until a token is free
+    rate_limiter.observe(url, status, latency, retry_after)
+    rate_limiter.set_crawl_delay(url, seconds)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from fetch_engine import domain_of
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+STATE_FILE = os.path.join(BASE_DIR, "data", "rate_limits.json")
+
+INITIAL_INTERVAL = 1.5   # Seconds between requests to a domain we haven't seen
+MIN_INTERVAL = 0.25
+MAX_INTERVAL = 60.0
+BURST = 2                # Requests a quiet domain may send back to back
+
+SLOW_RESPONSE = 3.0      # Seconds - slower answers mean the host is struggling
+SPEEDUP = 0.9            # Interval multiplier after a fast success
+SLOWDOWN = 1.5           # ...after a slow response or a server error
+BACKOFF = 2.0            # ...after 429 / 503
+MAX_RETRY_AFTER = 300    # Never pause a domain longer than this
+
+THROTTLE_STATUSES = (429, 503)
+
+# ─────────────────────────────────────────────────────────────
+# STATE
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_domains = None   # {domain: {'interval', 'crawl_delay', 'updated_at'}} - persisted
+_buckets = {}     # {domain: {'tokens', 'refilled', 'paused_until'}} - this run only
+_stats = {'waited': 0.0, 'throttled': 0}
+_dirty = False
+
+
+def _load():
+    global _domains
+    if _domains is None:
+        try:
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                _domains = json.load(f)
+        except (OSError, ValueError):
+            _domains = {}
+    return _domains
+
+
+def save():
+    """Write the learned per-domain rates to disk"""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        tmp_path = STATE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_domains, f, indent=2)
+        os.replace(tmp_path, STATE_FILE)
+        _dirty = False
+
+
+atexit.register(save)
+
+
+def _domain_state(domain):
+    return _load().setdefault(domain, {'interval': INITIAL_INTERVAL, 'crawl_delay': None})
+
+
+def _interval(state):
+    return max(state['interval'], state.get('crawl_delay') or 0)
+
+
+def _set_interval(state, interval):
+    global _dirty
+    state['interval'] = round(min(MAX_INTERVAL, max(MIN_INTERVAL, interval)), 3)
+    state['updated_at'] = datetime.now().isoformat()
+    _dirty = True
+
+
+def _retry_after_seconds(value):
+    """Retry-After is either delta-seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return (when - datetime.now(timezone.utc)).total_seconds()
+
+
+# ─────────────────────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────────────────────
+def acquire(url):
+    """Block until url's domain has a token free; returns seconds waited"""
+    domain = domain_of(url)
+    waited = 0.0
+    while True:
+        with _lock:
+            interval = _interval(_domain_state(domain))
+            now = time.monotonic()
+            bucket = _buckets.setdefault(domain, {'tokens': 1.0, 'refilled': now, 'paused_until': 0.0})
+            bucket['tokens'] = min(BURST, bucket['tokens'] + (now - bucket['refilled']) / interval)
+            bucket['refilled'] = now
+
+            if now < bucket['paused_until']:
+                wait = bucket['paused_until'] - now
+            elif bucket['tokens'] >= 1:
+                bucket['tokens'] -= 1
+                _stats['waited'] += waited
+                return waited
+            else:
+                wait = (1 - bucket['tokens']) * interval
+        time.sleep(wait)
+        waited += wait
+
+
+def interval(url):
+    """Seconds to leave between two requests to url's domain (learned rate, Crawl-delay floor)"""
+    with _lock:
+        return _interval(_domain_state(domain_of(url)))
+
+
+def observe(url, status, latency, retry_after=None):
+    """Adapt the domain's rate to a response (status None = network error)"""
+    domain = domain_of(url)
+    with _lock:
+        state = _domain_state(domain)
+        if status in THROTTLE_STATUSES:
+            _stats['throttled'] += 1
+            _set_interval(state, state['interval'] * BACKOFF)
+            pause = _retry_after_seconds(retry_after)
+            if pause is None:
+                pause = _interval(state)
+            bucket = _buckets.setdefault(domain, {'tokens': 0.0, 'refilled': time.monotonic(), 'paused_until': 0.0})
+            bucket['tokens'] = 0.0
+            bucket['paused_until'] = time.monotonic() + min(MAX_RETRY_AFTER, max(0.0, pause))
+        elif status is None or status >= 500 or latency > SLOW_RESPONSE:
+            _set_interval(state, state['interval'] * SLOWDOWN)
+        else:
+            _set_interval(state, state['interval'] * SPEEDUP)
+
+
+def set_crawl_delay(url, delay):
+    """Use a robots.txt Crawl-delay (seconds, or None) as the domain's minimum interval"""
+    global _dirty
+    with _lock:
+        state = _domain_state(domain_of(url))
+        if state.get('crawl_delay') != delay:
+            state['crawl_delay'] = delay
+            _dirty = True
+
+
+def print_rate_stats():
+    """Print time spent waiting on rate limits and how often hosts throttled us"""
+    with _lock:
+        stats = dict(_stats)
+        domains = {d: _interval(s) for d, s in _load().items() if d in _buckets}
+    if not domains:
+        return
+    print(f"   🚦 Rate limits: {stats['waited']:.0f}s waited | {stats['throttled']} throttled responses")
+    slowest = sorted(domains.items(), key=lambda kv: kv[1], reverse=True)[:3]
+    for domain, interval in slowest:
+        print(f"      {domain}: 1 request / {interval:.2f}s")
@@ -0,0 +1,195 @@
+"""
+ParentBud Robots Service
+------------------------
+robots.txt checks shared by every scraper.
+
+- prefetch() downloads robots.txt for every domain in a config concurrently,
+  with a short timeout, before the scrape starts - one slow host no longer
+  stalls a serial run.
+- Parsed rules are cached in memory and the raw files on disk
+  (data/robots_cache.json) with an expiry, so new processes don't fetch
+  them all again.
+- Each site's Crawl-delay is handed to rate_limiter as its minimum interval.
+
+Usage:
+    robots_service.prefetch(all_urls)
+    if robots_service.can_fetch(url): ...
+    delay = robots_service.crawl_delay(url)   # seconds or None
+    sitemaps = robots_service.site_maps(url)  # Sitemap: lines
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import http_pool
+import rate_limiter
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+CACHE_FILE = os.path.join(BASE_DIR, "data", "robots_cache.json")
+
+ROBOTS_TTL = 24 * 3600     # Re-check robots.txt once a day
+ERROR_TTL = 3600           # Unreachable robots.txt: retry sooner
+FETCH_TIMEOUT = 10
+PREFETCH_WORKERS = 16
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+}
+
+# ─────────────────────────────────────────────────────────────
+# CACHE
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_entries = None      # {base: {'status', 'body', 'fetched_at', 'expires_at'}} - persisted
+_parsed = {}         # {base: RobotFileParser}
+_fetch_locks = {}    # One in-flight fetch per base
+_dirty = False
+
+
+def _load():
+    global _entries
+    if _entries is None:
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                _entries = json.load(f)
+        except (OSError, ValueError):
+            _entries = {}
+    return _entries
+
+
+def save():
+    """Write fetched robots.txt files to disk"""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        tmp_path = CACHE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_entries, f, ensure_ascii=False)
+        os.replace(tmp_path, CACHE_FILE)
+        _dirty = False
+
+
+atexit.register(save)
+
+
+def base_url(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _is_fresh(entry):
+    return entry is not None and entry['expires_at'] > time.time()
+
+
+def _download(base):
+    """Fetch robots.txt with a timeout; failures are cached briefly"""
+    now = time.time()
+    try:
+        response = http_pool.get(f"{base}/robots.txt", headers=HEADERS, timeout=FETCH_TIMEOUT, retries=0)
+        status = response.status_code
+        body = response.text if 200 <= status < 300 else ''
+    except Exception:
+        status, body = None, ''
+
+    ttl = ROBOTS_TTL if status is not None and status < 500 else ERROR_TTL
+    return {'status': status, 'body': body, 'fetched_at': now, 'expires_at': now + ttl}
+
+
+def _parse(entry):
+    """Same rules as RobotFileParser.read(), but lenient when unreachable"""
+    rp = RobotFileParser()
+    status = entry['status']
+    if status in (401, 403):
+        rp.disallow_all = True
+    elif status is not None and 200 <= status < 300:
+        rp.parse(entry['body'].splitlines())
+    else:
+        rp.allow_all = True  # Missing or unreachable - assume allowed
+    return rp
+
+
+def _remember(base, entry):
+    """Parse an entry and pass its Crawl-delay on to the rate limiter"""
+    rp = _parse(entry)
+    _parsed[base] = rp
+    delay = rp.crawl_delay('*')
+    rate_limiter.set_crawl_delay(base, float(delay) if delay is not None else None)
+    return rp
+
+
+def _rules(url):
+    """Parsed robots.txt for url's site, fetching it if missing or expired"""
+    global _dirty
+    base = base_url(url)
+    with _lock:
+        entry = _load().get(base)
+        if _is_fresh(entry):
+            if base not in _parsed:
+                _remember(base, entry)
+            return _parsed[base]
+        fetch_lock = _fetch_locks.setdefault(base, threading.Lock())
+
+    with fetch_lock:
+        with _lock:
+            entry = _entries.get(base)
+            if _is_fresh(entry):  # Another thread fetched it meanwhile
+                return _parsed.get(base) or _remember(base, entry)
+
+        entry = _download(base)
+        with _lock:
+            _entries[base] = entry
+            _dirty = True
+            return _remember(base, entry)
+
+
+# ─────────────────────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────────────────────
+def prefetch(urls):
+    """Load robots.txt for every site in urls concurrently"""
+    bases = sorted({base_url(url) for url in urls})
+    with _lock:
+        entries = _load()
+        missing = [b for b in bases if not _is_fresh(entries.get(b))]
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as pool:
+            list(pool.map(_rules, missing))
+        save()
+    print(f"   🤖 robots.txt: {len(bases)} sites ({len(missing)} fetched, {len(bases) - len(missing)} cached)")
+
+
+def can_fetch(url, user_agent='*'):
+    """Check robots.txt - lenient if it can't be checked"""
+    try:
+        return _rules(url).can_fetch(user_agent, url)
+    except Exception:
+        return True
+
+
+def crawl_delay(url, user_agent='*'):
+    """Crawl-delay in seconds for url's site, or None"""
+    try:
+        delay = _rules(url).crawl_delay(user_agent)
+        return float(delay) if delay is not None else None
+    except Exception:
+        return None
+
+
+def site_maps(url):
+    """Sitemap URLs listed in url's robots.txt ([] if none)"""
+    try:
+        return list(_rules(url).site_maps() or [])
+    except Exception:
+        return []
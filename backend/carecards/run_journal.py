@@ -0,0 +1,128 @@
+"""
+ParentBud Run Journal
+---------------------
+Append-only, crash-safe journal of a scrape run, so an interrupted run
+can pick up where it stopped instead of starting from the first topic.
+
+Each URL's outcome is appended to data/journal/<pipeline>.jsonl as soon
+as it is known - one JSON line, flushed and fsync'd - together with the
+record built for it. Nothing else has to survive a crash (a killed
+container never runs atexit handlers): the summary and per-topic files
+are rebuilt from the journal by the resumed run.
+
+A run starts with a 'start' line and ends with a 'finish' line. With
+resume=True, an unfinished run is continued: URLs with a final outcome
+(DONE_STATUSES) are skipped and their records reused; failures are
+retried. A finished (or missing) journal just starts a new run. A line
+torn by the crash itself is ignored.
+
+Usage:
+    journal = RunJournal('scraper_v2', resume='--resume' in sys.argv)
+    entry = journal.done(topic_id, url)            # Outcome from the interrupted run, or None
+    journal.record(topic_id, url, 'saved', record)
+    journal.finish()                               # After the summary files are written
+"""
+
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+JOURNAL_DIR = os.path.join(BASE_DIR, "data", "journal")
+
+DONE_STATUSES = ('saved', 'not_modified', 'skipped')   # 'failed' URLs are retried on resume
+
+
+# ─────────────────────────────────────────────────────────────
+# JOURNAL
+# ─────────────────────────────────────────────────────────────
+def _read(path):
+    """Journal lines, skipping a torn last line"""
+    entries = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+class RunJournal:
+    """Outcome log of one pipeline's run, resumable after a crash"""
+
+    def __init__(self, pipeline, resume=False):
+        self.path = os.path.join(JOURNAL_DIR, f"{pipeline}.jsonl")
+        self._lock = threading.Lock()
+        self._done = {}    # {(scope, url): entry} from the interrupted run
+        self.resumed = False
+        self.stats = {'recorded': 0, 'resumed': 0}
+
+        entries = _read(self.path) if resume else []
+        starts = [i for i, e in enumerate(entries) if e.get('event') == 'start']
+        if starts and not any(e.get('event') == 'finish' for e in entries[starts[-1]:]):
+            # Continue the unfinished run
+            run = entries[starts[-1]:]
+            self.run_id = run[0]['run']
+            for entry in run:
+                if entry.get('event') == 'url' and entry['status'] in DONE_STATUSES:
+                    self._done[(entry['scope'], entry['url'])] = entry
+            self.resumed = True
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if self._file.tell() and not _ends_with_newline(self.path):
+                self._file.write('\n')  # End the torn line so the next entry parses
+            self._append({'event': 'resume'})
+        else:
+            if resume:
+                print("   ℹ️  Nothing to resume - the last run finished")
+            self.run_id = uuid.uuid4().hex[:12]
+            os.makedirs(JOURNAL_DIR, exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._append({'event': 'start'})
+
+    def _append(self, entry):
+        entry = {'run': self.run_id, 'at': datetime.now().isoformat(), **entry}
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def is_done(self, scope, url):
+        """True if the interrupted run already finished url in scope"""
+        return (scope, url) in self._done
+
+    def done(self, scope, url):
+        """The interrupted run's entry for url in scope if its outcome was final, else None"""
+        entry = self._done.get((scope, url))
+        if entry is not None:
+            self.stats['resumed'] += 1
+        return entry
+
+    def record(self, scope, url, status, record=None):
+        """Append a URL's outcome ('saved', 'not_modified', 'skipped' or 'failed')"""
+        self._append({'event': 'url', 'scope': scope, 'url': url, 'status': status, 'record': record})
+        self.stats['recorded'] += 1
+
+    def finish(self):
+        """Mark the run complete - a later resume starts a new one"""
+        self._append({'event': 'finish'})
+        self._file.close()
+
+    def print_stats(self):
+        if self.resumed:
+            print(f"   📓 Journal: resumed run {self.run_id} - {self.stats['resumed']} URLs "
+                  f"reused from the interrupted run, {self.stats['recorded']} new outcomes")
@@ -0,0 +1,97 @@
+"""
+ParentBud Run Manifest
+----------------------
+What every configured URL's last scrape produced, so a run can do only
+the work that changed since then (--incremental).
+
+data/manifests/<pipeline>.json holds, per topic/category, each URL's
+last outcome and when it happened. due() compares the current config
+with it and returns the URLs that need a fetch:
+
+- new      - not in the manifest (just added to the config)
+- stale    - last stored longer ago than the topic's max age
+             ('max_age_days' in its config, else DEFAULT_MAX_AGE_DAYS)
+- failed   - failed last time
+
+Everything else keeps the output it already has. removed() returns (and
+forgets) URLs that were dropped from a topic, so their outputs can be
+deleted. Full runs record to the manifest too, so the next incremental
+run has something to compare with.
+
+Usage:
+    manifest = RunManifest('scraper_v2')
+    due = manifest.due(topic_id, urls, topic.get('max_age_days'))   # {url: reason}
+    manifest.record(topic_id, url, 'saved', fingerprint=fp)
+    manifest.save()
+"""
+
+import json
+import os
+import time
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+MANIFEST_DIR = os.path.join(BASE_DIR, "data", "manifests")
+
+DEFAULT_MAX_AGE_DAYS = 7
+FAILED_STATUSES = ('failed',)   # Retried by the next incremental run, whatever their age
+
+
+class RunManifest:
+    """Last outcome of each configured URL, per topic/category"""
+
+    def __init__(self, pipeline):
+        self.path = os.path.join(MANIFEST_DIR, f"{pipeline}.json")
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}   # {scope: {url: {'status', 'at', ...}}}
+
+    def get(self, scope, url):
+        return self.entries.get(scope, {}).get(url)
+
+    def due(self, scope, urls, max_age_days=None):
+        """{url: 'new' | 'stale' | 'failed'} for the urls that need scraping, in config order"""
+        max_age = (max_age_days or DEFAULT_MAX_AGE_DAYS) * 24 * 3600
+        known = self.entries.get(scope, {})
+        due = {}
+        for url in urls:
+            entry = known.get(url)
+            if entry is None:
+                due[url] = 'new'
+            elif entry['status'] in FAILED_STATUSES:
+                due[url] = 'failed'
+            elif entry['at'] < time.time() - max_age:
+                due[url] = 'stale'
+        return due
+
+    def removed(self, scope, urls):
+        """Forget URLs no longer configured for scope; returns their entries {url: entry}"""
+        known = self.entries.get(scope, {})
+        gone = {url: entry for url, entry in known.items() if url not in set(urls)}
+        for url in gone:
+            del known[url]
+        return gone
+
+    def record(self, scope, url, status, **fields):
+        """Remember a URL's outcome now (fields: whatever locates its output, e.g. fingerprint)"""
+        self.entries.setdefault(scope, {})[url] = {'status': status, 'at': time.time(), **fields}
+
+    def save(self):
+        """Write the manifest (atomic replace)"""
+        os.makedirs(MANIFEST_DIR, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def print_plan(label, due_by_scope, removed_by_scope):
+    """Print what an incremental run is going to do"""
+    reasons = [reason for due in due_by_scope.values() for reason in due.values()]
+    removed = sum(len(gone) for gone in removed_by_scope.values())
+    print(f"\n🔁 Incremental {label}: {reasons.count('new')} new, {reasons.count('stale')} stale, "
+          f"{reasons.count('failed')} previously failed URLs to scrape | {removed} removed")
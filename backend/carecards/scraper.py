@@ -7,20 +7,36 @@ This is Step 1 of the pipeline:
 
 The scraped content is raw knowledge, NOT shown directly in the app.
 AI will rewrite it into 5 actionable cards per topic.
+
+Article links are discovered from each source's sitemap.xml and from its
+pages, ranked by a crawl frontier. Guessed search/topic paths that fail
+are remembered (negative_cache) and not requested again for a while.
+
+By default every topic gets its own crawl of the sources. --single-pass
+crawls the sources once and checks each article against all topics at
+the same time (saved under every topic it matches), so the crawl no
+longer grows with the number of topics.
+
+Usage:
+    python3 scraper.py                  # One crawl per topic
+    python3 scraper.py --single-pass    # One crawl for all topics
 """
 
-import requests
-from bs4 import BeautifulSoup
-from readability import Document
-from newspaper import Article
 import json
 import os
 import hashlib
 import time
-import random
-from urllib.parse import urljoin, urlparse
-from urllib.robotparser import RobotFileParser
-from tqdm import tqdm
+import article_store
+import crawl_frontier
+import downloads
+import http_pool
+import negative_cache
+import page_cache
+import robots_service
+import sitemaps
+from crawl_frontier import Frontier
+from extraction import extract_from_html, print_extraction_stats
+from fetch_engine import FetchEngine
 
 # ─────────────────────────────────────────────────────────────
 # DIRECTORIES
@@ -46,38 +62,19 @@ with open(os.path.join(BASE_DIR, 'topics.json'), 'r') as f:
 HEADERS = {
     'User-Agent': 'ParentBudBot/1.0 (Educational; +https://parentbud.app; non-commercial)'
 }
-REQUEST_DELAY = (1, 3)  # Random delay between requests (seconds)
 MAX_ARTICLES_PER_TOPIC = 20  # Collect up to N articles per topic
+MAX_PAGES_PER_TOPIC = 150    # Crawl budget per topic (listing + article pages)
+MAX_PAGES_SINGLE_PASS = 400  # Crawl budget for --single-pass (all topics together)
+SEARCH_URLS_PER_SOURCE = 5   # Guessed search/topic pages seeded per source
+CRAWL_BATCH = 16             # Frontier entries fetched concurrently (per-domain lanes)
 
 
 # ─────────────────────────────────────────────────────────────
 # ROBOTS.TXT CHECKER
 # ─────────────────────────────────────────────────────────────
-_robots_cache = {}
-
 def can_fetch(url):
     """Check if we're allowed to fetch this URL per robots.txt"""
-    parsed = urlparse(url)
-    base = f"{parsed.scheme}://{parsed.netloc}"
-    
-    if base not in _robots_cache:
-        rp = RobotFileParser()
-        rp.set_url(f"{base}/robots.txt")
-        try:
-            rp.read()
-            _robots_cache[base] = rp
-        except:
-            _robots_cache[base] = None
-    
-    rp = _robots_cache[base]
-    if rp is None:
-        return True  # No robots.txt, assume allowed
-    return rp.can_fetch(HEADERS['User-Agent'], url)
-
-
-def polite_delay():
-    """Be polite: wait between requests"""
-    time.sleep(random.uniform(*REQUEST_DELAY))
+    return robots_service.can_fetch(url, HEADERS['User-Agent'])
 
 
 # ─────────────────────────────────────────────────────────────
@@ -85,57 +82,46 @@ def polite_delay():
 # ─────────────────────────────────────────────────────────────
 def fetch_url(url):
     """Fetch URL content with error handling"""
+    cached = page_cache.get_page(url)
+    if cached is not None:
+        return cached
+    
+    if negative_cache.is_known_bad(url):
+        return None  # Failed recently (e.g. a guessed path that 404s)
     if not can_fetch(url):
         print(f"⛔ Blocked by robots.txt: {url}")
         return None
     try:
-        polite_delay()
-        resp = requests.get(url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
-        return resp.text
+        download = downloads.fetch(url, headers=HEADERS, timeout=15)
+        if negative_cache.record(url, download.status_code):
+            print(f"🚫 {download.status_code}, skipped on later runs: {url}")
+            return None
+        download.raise_for_status()
+        if download.kind != downloads.HTML:
+            print(f"⏭️ Not HTML ({download.kind}): {url}")
+            return None
+        html = download.text
+        page_cache.put_page(url, html)
+        return html
     except Exception as e:
         print(f"❌ Failed to fetch {url}: {e}")
         return None
 
 
-def extract_article(url):
-    """Extract article content using newspaper3k, fallback to readability"""
-    # Try newspaper3k first (better for news/blog articles)
-    try:
-        art = Article(url)
-        art.download()
-        art.parse()
-        art.nlp()
-        if art.text and len(art.text) > 200:
-            return {
-                'title': art.title,
-                'authors': art.authors,
-                'publish_date': art.publish_date.isoformat() if art.publish_date else None,
-                'summary': art.summary if hasattr(art, 'summary') else None,
-                'text': art.text,
-                'extraction_method': 'newspaper3k'
-            }
-    except Exception as e:
-        pass
-    
-    # Fallback: readability
-    try:
-        html = fetch_url(url)
+def extract_article(url, html=None):
+    """Extract article content with the shared chain (learned per-domain extractor order)"""
+    # A fresh article from another pipeline needs no download at all
+    article = article_store.get(url) if html is None else None
+    if article is None:
+        # Download once - every extractor works on the same HTML
+        html = html or fetch_url(url)
         if not html:
             return None
-        doc = Document(html)
-        soup = BeautifulSoup(doc.summary(), 'lxml')
-        text = soup.get_text(separator='\n').strip()
-        if text and len(text) > 200:
-            return {
-                'title': doc.title(),
-                'text': text,
-                'extraction_method': 'readability'
-            }
-    except Exception as e:
-        print(f"❌ Extraction failed for {url}: {e}")
-    
-    return None
+        article = extract_from_html(html, url)
+    if not article:
+        return None
+    article['extraction_method'] = article.pop('method')
+    return article
 
 
 # ─────────────────────────────────────────────────────────────
@@ -155,8 +141,8 @@ def matches_topic(text, topic):
     return matches >= 2
 
 
-def save_raw_article(record, topic_id):
-    """Save article to raw storage"""
+def save_raw_article(record, topic_ids):
+    """Save article to raw storage, and under every topic it belongs to"""
     fid = record.get('fingerprint', fingerprint(record.get('text', '')[:1000]))
     
     # Save to raw directory
@@ -165,11 +151,12 @@ def save_raw_article(record, topic_id):
         json.dump(record, f, ensure_ascii=False, indent=2)
     
     # Also organize by topic
-    topic_dir = os.path.join(TOPIC_DATA_DIR, topic_id)
-    os.makedirs(topic_dir, exist_ok=True)
-    topic_path = os.path.join(topic_dir, f"{fid}.json")
-    with open(topic_path, 'w') as f:
-        json.dump(record, f, ensure_ascii=False, indent=2)
+    for topic_id in topic_ids:
+        topic_dir = os.path.join(TOPIC_DATA_DIR, topic_id)
+        os.makedirs(topic_dir, exist_ok=True)
+        topic_path = os.path.join(topic_dir, f"{fid}.json")
+        with open(topic_path, 'w') as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
     
     return raw_path
 
@@ -201,43 +188,126 @@ def build_search_urls(topic, source):
     return urls
 
 
-def discover_articles_from_page(url, source_domain):
-    """Find article links from a page"""
+# ─────────────────────────────────────────────────────────────
+# CRAWLING (crawl_frontier ranks the links)
+# ─────────────────────────────────────────────────────────────
+def crawl_page(entry, max_depth):
+    """Fetch one frontier entry: (article or None, [(link, anchor)] to follow)"""
+    url = entry['url']
     html = fetch_url(url)
     if not html:
-        return []
+        return None, []
     
-    soup = BeautifulSoup(html, 'lxml')
-    links = set()
+    links = []
+    if entry['depth'] < max_depth:
+        links = crawl_frontier.extract_links(html, url, entry['source'].get('domain', ''))
     
-    for a in soup.find_all('a', href=True):
-        href = a['href']
+    # Seeds are listing/search pages - only discovered pages can be articles
+    article = extract_article(url, html) if entry['depth'] > 0 else None
+    return article, links
+
+
+def build_record(url, article, source, topic_ids):
+    """Raw record for an article matched to topic_ids (fingerprint from its text)"""
+    return {
+        'url': url,
+        'source': source.get('name', source.get('domain')),
+        'topic_id': topic_ids[0],
+        'topic_ids': topic_ids,
+        'fingerprint': fingerprint(article['text'][:2000]),
+        'scraped_at': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        **article
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# MAIN SCRAPING LOGIC
+# ─────────────────────────────────────────────────────────────
+def crawl(frontier, topics, max_pages):
+    """
+    Crawl the frontier until every topic has MAX_ARTICLES_PER_TOPIC articles
+    or max_pages pages are spent. Each extracted article is checked against
+    all topics at once and saved under every one it matches.
+
+    Returns {topic_id: [records]}.
+    """
+    collected = {topic['id']: [] for topic in topics}
+    seen_fingerprints = set()
+    
+    def open_topics():
+        return [t for t in topics if len(collected[t['id']]) < MAX_ARTICLES_PER_TOPIC]
+    
+    def on_result(url, result, done, total):
+        entry = batch[url]
+        if not result:
+            return
+        article, links = result
+        frontier.add_links(links, entry['depth'] + 1, entry['source'])
+        if not article or not article.get('text'):
+            return  # Hub/listing pages stay unseen - later runs find new articles on them
+        frontier.mark_seen(url)
         
-        # Normalize relative URLs
-        if href.startswith('/'):
-            parsed = urlparse(url)
-            href = f"{parsed.scheme}://{parsed.netloc}{href}"
+        # Check topic relevance (topics that are already full don't take more)
+        matched = [t['id'] for t in open_topics() if matches_topic(article['text'], t)]
+        if not matched:
+            return
         
-        # Only keep links from same domain
-        if source_domain not in href:
-            continue
+        # Deduplicate
+        record = build_record(url, article, entry['source'], matched)
+        if record['fingerprint'] in seen_fingerprints:
+            return
+        seen_fingerprints.add(record['fingerprint'])
         
-        # Filter for article-like URLs
-        if any(pattern in href.lower() for pattern in [
-            '/article', '/articles', '/advice', '/tips', 
-            '/how-to', '/guide', '/help', '/parenting',
-            '/toddler', '/child', '/baby', '/kids'
-        ]):
-            links.add(href.split('#')[0].split('?')[0])  # Remove fragments & query
+        save_raw_article(record, matched)
+        for topic_id in matched:
+            collected[topic_id].append(record)
+        print(f"   ✅ Collected for {', '.join(matched)}: {article.get('title', 'Untitled')[:50]}...")
+        
+        # Rank new links by the keywords of topics that still need articles
+        if any(len(collected[t]) >= MAX_ARTICLES_PER_TOPIC for t in matched):
+            frontier.keywords = [kw for t in open_topics() for kw in t.get('keywords', [])]
+    
+    def fetch(url):
+        if not open_topics():
+            return None  # Every topic is full - drain the rest of the batch without fetching
+        return crawl_page(batch[url], frontier.max_depth)
     
-    return list(links)
+    engine = FetchEngine()
+    pages = 0
+    while frontier and open_topics() and pages < max_pages:
+        batch = {entry['url']: entry for entry in
+                 frontier.pop_batch(min(CRAWL_BATCH, max_pages - pages))}
+        pages += len(batch)
+        engine.run(batch, fetch, on_result)
+    
+    stats = frontier.stats
+    print(f"   🧭 Frontier: {pages} pages crawled, {stats['queued']} queued, "
+          f"{stats['skipped_seen']} skipped (crawled in an earlier run)")
+    return collected
+
+
+def seed_frontier(frontier, topics):
+    """
+    Each source's home page, the article URLs from its sitemap, and a few
+    guessed search/topic pages per topic (minus guesses that failed before).
+    """
+    for source in SOURCES:
+        frontier.add_seed(source['seed'], source)
+        
+        # Sitemap URLs are candidate articles, ranked like any discovered link
+        found = sitemaps.site_urls(source['seed'], headers=HEADERS)
+        queued = sum(frontier.add(url, 1, source) for url, _ in found)
+        print(f"   🗺️  {source.get('name', source.get('domain'))}: "
+              f"{len(found)} sitemap URLs, {queued} queued")
+        
+        for topic in topics:
+            for search_url in build_search_urls(topic, source)[:SEARCH_URLS_PER_SOURCE]:
+                if not negative_cache.is_known_bad(search_url):
+                    frontier.add_seed(search_url, source)
 
 
-# ─────────────────────────────────────────────────────────────
-# MAIN SCRAPING LOGIC
-# ─────────────────────────────────────────────────────────────
 def scrape_topic(topic):
-    """Scrape articles for a single topic from all sources"""
+    """Crawl all sources for a topic, best-ranked links first, until enough articles are collected"""
     topic_id = topic['id']
     topic_title = topic['title']
     
@@ -245,94 +315,70 @@ def scrape_topic(topic):
     print(f"📚 TOPIC: {topic_title}")
     print(f"{'='*60}")
     
-    collected = []
-    seen_fingerprints = set()
-    
-    for source in SOURCES:
-        source_name = source.get('name', source.get('domain'))
-        print(f"\n🌐 Source: {source_name}")
-        
-        # Get URLs to explore
-        search_urls = build_search_urls(topic, source)
-        
-        # Collect article links
-        article_urls = set()
-        for search_url in search_urls[:5]:  # Limit searches per source
-            found = discover_articles_from_page(search_url, source.get('domain', ''))
-            article_urls.update(found)
-            if len(article_urls) >= 50:
-                break
-        
-        print(f"   Found {len(article_urls)} potential article URLs")
-        
-        # Extract articles
-        for url in tqdm(list(article_urls)[:30], desc=f"   Extracting"):
-            if len(collected) >= MAX_ARTICLES_PER_TOPIC:
-                break
-            
-            article = extract_article(url)
-            if not article or not article.get('text'):
-                continue
-            
-            # Check topic relevance
-            if not matches_topic(article['text'], topic):
-                continue
-            
-            # Deduplicate
-            fp = fingerprint(article['text'][:2000])
-            if fp in seen_fingerprints:
-                continue
-            seen_fingerprints.add(fp)
-            
-            # Build record
-            record = {
-                'url': url,
-                'source': source_name,
-                'topic_id': topic_id,
-                'fingerprint': fp,
-                'scraped_at': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                **article
-            }
-            
-            save_raw_article(record, topic_id)
-            collected.append(record)
-            print(f"   ✅ Collected: {article.get('title', 'Untitled')[:50]}...")
-        
-        if len(collected) >= MAX_ARTICLES_PER_TOPIC:
-            print(f"   ✓ Reached limit of {MAX_ARTICLES_PER_TOPIC} articles")
-            break
+    frontier = Frontier(topic.get('keywords', []), scope=topic_id)
+    seed_frontier(frontier, [topic])
+    collected = crawl(frontier, [topic], MAX_PAGES_PER_TOPIC)[topic_id]
     
+    if len(collected) >= MAX_ARTICLES_PER_TOPIC:
+        print(f"   ✓ Reached limit of {MAX_ARTICLES_PER_TOPIC} articles")
     print(f"\n📊 Total collected for '{topic_title}': {len(collected)} articles")
     return collected
 
 
-def scrape_all_topics():
-    """Scrape all topics defined in topics.json"""
+def scrape_topics_single_pass(topics):
+    """Crawl every source once, matching each article against all topics at the same time"""
+    print(f"\n{'='*60}")
+    print(f"📚 ALL TOPICS (single pass): {len(topics)} topics")
+    print(f"{'='*60}")
+    
+    keywords = [kw for topic in topics for kw in topic.get('keywords', [])]
+    frontier = Frontier(keywords, scope='all')
+    seed_frontier(frontier, topics)
+    collected = crawl(frontier, topics, MAX_PAGES_SINGLE_PASS)
+    
+    for topic in topics:
+        print(f"📊 Total collected for '{topic['title']}': {len(collected[topic['id']])} articles")
+    return collected
+
+
+def save_summary(counts):
+    """Write scrape_summary.json from {topic_id: articles collected}"""
+    titles = {topic['id']: topic['title'] for topic in TOPICS}
+    summary_path = os.path.join(BASE_DIR, "data", "scrape_summary.json")
+    with open(summary_path, 'w') as f:
+        summary = {
+            'scraped_at': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'topics': {tid: {'title': titles.get(tid, tid), 'count': count}
+                       for tid, count in counts.items()}
+        }
+        json.dump(summary, f, indent=2)
+
+
+def scrape_all_topics(single_pass=False):
+    """Scrape all topics defined in topics.json (single_pass = crawl the sources once for all of them)"""
     print("\n" + "="*60)
     print("🚀 PARENTBUD SCRAPER - Starting")
     print("="*60)
     print(f"Topics to scrape: {len(TOPICS)}")
     print(f"Sources available: {len(SOURCES)}")
+    print(f"Mode: {'single pass over all topics' if single_pass else 'one crawl per topic'}")
+    robots_service.prefetch(source['seed'] for source in SOURCES)
     
-    all_results = {}
+    if single_pass:
+        by_topic = scrape_topics_single_pass(TOPICS)
+    else:
+        by_topic = {topic['id']: scrape_topic(topic) for topic in TOPICS}
     
+    all_results = {}
     for topic in TOPICS:
-        results = scrape_topic(topic)
+        results = by_topic[topic['id']]
         all_results[topic['id']] = {
             'topic': topic,
             'articles': results,
             'count': len(results)
         }
     
-    # Save summary
-    summary_path = os.path.join(BASE_DIR, "data", "scrape_summary.json")
-    with open(summary_path, 'w') as f:
-        summary = {
-            'scraped_at': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
-            'topics': {tid: {'title': d['topic']['title'], 'count': d['count']} 
-                       for tid, d in all_results.items()}
-        }
-        json.dump(summary, f, indent=2)
+    save_summary({tid: d['count'] for tid, d in all_results.items()})
     
     print("\n" + "="*60)
     print("✅ SCRAPING COMPLETE")
@@ -341,6 +387,13 @@ def scrape_all_topics():
         print(f"   {data['topic']['title']}: {data['count']} articles")
     print(f"\nRaw data saved to: {RAW_DATA_DIR}")
     print(f"By-topic data saved to: {TOPIC_DATA_DIR}")
+    http_pool.print_pool_stats()
+    downloads.print_download_stats()
+    page_cache.print_cache_stats()
+    article_store.print_store_stats()
+    sitemaps.print_sitemap_stats()
+    negative_cache.print_negative_stats()
+    print_extraction_stats()
     
     return all_results
 
@@ -349,4 +402,5 @@ def scrape_all_topics():
 # ENTRY POINT
 # ─────────────────────────────────────────────────────────────
 if __name__ == '__main__':
-    scrape_all_topics()
+    import sys
+    scrape_all_topics(single_pass='--single-pass' in sys.argv[1:])
@@ -8,18 +8,28 @@ Pipeline: Scrape → AI Summarize → Store → Show in App
 """
 
 import requests
-from bs4 import BeautifulSoup
-from newspaper import Article
-from readability import Document
 import json
 import os
 import hashlib
-import time
-import random
 import re
-from urllib.parse import urlparse
-from urllib.robotparser import RobotFileParser
+import time
+from concurrent.futures import Future
 from datetime import datetime
+from fetch_engine import FetchEngine, domain_of
+import article_store
+import deadline
+import downloads
+import http_pool
+import http_cache
+import page_cache
+import pdf_extract
+import robots_service
+import shards
+import url_index
+from run_journal import RunJournal
+from run_manifest import RunManifest, print_plan
+from extraction import (extract_from_html, extraction_result, note_skipped_downloads,
+                        print_extraction_stats, submit_extraction)
 
 # ─────────────────────────────────────────────────────────────
 # DIRECTORIES
@@ -74,51 +84,47 @@ HEADERS = {
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.5',
 }
-REQUEST_DELAY = (1.5, 3)  # Be polite
 
 # ─────────────────────────────────────────────────────────────
 # ROBOTS.TXT CHECKER
 # ─────────────────────────────────────────────────────────────
-_robots_cache = {}
-
 def can_fetch(url):
-    """Check robots.txt - be lenient if can't check"""
-    try:
-        parsed = urlparse(url)
-        base = f"{parsed.scheme}://{parsed.netloc}"
-        
-        if base not in _robots_cache:
-            rp = RobotFileParser()
-            rp.set_url(f"{base}/robots.txt")
-            rp.read()
-            _robots_cache[base] = rp
-        
-        rp = _robots_cache[base]
-        # Be more lenient - only block if explicitly disallowed
-        return rp.can_fetch('*', url)
-    except:
-        return True  # Allow if can't check
-
-
-def polite_delay():
-    time.sleep(random.uniform(*REQUEST_DELAY))
+    """Check robots.txt - be lenient if can't check (rules cached on disk by robots_service)"""
+    return robots_service.can_fetch(url)
 
 
 # ─────────────────────────────────────────────────────────────
 # FETCHING FUNCTIONS
 # ─────────────────────────────────────────────────────────────
-def fetch_html(url, skip_robots=False):
-    """Fetch HTML content from URL"""
+def fetch_html(url, skip_robots=False, cache_scopes=None, timeout=30, retries=http_pool.RETRIES):
+    """
+    Fetch HTML content from URL (paced per domain by http_pool's rate limiter).
+    With cache_scopes, revalidates against stored records and returns
+    http_cache.NOT_MODIFIED on a 304.
+    """
+    cached = page_cache.get_page(url)
+    if cached is not None:
+        return cached
+    
     if not skip_robots and not can_fetch(url):
         print(f"   ⛔ Blocked by robots.txt: {url[:50]}...")
         return None
     
     try:
-        polite_delay()
-        session = requests.Session()
-        response = session.get(url, headers=HEADERS, timeout=30, allow_redirects=True)
-        response.raise_for_status()
-        return response.text
+        headers = {**HEADERS, **http_cache.conditional_headers(url, cache_scopes)}
+        download = downloads.fetch(url, headers=headers, timeout=timeout, retries=retries,
+                                   allow_redirects=True)
+        if download.status_code == 304:
+            http_cache.mark_not_modified(url)
+            return http_cache.NOT_MODIFIED
+        download.raise_for_status()
+        if download.kind != downloads.HTML:
+            print(f"   ⏭️  Not HTML ({download.kind}): {url[:50]}...")
+            return None
+        http_cache.remember_response(url, download)
+        html = download.text
+        page_cache.put_page(url, html)
+        return html
     except requests.exceptions.Timeout:
         print(f"   ⏱️  Timeout: {url[:50]}...")
         return None
@@ -130,33 +136,21 @@ def fetch_html(url, skip_robots=False):
         return None
 
 
-def fetch_pdf(url):
-    """Fetch and extract text from PDF"""
+def fetch_pdf(url, timeout=30, retries=http_pool.RETRIES):
+    """Fetch a PDF and queue its text extraction in the PDF worker pool (a pdf_extract job, or None)"""
     try:
-        polite_delay()
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        
-        content = response.content
-        text = ""
-        
-        try:
-            import io
-            import PyPDF2
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        except ImportError:
-            # Fallback: extract readable strings
-            text = re.sub(rb'[^\x20-\x7E\n]', b' ', content).decode('utf-8', errors='ignore')
-            text = ' '.join(text.split())
-        except Exception as e:
-            print(f"   ⚠️  PDF parse error: {str(e)[:30]}")
+        download = downloads.fetch(url, kinds=(downloads.PDF,), headers=HEADERS,
+                                   timeout=timeout, retries=retries)
+        download.raise_for_status()
+        if download.kind != downloads.PDF:
+            print(f"   ⏭️  Not a PDF ({download.kind}): {url[:50]}...")
             return None
-        
-        return text if len(text) > 100 else None
+        if download.truncated:
+            print(f"   ⏭️  PDF too large: {url[:50]}...")
+            return None
+
+        # Parsing runs in another process - resolve with pdf_extract.result()
+        return pdf_extract.submit(download.content)
     except Exception as e:
         print(f"   ❌ PDF failed: {url[:50]}... - {str(e)[:30]}")
         return None
@@ -165,123 +159,13 @@ def fetch_pdf(url):
 # ─────────────────────────────────────────────────────────────
 # EXTRACTION FUNCTIONS
 # ─────────────────────────────────────────────────────────────
-def extract_with_newspaper(url):
-    """Extract article using newspaper3k library"""
-    try:
-        article = Article(url)
-        article.download()
-        article.parse()
-        
-        if article.text and len(article.text) > 200:
-            try:
-                article.nlp()
-                summary = article.summary
-            except:
-                summary = article.text[:500]
-            
-            return {
-                'title': article.title or 'Untitled',
-                'text': article.text,
-                'summary': summary,
-                'authors': article.authors,
-                'publish_date': article.publish_date.isoformat() if article.publish_date else None,
-                'top_image': article.top_image,
-                'method': 'newspaper3k'
-            }
-    except Exception as e:
-        pass
-    return None
-
-
-def extract_with_readability(html, url):
-    """Extract article using readability library"""
-    try:
-        doc = Document(html)
-        content_html = doc.summary()
-        soup = BeautifulSoup(content_html, 'html.parser')
-        text = soup.get_text(separator='\n', strip=True)
-        
-        if text and len(text) > 200:
-            return {
-                'title': doc.title() or 'Untitled',
-                'text': text,
-                'summary': text[:500],
-                'method': 'readability'
-            }
-    except Exception as e:
-        pass
-    return None
-
-
-def extract_with_beautifulsoup(html, url):
-    """Manual extraction using BeautifulSoup"""
-    try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove unwanted elements
-        for tag in soup(['script', 'style', 'nav', 'header', 'footer', 
-                         'aside', 'form', 'iframe', 'noscript', 'ad', 
-                         '.advertisement', '.sidebar', '.comments']):
-            if hasattr(tag, 'decompose'):
-                tag.decompose()
-        
-        # Try to find main content
-        main_content = None
-        for selector in ['article', 'main', '[role="main"]', '.content', 
-                        '.article-body', '.post-content', '#content',
-                        '.entry-content', '.article-content']:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-        
-        if not main_content:
-            main_content = soup.body if soup.body else soup
-        
-        # Get title
-        title = ''
-        title_tag = soup.find('h1') or soup.find('title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-        
-        # Get text
-        text = main_content.get_text(separator='\n', strip=True)
-        
-        # Clean up
-        lines = [line.strip() for line in text.split('\n') if line.strip() and len(line.strip()) > 10]
-        text = '\n'.join(lines)
-        
-        if len(text) > 200:
-            return {
-                'title': title or 'Untitled',
-                'text': text,
-                'summary': text[:500],
-                'method': 'beautifulsoup'
-            }
-    except Exception as e:
-        pass
-    return None
-
-
 def extract_article(url, skip_robots=False):
-    """Try multiple extraction methods"""
-    # Method 1: newspaper3k (best for news/blog articles)
-    result = extract_with_newspaper(url)
-    if result and len(result.get('text', '')) > 300:
-        return result
-    
-    # Method 2: Fetch HTML and try readability
+    """Fetch the page once and run every extractor over the same HTML"""
+    stored = article_store.get(url)
+    if stored:
+        return stored
     html = fetch_html(url, skip_robots=skip_robots)
-    if html:
-        result = extract_with_readability(html, url)
-        if result and len(result.get('text', '')) > 300:
-            return result
-        
-        # Method 3: BeautifulSoup manual extraction
-        result = extract_with_beautifulsoup(html, url)
-        if result and len(result.get('text', '')) > 300:
-            return result
-    
-    return None
+    return extract_from_html(html, url)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -370,11 +254,138 @@ def save_article(record, topic_id, age_groups):
     return fp
 
 
+# ─────────────────────────────────────────────────────────────
+# CONCURRENT FETCHING
+# ─────────────────────────────────────────────────────────────
+def cache_scope(topic_id):
+    """http_cache scope for records built for a topic"""
+    return f"scraper_v2/{topic_id}"
+
+
+def fetch_article(url, cache_scopes=None, **request_options):
+    """
+    Network stage for one URL - with robots check first, then without if
+    robots.txt blocked it. Returns a submit_extraction future (the CPU stage
+    parses the HTML in a worker process), NOT_MODIFIED or None - or the
+    article itself when the shared article store already has a fresh one.
+    request_options (timeout, retries) go to fetch_html.
+    """
+    stored = article_store.get(url)
+    if stored:
+        return stored
+    
+    html = fetch_html(url, cache_scopes=cache_scopes, **request_options)
+    if html is None and not can_fetch(url):
+        # Network failures are already retried by http_pool - only re-fetch robots blocks
+        html = fetch_html(url, skip_robots=True, cache_scopes=cache_scopes, **request_options)
+    if html is http_cache.NOT_MODIFIED:
+        return html
+    if not html:
+        return None
+    
+    def on_parsed(future):
+        if not extraction_result(future):
+            # The old retry re-ran the whole chain (two more downloads) on the same page
+            note_skipped_downloads(2, html)
+    
+    future = submit_extraction(html, url)
+    future.add_done_callback(on_parsed)
+    return future
+
+
+def fetch_full(url):
+    """Download and extract url without revalidating it (the article, or None)"""
+    result = fetch_article(url)
+    return extraction_result(result) if isinstance(result, Future) else result
+
+
+def prefetch_topics(topics, scheduler=None):
+    """
+    Fetch every URL and PDF for the given topics concurrently, one lane per
+    domain. URLs that are the same page (url_index) are fetched once.
+    With a scheduler (deadline.Deadline), URLs go in its order and the ones
+    it leaves out come back as deadline.DROPPED. Returns {configured url: result}.
+    """
+    configured = [url for t in topics.values() for url in t.get('urls', []) + t.get('pdfs', [])]
+    urls, fetch_url_for = url_index.dedupe(configured)
+    pdf_urls = {fetch_url_for[url] for t in topics.values() for url in t.get('pdfs', [])}
+    
+    # Every topic that uses a page needs a stored record before we revalidate
+    scopes_by_url = {}
+    for topic_id, topic_data in topics.items():
+        for url in topic_data.get('urls', []):
+            scopes_by_url.setdefault(fetch_url_for[url], []).append(cache_scope(topic_id))
+    
+    seconds = {}
+    
+    def fetch_source(url):
+        request_options = {}
+        if scheduler:
+            request_options = scheduler.admit(url)
+            if request_options is None:
+                return deadline.DROPPED
+        start = time.monotonic()
+        try:
+            if url in pdf_urls:
+                return fetch_pdf(url, **request_options)
+            return fetch_article(url, cache_scopes=scopes_by_url.get(url), **request_options)
+        finally:
+            seconds[url] = time.monotonic() - start
+    
+    def report(url, result, done, total):
+        status = ('⏱' if result is deadline.DROPPED else '↺' if result is http_cache.NOT_MODIFIED
+                  else '✓' if result else '✗')
+        print(f"   {status} [{done}/{total}] {url[:55]}...")
+    
+    domains = {domain_of(url) for url in urls}
+    print(f"\n⚡ Fetching {len(urls)} pages across {len(domains)} domains "
+          f"({len(set(configured))} configured URLs)...")
+    if scheduler:
+        urls = scheduler.order(urls)
+    robots_service.prefetch(urls)
+    fetched = FetchEngine().run(urls, fetch_source, on_result=report)
+    
+    # Downloads are done - collect what the CPU stage parsed meanwhile
+    for url, result in fetched.items():
+        if result is deadline.DROPPED:
+            continue
+        if url in pdf_urls:
+            if scheduler and result is not None and not pdf_extract.done(result, scheduler.extraction_left()):
+                fetched[url] = deadline.DROPPED   # Still parsing at the deadline
+                scheduler.stats['dropped'] += 1
+                continue
+            fetched[url] = pdf_extract.result(result)
+        elif isinstance(result, Future):
+            fetched[url] = extraction_result(result)
+        # Yield history for later --time-budget runs
+        result = fetched[url]
+        text = result if isinstance(result, str) else result.get('text') if isinstance(result, dict) else None
+        deadline.record(url, seconds.get(url), bool(result), len(text) if text else None)
+    return {url: fetched.get(fetch_url) for url, fetch_url in fetch_url_for.items()}
+
+
 # ─────────────────────────────────────────────────────────────
 # MAIN SCRAPING FUNCTION
 # ─────────────────────────────────────────────────────────────
-def scrape_topic(topic_id, topic_data):
-    """Scrape all URLs for a single topic"""
+def kept_record(topic_id, entry):
+    """The record an earlier run saved for a URL (from its run_manifest entry), or None"""
+    if not entry or not entry.get('fingerprint'):
+        return None
+    try:
+        with open(os.path.join(TOPIC_DIR, topic_id, f"{entry['fingerprint']}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def scrape_topic(topic_id, topic_data, fetched=None, journal=None, manifest=None, only=None):
+    """
+    Scrape all URLs for a single topic (fetched: results from prefetch_topics).
+    With a journal, each URL's outcome is journaled as it finishes and URLs
+    done by an interrupted run are reused from it. With only (incremental
+    runs), the other URLs keep the records earlier runs saved for them, as
+    do URLs a time budget left out (deadline.DROPPED).
+    """
     title = topic_data.get('title', topic_id)
     description = topic_data.get('description', '')
     age_groups = topic_data.get('age_groups', {})
@@ -389,24 +400,97 @@ def scrape_topic(topic_id, topic_data):
     print(f"   URLs to scrape: {len(urls)}")
     print(f"   PDFs to scrape: {len(pdfs)}")
     
+    if fetched is None:
+        fetched = prefetch_topics({topic_id: topic_data})
+    
     collected = []
     
+    def remember(url, status, record):
+        """Record url's outcome in the manifest, replacing the files of an outdated version"""
+        previous = manifest.get(topic_id, url) or {}
+        if not record:
+            # Failed or skipped: the earlier files stay on disk - keep track of them
+            manifest.record(topic_id, url, status, fingerprint=previous.get('fingerprint'),
+                            age_groups=previous.get('age_groups', []))
+            return
+        manifest.record(topic_id, url, status, fingerprint=record['fingerprint'],
+                        age_groups=record.get('age_groups', []))
+        if previous.get('fingerprint') and previous['fingerprint'] != record['fingerprint']:
+            remove_article(topic_id, previous, manifest)
+    
+    def outcome(url, status, record=None):
+        if journal:
+            journal.record(topic_id, url, status, record)
+        if manifest:
+            remember(url, status, record)
+    
+    def kept(url):
+        """Incremental runs: True (and its earlier record collected) if url isn't due"""
+        if only is None or url in only:
+            return False
+        record = kept_record(topic_id, manifest.get(topic_id, url))
+        if record:
+            collected.append(record)
+        return True
+    
+    def resumed(url):
+        """True (and its record collected) if the interrupted run already handled url"""
+        done = journal.done(topic_id, url) if journal else None
+        if not done:
+            return False
+        # Its files are already on disk
+        if done['record']:
+            collected.append(done['record'])
+        if manifest:
+            remember(url, done['status'], done['record'])
+        print(f"      ↻ Done before the interruption ({done['status']})")
+        return True
+    
+    def dropped(url):
+        """True (and its earlier record collected) if the time budget left url out"""
+        if fetched.get(url) is not deadline.DROPPED:
+            return False
+        # Not journaled or recorded - --resume / --incremental pick it up later
+        record = kept_record(topic_id, manifest.get(topic_id, url)) if manifest else None
+        if record:
+            collected.append(record)
+        print(f"      ⏱️  Out of time - {'kept the earlier record' if record else 'not scraped'}")
+        return True
+    
+    if only is not None:
+        print(f"   Incremental: {len(only)} due, the rest keep their records")
+    
     # Scrape regular URLs
     for i, url in enumerate(urls, 1):
+        if kept(url):
+            continue
         print(f"\n   [{i}/{len(urls)}] {url[:55]}...")
+        if resumed(url) or dropped(url):
+            continue
         
-        # Try with robots check first, then without if fails
-        article = extract_article(url, skip_robots=False)
-        if not article:
-            article = extract_article(url, skip_robots=True)
-        
+        article = fetched.get(url)
+        if article is http_cache.NOT_MODIFIED:
+            # Unchanged since last run - reuse the stored record as-is
+            record = http_cache.get_record(url, cache_scope(topic_id))
+            if record is not None:
+                save_article(record, topic_id, record.get('age_groups', []))
+                collected.append(record)
+                outcome(url, 'not_modified', record)
+                print(f"      ↺ Not modified: {record.get('title', 'Untitled')[:35]}...")
+                continue
+            # Validators without a stored record (edited cache, new scope) - download it in full
+            print(f"      ↺ Not modified, but no stored record - fetching in full")
+            article = fetch_full(url)
         if not article:
+            outcome(url, 'failed')
             print(f"      ⚠️  Could not extract content")
             continue
+        article = dict(article)  # Same URL may be shared by several topics
         
         # Clean and validate
         article['text'] = clean_text(article.get('text', ''))
         if len(article['text']) < 200:
+            outcome(url, 'skipped')
             print(f"      ⚠️  Content too short ({len(article['text'])} chars)")
             continue
         
@@ -424,17 +508,24 @@ def scrape_topic(topic_id, topic_data):
         }
         
         fp = save_article(record, topic_id, detected_ages)
+        http_cache.store_record(url, cache_scope(topic_id), record)
         collected.append(record)
+        outcome(url, 'saved', record)
         ages_str = ', '.join(detected_ages)
         print(f"      ✅ Saved: {article.get('title', 'Untitled')[:35]}...")
         print(f"         Ages: [{ages_str}] | {len(article['text'])} chars")
     
     # Scrape PDFs
     for i, url in enumerate(pdfs, 1):
+        if kept(url):
+            continue
         print(f"\n   [PDF {i}/{len(pdfs)}] {url[:55]}...")
+        if resumed(url) or dropped(url):
+            continue
         
-        text = fetch_pdf(url)
+        text = fetched.get(url)
         if not text or len(text) < 200:
+            outcome(url, 'failed')
             print(f"      ⚠️  Could not extract PDF content")
             continue
         
@@ -455,36 +546,61 @@ def scrape_topic(topic_id, topic_data):
         
         fp = save_article(record, topic_id, detected_ages)
         collected.append(record)
+        outcome(url, 'saved', record)
         ages_str = ', '.join(detected_ages)
         print(f"      ✅ Saved PDF: {len(text)} chars | Ages: [{ages_str}]")
     
+    http_cache.save()
     print(f"\n   📊 Topic '{title}': {len(collected)} articles collected")
     return collected
 
 
-def scrape_all():
-    """Scrape all curated URLs for all topics"""
-    print("\n" + "="*60)
-    print("🚀 PARENTBUD ENHANCED SCRAPER V2")
-    print("="*60)
-    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Topics to scrape: {len(CURATED_URLS)}")
-    
-    total_urls = sum(len(t.get('urls', [])) + len(t.get('pdfs', [])) for t in CURATED_URLS.values())
-    print(f"Total URLs: {total_urls}")
-    
-    all_results = {}
-    total_collected = 0
-    
-    for topic_id, topic_data in CURATED_URLS.items():
-        results = scrape_topic(topic_id, topic_data)
-        all_results[topic_id] = results
-        total_collected += len(results)
-    
-    # Save summary
+def pending_topics(topics, skip):
+    """topics without the URLs skip(topic_id, url) rules out (nothing to fetch for those)"""
+    return {
+        topic_id: {**topic_data,
+                   'urls': [u for u in topic_data.get('urls', []) if not skip(topic_id, u)],
+                   'pdfs': [u for u in topic_data.get('pdfs', []) if not skip(topic_id, u)]}
+        for topic_id, topic_data in topics.items()
+    }
+
+
+def remove_article(topic_id, entry, manifest):
+    """
+    Delete the files save_article wrote for a run_manifest entry. Copies
+    another manifest entry still uses (the same text under another URL or
+    topic) are kept: the topic file while the topic uses it, the raw/ and
+    by_age/ copies while any topic does.
+    """
+    if not entry.get('fingerprint'):
+        return
+    name = f"{entry['fingerprint']}.json"
+    users = {scope for scope, urls in manifest.entries.items()
+             for e in urls.values() if e.get('fingerprint') == entry['fingerprint']}
+    paths = [] if topic_id in users else [os.path.join(TOPIC_DIR, topic_id, name)]
+    if not users:
+        # Entries from before age groups were recorded: look in every age directory
+        ages = entry.get('age_groups')
+        age_dirs = ([age.replace("-", "_") for age in ages] if ages is not None
+                    else os.listdir(AGE_DIR) if os.path.isdir(AGE_DIR) else [])
+        paths.append(os.path.join(RAW_DIR, name))
+        paths += [os.path.join(AGE_DIR, age_dir, name) for age_dir in age_dirs]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def remove_outputs(topic_id, gone, manifest):
+    """Delete the files of URLs dropped from the topic's config (their run_manifest entries)"""
+    for entry in gone.values():
+        remove_article(topic_id, entry, manifest)
+
+
+def save_summary(all_results):
+    """Write scrape_summary_v2.json from {topic_id: [records]} (or fingerprints)"""
     summary = {
         'scraped_at': datetime.now().isoformat(),
-        'total_articles': total_collected,
+        'total_articles': sum(len(articles) for articles in all_results.values()),
         'topics': {
             tid: {
                 'title': CURATED_URLS[tid].get('title', tid),
@@ -493,29 +609,165 @@ def scrape_all():
                 'count': len(articles),
                 'urls_attempted': len(CURATED_URLS[tid].get('urls', [])) + len(CURATED_URLS[tid].get('pdfs', []))
             }
-            for tid, articles in all_results.items()
+            for tid, articles in all_results.items() if tid in CURATED_URLS
         }
     }
     
     summary_path = os.path.join(DATA_DIR, 'scrape_summary_v2.json')
     with open(summary_path, 'w') as f:
         json.dump(summary, f, indent=2)
+
+
+def use_shard(shard):
+    """Write this run's outputs to the shard's directory (shards.shard_dir) instead of data/"""
+    global DATA_DIR, RAW_DIR, TOPIC_DIR, AGE_DIR
+    DATA_DIR = shards.shard_dir('scraper_v2', shard)
+    RAW_DIR = os.path.join(DATA_DIR, "raw")
+    TOPIC_DIR = os.path.join(DATA_DIR, "by_topic")
+    AGE_DIR = os.path.join(DATA_DIR, "by_age")
+    for directory in (RAW_DIR, TOPIC_DIR, AGE_DIR):
+        os.makedirs(directory, exist_ok=True)
+
+
+def output_files(all_results):
+    """Files save_article wrote for the records in {topic_id: [records]}, relative to DATA_DIR"""
+    files = []
+    for tid, records in all_results.items():
+        for record in records:
+            name = f"{record['fingerprint']}.json"
+            paths = [os.path.join(RAW_DIR, name), os.path.join(TOPIC_DIR, tid, name)]
+            paths += [os.path.join(AGE_DIR, age.replace("-", "_"), name) for age in record.get('age_groups', [])]
+            files += [os.path.relpath(path, DATA_DIR) for path in paths]
+    return files
+
+
+def scrape_all(resume=False, incremental=False, shard=None, time_budget=None):
+    """
+    Scrape all curated URLs for all topics.
+
+    resume: continue an interrupted run. incremental: scrape only URLs that
+    are new, stale (older than the topic's max_age_days) or failed last
+    time (run_manifest); the rest keep their saved records. shard (i, N):
+    only this machine's share of the URLs (shards), written to its shard
+    directory for merge_shards(). time_budget (seconds): highest-yield
+    URLs first, and the ones that don't fit keep their earlier records
+    (deadline) - the journal stays open for --resume.
+    """
+    scheduler = deadline.Deadline(time_budget) if time_budget else None
+    print("\n" + "="*60)
+    print("🚀 PARENTBUD ENHANCED SCRAPER V2")
+    print("="*60)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Topics to scrape: {len(CURATED_URLS)}")
+    if scheduler:
+        print(f"Time budget: {time_budget:.0f}s")
+    
+    topics = shards.select_topics(CURATED_URLS, shard)
+    if shard:
+        use_shard(shard)
+        print(f"Shard: {shard[0]}/{shard[1]}")
+    total_urls = sum(len(t.get('urls', [])) + len(t.get('pdfs', [])) for t in topics.values())
+    print(f"Total URLs: {total_urls}")
+    
+    all_results = {}
+    total_collected = 0
+    journal = RunJournal('scraper_v2' + shards.suffix(shard), resume=resume)
+    manifest = RunManifest('scraper_v2' + shards.suffix(shard))
+    
+    # Config diff against the last run: drop outputs of removed URLs (and topics)
+    removed = {tid: manifest.removed(tid, t.get('urls', []) + t.get('pdfs', []))
+               for tid, t in topics.items()}
+    for tid in [tid for tid in manifest.entries if tid not in topics]:
+        removed[tid] = manifest.entries.pop(tid)
+    for tid, gone in removed.items():
+        remove_outputs(tid, gone, manifest)
+    due = None
+    if incremental:
+        due = {tid: manifest.due(tid, t.get('urls', []) + t.get('pdfs', []), t.get('max_age_days'))
+               for tid, t in topics.items()}
+        print_plan('scrape', due, removed)
+    
+    def skip(topic_id, url):
+        return journal.is_done(topic_id, url) or (due is not None and url not in due[topic_id])
+    
+    # Fetch everything up front so all domains run in parallel
+    pending = pending_topics(topics, skip)
+    if scheduler:
+        # Topics whose URLs lack records have coverage gaps - fill those first
+        held = {tid: {url for url, entry in manifest.entries.get(tid, {}).items()
+                      if entry['status'] in ('saved', 'not_modified')}
+                for tid in pending}
+        scheduler.plan(pending, held)
+    fetched = prefetch_topics(pending, scheduler)
+    
+    for topic_id, topic_data in topics.items():
+        results = scrape_topic(topic_id, topic_data, fetched, journal, manifest,
+                               only=due[topic_id] if due is not None else None)
+        all_results[topic_id] = results
+        total_collected += len(results)
+        manifest.save()
+    
+    save_summary(all_results)
+    if shard:
+        shards.write_index('scraper_v2', shard, output_files(all_results),
+                           {tid: [r['fingerprint'] for r in records] for tid, records in all_results.items()})
+    out_of_time = any(result is deadline.DROPPED for result in fetched.values())
+    if not out_of_time:
+        journal.finish()
     
     # Print summary
     print("\n" + "="*60)
     print("✅ SCRAPING COMPLETE")
     print("="*60)
     for tid, articles in all_results.items():
-        title = CURATED_URLS[tid].get('title', tid)
-        attempted = len(CURATED_URLS[tid].get('urls', [])) + len(CURATED_URLS[tid].get('pdfs', []))
-        ages = list(CURATED_URLS[tid].get('age_groups', {}).keys())
+        title = topics[tid].get('title', tid)
+        attempted = len(topics[tid].get('urls', [])) + len(topics[tid].get('pdfs', []))
+        ages = list(topics[tid].get('age_groups', {}).keys())
         print(f"   {title}: {len(articles)}/{attempted} articles | Ages: {ages}")
     print(f"\n   Total: {total_collected} articles collected")
     print(f"   Data saved to: {DATA_DIR}")
+    if out_of_time:
+        print("   ⏱️  Out of time - the rest kept their earlier records; run with --resume to finish")
+    http_pool.print_pool_stats()
+    downloads.print_download_stats()
+    print_extraction_stats()
+    pdf_extract.print_pdf_stats()
+    http_cache.print_cache_stats()
+    page_cache.print_cache_stats()
+    url_index.print_index_stats()
+    article_store.print_store_stats()
+    journal.print_stats()
+    if scheduler:
+        scheduler.print_stats()
     
     return all_results
 
 
+def merge_shards():
+    """Combine the shards of a sharded run (--shard i/N on each machine) into data/"""
+    print("\n" + "="*60)
+    print("🧩 MERGING SCRAPER V2 SHARDS")
+    print("="*60)
+    indexes = shards.read_indexes('scraper_v2')
+    if not indexes:
+        print(f"❌ No finished shards in {os.path.join(shards.SHARDS_DIR, 'scraper_v2')}")
+        return {}
+    
+    # The indexes list every file and fingerprint - nothing is rescanned
+    all_results = {tid: [] for tid in CURATED_URLS}
+    for index in indexes:
+        copied = shards.merge_files(index, DATA_DIR)
+        for tid, fingerprints in index['results'].items():
+            all_results.setdefault(tid, []).extend(fingerprints)
+        print(f"   Shard {index['shard']}/{index['count']}: {copied} files")
+    save_summary(all_results)
+    
+    total = sum(len(fps) for fps in all_results.values())
+    print(f"\n   Total: {total} articles from {len(indexes)} shards")
+    print(f"   Data saved to: {DATA_DIR}")
+    return all_results
+
+
 def scrape_single_topic(topic_id):
     """Scrape a single topic by ID"""
     if topic_id not in CURATED_URLS:
@@ -523,7 +775,10 @@ def scrape_single_topic(topic_id):
         print(f"Available topics: {list(CURATED_URLS.keys())}")
         return []
     
-    return scrape_topic(topic_id, CURATED_URLS[topic_id])
+    manifest = RunManifest('scraper_v2')
+    results = scrape_topic(topic_id, CURATED_URLS[topic_id], manifest=manifest)
+    manifest.save()
+    return results
 
 
 # ─────────────────────────────────────────────────────────────
@@ -532,8 +787,23 @@ def scrape_single_topic(topic_id):
 if __name__ == '__main__':
     import sys
     
-    if len(sys.argv) > 1:
-        topic = sys.argv[1]
+    # --full-refresh: download every page even if the server says it's unchanged
+    if '--full-refresh' in sys.argv:
+        http_cache.ENABLED = False
+        page_cache.ENABLED = False
+    # --shard i/N: scrape this machine's share only; --merge-shards combines them
+    # --time-budget 45m: stop fetching in time, highest-yield URLs first
+    shard, argv = shards.from_argv(sys.argv[1:])
+    time_budget, argv = deadline.from_argv(argv)
+    args = [a for a in argv if not a.startswith('--')]
+    
+    if '--merge-shards' in argv:
+        merge_shards()
+    elif args:
+        topic = args[0]
         scrape_single_topic(topic)
     else:
-        scrape_all()
+        # --resume: continue an interrupted run, skipping the URLs it finished
+        # --incremental: only new, stale and previously failed URLs
+        scrape_all(resume='--resume' in argv, incremental='--incremental' in argv,
+                   shard=shard, time_budget=time_budget)
@@ -0,0 +1,157 @@
+"""
+ParentBud Shards
+----------------
+Deterministic split of a pipeline's URLs across machines (--shard i/N).
+
+A URL's shard comes from a stable hash (SHA-1, not Python's per-process
+hash()) of the domain of its canonical URL (url_index.canonical - not
+page_key, which follows each machine's own remembered redirects), so:
+
+- every machine computes the same split without talking to the others
+- every URL of a domain lands in the same shard - one machine paces all
+  requests to a host, and politeness holds as in a single run
+
+A sharded run writes its outputs under data/shards/<pipeline>/<i>-of-<N>/
+with the usual layout (raw/, by_topic/, by_age/, suggested_articles/)
+plus index.json: the files it wrote and the results the summary is built
+from. --merge-shards copies exactly those files into data/ and writes
+the summary from the indexes - the merged directories are never scanned.
+Shard directories from other machines just need to be copied into
+data/shards/<pipeline>/ first.
+
+Usage:
+    shard, argv = shards.from_argv(sys.argv[1:])   # (2, 4) for --shard 2/4
+    topics = shards.select_topics(CURATED_URLS, shard)
+    shards.write_index('scraper_v2', shard, files, results)
+    for index in shards.read_indexes('scraper_v2'): ...
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+import url_index
+from fetch_engine import domain_of
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+SHARDS_DIR = os.path.join(BASE_DIR, "data", "shards")
+INDEX_NAME = "index.json"
+
+
+# ─────────────────────────────────────────────────────────────
+# SELECTION
+# ─────────────────────────────────────────────────────────────
+def parse(value):
+    """'i/N' → (i, N), shards numbered 1..N"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"--shard expects i/N (e.g. 2/4), got {value!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"--shard {value}: i must be between 1 and N")
+    return index, count
+
+
+def from_argv(argv):
+    """(shard or None, argv without the --shard option) - accepts '--shard i/N' and '--shard=i/N'"""
+    rest = list(argv)
+    for at, arg in enumerate(rest):
+        if arg.startswith('--shard='):
+            del rest[at]
+            return parse(arg.split('=', 1)[1]), rest
+        if arg == '--shard' and at + 1 < len(rest):
+            value = rest[at + 1]
+            del rest[at:at + 2]
+            return parse(value), rest
+    return None, rest
+
+
+def shard_of(url, count):
+    """Shard (1..count) of url - the same for every URL of its domain"""
+    domain = domain_of(url_index.canonical(url))
+    return int(hashlib.sha1(domain.encode('utf-8')).hexdigest(), 16) % count + 1
+
+
+def select(urls, shard):
+    """The URLs that belong to shard (all of them when shard is None)"""
+    if shard is None:
+        return list(urls)
+    index, count = shard
+    return [url for url in urls if shard_of(url, count) == index]
+
+
+def select_topics(topics, shard, fields=('urls', 'pdfs')):
+    """topics (or categories) with each URL list cut down to the shard's URLs"""
+    if shard is None:
+        return topics
+    return {topic_id: {**topic, **{field: select(topic[field], shard) for field in fields if field in topic}}
+            for topic_id, topic in topics.items()}
+
+
+def suffix(shard):
+    """Name suffix for per-shard state files (journal, manifest)"""
+    return '' if shard is None else f".shard-{shard[0]}-of-{shard[1]}"
+
+
+# ─────────────────────────────────────────────────────────────
+# OUTPUTS
+# ─────────────────────────────────────────────────────────────
+def shard_dir(pipeline, shard):
+    """Where a shard of pipeline writes its outputs"""
+    return os.path.join(SHARDS_DIR, pipeline, f"{shard[0]}-of-{shard[1]}")
+
+
+def write_index(pipeline, shard, files, results):
+    """Record the files a shard wrote (relative to its directory) and its summary results"""
+    directory = shard_dir(pipeline, shard)
+    os.makedirs(directory, exist_ok=True)
+    index = {
+        'shard': shard[0],
+        'count': shard[1],
+        'written_at': datetime.now().isoformat(),
+        'files': sorted(set(files)),
+        'results': results,
+    }
+    tmp_path = os.path.join(directory, INDEX_NAME + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(directory, INDEX_NAME))
+
+
+def read_indexes(pipeline):
+    """Indexes of the pipeline's finished shards (warns about missing ones)"""
+    root = os.path.join(SHARDS_DIR, pipeline)
+    indexes = []
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        try:
+            with open(os.path.join(root, name, INDEX_NAME), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            print(f"   ⚠️  Shard {name}: no index (not finished?) - skipped")
+            continue
+        index['dir'] = os.path.join(root, name)
+        indexes.append(index)
+
+    counts = {index['count'] for index in indexes}
+    if len(counts) > 1:
+        raise ValueError(f"Shards of {pipeline} were split different ways: {sorted(counts)} - "
+                         f"remove the stale ones from {root}")
+    if indexes:
+        missing = set(range(1, indexes[0]['count'] + 1)) - {index['shard'] for index in indexes}
+        if missing:
+            print(f"   ⚠️  Merging without shard(s) {sorted(missing)} of {indexes[0]['count']}")
+    return indexes
+
+
+def merge_files(index, target_dir):
+    """Copy the files a shard listed into target_dir (same relative paths); returns how many"""
+    for relative in index['files']:
+        target = os.path.join(target_dir, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(os.path.join(index['dir'], relative), target)
+    return len(index['files'])
@@ -0,0 +1,87 @@
+"""
+ParentBud Shared Indexes
+------------------------
+Read-merge-write for the JSON indexes that several worker processes
+(job_queue) keep at once: page_cache, http_cache, article_store and
+url_index.
+
+Each process holds its own copy of an index in memory. Writing that copy
+back as-is would drop whatever the other processes wrote since it was
+loaded - their page_cache objects would fall out of every index, and
+eviction would never reach them. So save() takes an exclusive lock on
+<file>.lock, re-reads the file, applies only this process's changes (the
+keys it set or removed since its last save) and writes the result
+atomically. Two processes changing the same key: the later save wins.
+
+Usage:
+    _changes = shared_index.Changes()
+    index[key] = entry;  _changes.set(key)
+    index.pop(key);      _changes.remove(key)
+    index = shared_index.merge_save(INDEX_FILE, index, _changes, prepare=_evict)
+"""
+
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None   # Windows: no file lock - run a single worker process there
+
+
+class Changes:
+    """Keys of an index this process set or removed since its last save"""
+
+    def __init__(self):
+        self.changed = set()
+        self.removed = set()
+
+    def set(self, key):
+        self.changed.add(key)
+        self.removed.discard(key)
+
+    def remove(self, key):
+        self.removed.add(key)
+        self.changed.discard(key)
+
+    def clear(self):
+        self.changed.clear()
+        self.removed.clear()
+
+    def __bool__(self):
+        return bool(self.changed or self.removed)
+
+
+def load(path):
+    """The index in path ({} if missing or unreadable)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def merge_save(path, index, changes, prepare=None, **dump_options):
+    """
+    Write this process's changes to index over the file's current contents
+    and return the merged index. prepare(merged) runs before the write
+    (e.g. eviction or dropping expired entries); dump_options go to json.dump.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.lock', 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)   # Released when the file closes
+        merged = load(path)
+        for key in changes.removed:
+            merged.pop(key, None)
+        for key in changes.changed:
+            if key in index:
+                merged[key] = index[key]
+        if prepare:
+            prepare(merged)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, **dump_options)
+        os.replace(tmp_path, path)
+    changes.clear()
+    return merged
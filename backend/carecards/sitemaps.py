@@ -0,0 +1,148 @@
+"""
+ParentBud Sitemaps
+------------------
+Article discovery from a site's sitemap.xml.
+
+Sitemaps come from robots.txt (Sitemap: lines); sites that don't list any
+are tried at /sitemap.xml and /sitemap_index.xml. Each file is streamed
+and parsed incrementally (XMLPullParser), so a large sitemap never sits
+in memory as a whole and reading stops once MAX_URLS_PER_SITE URLs are
+found. Sitemap indexes are followed newest-first (by lastmod), up to
+MAX_SITEMAPS files per site; .xml.gz files are inflated on the fly.
+
+Every sitemap file (listed, fallback or from an index) is checked
+against robots.txt before it is fetched. Sitemaps that 404 go into the
+negative cache. The URL list for each site is kept in the page cache
+for SITEMAP_TTL.
+
+Usage:
+    for url, lastmod in sitemaps.site_urls(seed_url, headers=HEADERS): ...
+"""
+
+import threading
+import zlib
+from xml.etree import ElementTree
+
+import http_pool
+import negative_cache
+import page_cache
+import robots_service
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+SITEMAP_TTL = 24 * 3600
+FALLBACK_PATHS = ('/sitemap.xml', '/sitemap_index.xml')
+MAX_SITEMAPS = 10              # Sitemap files read per site (indexes included)
+MAX_URLS_PER_SITE = 5000
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024   # The sitemap protocol's own limit (uncompressed)
+CHUNK_SIZE = 64 * 1024
+FETCH_TIMEOUT = 20
+
+_stats_lock = threading.Lock()
+_stats = {'sites': 0, 'sitemaps': 0, 'urls': 0, 'cached': 0}
+
+
+def _bump(**counts):
+    with _stats_lock:
+        for key, value in counts.items():
+            _stats[key] += value
+
+
+# ─────────────────────────────────────────────────────────────
+# STREAMING PARSER
+# ─────────────────────────────────────────────────────────────
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _entries(url, headers):
+    """Yield ('url' | 'sitemap', loc, lastmod) from one sitemap file as it downloads"""
+    response = http_pool.get(url, headers=headers, timeout=FETCH_TIMEOUT, stream=True)
+    try:
+        if response.status_code != 200:
+            negative_cache.record(url, response.status_code)
+            return
+        _bump(sitemaps=1)
+        parser = ElementTree.XMLPullParser(events=('end',))
+        inflate = None
+        size = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if inflate is None:
+                # .xml.gz served as a file (not Content-Encoding) - still gzip on the wire
+                inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if chunk[:2] == b'\x1f\x8b' else False
+            if inflate:
+                chunk = inflate.decompress(chunk)
+            size += len(chunk)
+            if size > MAX_SITEMAP_BYTES:
+                break
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                kind = _local_name(element.tag)
+                if kind not in ('url', 'sitemap'):
+                    continue
+                fields = {_local_name(child.tag): (child.text or '').strip() for child in element}
+                element.clear()  # Keep memory flat on big files
+                if fields.get('loc'):
+                    yield kind, fields['loc'], fields.get('lastmod')
+    finally:
+        response.close()
+
+
+# ─────────────────────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────────────────────
+def site_urls(seed_url, headers=None):
+    """[(url, lastmod)] from the sitemaps of seed_url's site (cached)"""
+    base = robots_service.base_url(seed_url)
+    key = f"sitemap:{base}"
+    cached = page_cache.get_json(key)
+    if cached is not None:
+        _bump(cached=1)
+        return [tuple(entry) for entry in cached]
+
+    listed = robots_service.site_maps(seed_url)
+    fallbacks = [] if listed else [base + path for path in FALLBACK_PATHS]
+    queue = list(listed)
+    user_agent = (headers or {}).get('User-Agent', '*')
+    visited = set()
+    urls = []
+    while len(visited) < MAX_SITEMAPS and len(urls) < MAX_URLS_PER_SITE:
+        if not queue:
+            if urls or not fallbacks:
+                break
+            queue.append(fallbacks.pop(0))  # Next well-known location
+        sitemap_url = queue.pop(0)
+        if sitemap_url in visited or negative_cache.is_known_bad(sitemap_url):
+            continue
+        visited.add(sitemap_url)
+        if not robots_service.can_fetch(sitemap_url, user_agent):
+            print(f"   ⛔ Blocked by robots.txt: {sitemap_url}")
+            continue
+        children = []
+        try:
+            for kind, loc, lastmod in _entries(sitemap_url, headers):
+                if kind == 'sitemap':
+                    children.append((lastmod or '', loc))
+                else:
+                    urls.append((loc, lastmod))
+                    if len(urls) >= MAX_URLS_PER_SITE:
+                        break
+        except Exception as e:
+            # Unreachable, or not XML (e.g. an HTML "not found" page served with 200)
+            print(f"   ⚠️  Sitemap unreadable: {sitemap_url} - {str(e)[:40]}")
+        children.sort(reverse=True)
+        queue += [loc for _, loc in children]
+
+    page_cache.put_json(key, urls, ttl=SITEMAP_TTL)
+    _bump(sites=1, urls=len(urls))
+    return urls
+
+
+def print_sitemap_stats():
+    """Print how many sitemaps were read and how many URLs they gave"""
+    with _stats_lock:
+        stats = dict(_stats)
+    if stats['sites'] or stats['cached']:
+        print(f"   🗺️  Sitemaps: {stats['sitemaps']} files read for {stats['sites']} sites, "
+              f"{stats['urls']} URLs found | {stats['cached']} sites from cache")
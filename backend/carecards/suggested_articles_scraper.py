@@ -8,20 +8,31 @@ Usage:
     python3 suggested_articles_scraper.py              # Scrape all
     python3 suggested_articles_scraper.py sleep        # Scrape single category
     python3 suggested_articles_scraper.py --dry-run    # Test without API calls
+    python3 suggested_articles_scraper.py --full-refresh  # Ignore cached pages and ETag/Last-Modified
+    python3 suggested_articles_scraper.py --resume     # Continue an interrupted run
+    python3 suggested_articles_scraper.py --incremental   # Only new, stale and failed URLs
+    python3 suggested_articles_scraper.py --shard 2/4  # This machine's share of the URLs
+    python3 suggested_articles_scraper.py --merge-shards  # Combine the shards' outputs
 """
 
 import requests
-from bs4 import BeautifulSoup
-from newspaper import Article
-from readability import Document
 import json
 import os
 import hashlib
 import time
-import random
 import re
 from urllib.parse import urlparse
 from datetime import datetime
+import article_store
+import downloads
+import http_pool
+import http_cache
+import page_cache
+import shards
+import url_index
+from run_journal import RunJournal
+from run_manifest import RunManifest, print_plan
+from extraction import extract_from_html, print_extraction_stats
 
 # ─────────────────────────────────────────────────────────────
 # CONFIGURATION
@@ -42,7 +53,6 @@ HEADERS = {
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.5',
 }
-REQUEST_DELAY = (1.0, 2.0)
 
 # ─────────────────────────────────────────────────────────────
 # SUGGESTED ARTICLES URLS BY CATEGORY
@@ -310,149 +320,79 @@ Be warm, supportive, and practical. Focus on what parents can actually do."""
 # ─────────────────────────────────────────────────────────────
 # SCRAPING FUNCTIONS
 # ─────────────────────────────────────────────────────────────
-def polite_delay():
-    time.sleep(random.uniform(*REQUEST_DELAY))
-
-
-def fetch_html(url):
-    """Fetch HTML content from URL"""
+def fetch_page(url, cache_scopes=None):
+    """
+    Fetch a page as (kind, html). kind is downloads.HTML, PDF or VIDEO - only
+    HTML bodies are downloaded. html is http_cache.NOT_MODIFIED on a 304
+    revalidation and None on failure.
+    """
+    cached = page_cache.get_page(url)
+    if cached is not None:
+        return downloads.HTML, cached
+    
     try:
-        polite_delay()
-        session = requests.Session()
-        response = session.get(url, headers=HEADERS, timeout=30, allow_redirects=True)
-        response.raise_for_status()
-        return response.text
+        headers = {**HEADERS, **http_cache.conditional_headers(url, cache_scopes)}
+        download = downloads.fetch(url, headers=headers, timeout=30, allow_redirects=True)
+        if download.status_code == 304:
+            http_cache.mark_not_modified(url)
+            return downloads.HTML, http_cache.NOT_MODIFIED
+        download.raise_for_status()
+        if download.kind != downloads.HTML:
+            return download.kind, None
+        http_cache.remember_response(url, download)
+        html = download.text
+        page_cache.put_page(url, html)
+        return downloads.HTML, html
     except requests.exceptions.Timeout:
         print(f"      ⏱️  Timeout")
-        return None
     except requests.exceptions.HTTPError as e:
         print(f"      ❌ HTTP {e.response.status_code}")
-        return None
     except Exception as e:
         print(f"      ❌ Failed: {str(e)[:40]}")
-        return None
-
+    return downloads.HTML, None
 
-def extract_with_newspaper(url):
-    """Extract article using newspaper3k library"""
-    try:
-        article = Article(url)
-        article.download()
-        article.parse()
-        
-        if article.text and len(article.text) > 200:
-            return {
-                'title': article.title or 'Untitled',
-                'text': article.text,
-                'authors': article.authors,
-                'publish_date': article.publish_date.isoformat() if article.publish_date else None,
-                'top_image': article.top_image,
-                'method': 'newspaper3k'
-            }
-    except Exception as e:
-        pass
-    return None
 
-
-def extract_with_readability(html, url):
-    """Extract article using readability library"""
-    try:
-        doc = Document(html)
-        content_html = doc.summary()
-        soup = BeautifulSoup(content_html, 'html.parser')
-        text = soup.get_text(separator='\n', strip=True)
-        
-        if text and len(text) > 200:
-            return {
-                'title': doc.title() or 'Untitled',
-                'text': text,
-                'method': 'readability'
-            }
-    except Exception as e:
-        pass
-    return None
-
-
-def extract_with_beautifulsoup(html, url):
-    """Manual extraction using BeautifulSoup"""
-    try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove unwanted elements
-        for tag in soup(['script', 'style', 'nav', 'header', 'footer', 
-                         'aside', 'form', 'iframe', 'noscript']):
-            tag.decompose()
-        
-        # Find main content
-        main_content = None
-        for selector in ['article', 'main', '[role="main"]', '.content', 
-                        '.article-body', '.post-content', '#content']:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-        
-        if not main_content:
-            main_content = soup.body if soup.body else soup
-        
-        # Get title
-        title = ''
-        title_tag = soup.find('h1') or soup.find('title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-        
-        # Get text
-        text = main_content.get_text(separator='\n', strip=True)
-        lines = [line.strip() for line in text.split('\n') if line.strip() and len(line.strip()) > 10]
-        text = '\n'.join(lines)
-        
-        if len(text) > 200:
-            return {
-                'title': title or 'Untitled',
-                'text': text,
-                'method': 'beautifulsoup'
-            }
-    except Exception as e:
-        pass
-    return None
+def video_title(url):
+    """'YouTube Video', 'Vimeo Video'... from the host; plain 'Video' for other hosts"""
+    host = urlparse(url).netloc.lower().split(':')[0]
+    for site, name in (('youtube.com', 'YouTube'), ('youtu.be', 'YouTube'), ('vimeo.com', 'Vimeo')):
+        if host == site or host.endswith('.' + site):
+            return f"{name} Video"
+    return 'Video'
 
 
-def extract_article(url):
+def extract_article(url, cache_scopes=None):
     """Try multiple extraction methods"""
-    # Skip YouTube and PDF URLs for now
-    if 'youtube.com' in url or 'youtu.be' in url:
+    # Videos are recognised from the URL, PDFs from the URL or their Content-Type
+    kind = downloads.kind_from_url(url)
+    html = None
+    if kind is None:
+        stored = article_store.get(url)
+        if stored:
+            return stored
+        # Fetch once, then newspaper3k → readability → BeautifulSoup on the same HTML.
+        # Summaries come from Gemini / smart extraction, so skip newspaper's NLP.
+        kind, html = fetch_page(url, cache_scopes=cache_scopes)
+    
+    if kind == downloads.VIDEO:
         return {
-            'title': 'YouTube Video',
+            'title': video_title(url),
             'text': 'Video content - watch for parenting tips',
             'is_video': True,
             'method': 'video'
         }
     
-    if url.endswith('.pdf'):
+    if kind == downloads.PDF:
         return {
-            'title': url.split('/')[-1].replace('.pdf', '').replace('-', ' ').replace('_', ' ').title(),
+            'title': url.rstrip('/').split('/')[-1].replace('.pdf', '').replace('-', ' ').replace('_', ' ').title(),
             'text': 'PDF Document - download for detailed information',
             'is_pdf': True,
             'method': 'pdf'
         }
     
-    # Method 1: newspaper3k
-    result = extract_with_newspaper(url)
-    if result and len(result.get('text', '')) > 300:
-        return result
-    
-    # Method 2: Fetch HTML and try readability
-    html = fetch_html(url)
-    if html:
-        result = extract_with_readability(html, url)
-        if result and len(result.get('text', '')) > 300:
-            return result
-        
-        # Method 3: BeautifulSoup
-        result = extract_with_beautifulsoup(html, url)
-        if result and len(result.get('text', '')) > 300:
-            return result
-    
-    return None
+    if html is http_cache.NOT_MODIFIED:
+        return html
+    return extract_from_html(html, url)
 
 
 def clean_text(text):
@@ -559,8 +499,35 @@ def create_smart_fallback_summary(title: str, text: str, category: str) -> dict:
 # ─────────────────────────────────────────────────────────────
 # MAIN SCRAPING FUNCTION
 # ─────────────────────────────────────────────────────────────
-def scrape_category(category_id: str, category_data: dict, dry_run: bool = False) -> list:
-    """Scrape all URLs for a single category and generate Gemini summaries"""
+def load_category(category_id: str) -> dict:
+    """Records in the category's saved file, by URL"""
+    try:
+        with open(os.path.join(ARTICLES_DIR, f"{category_id}.json"), 'r', encoding='utf-8') as f:
+            return {record['url']: record for record in json.load(f)}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_category(category_id: str, articles: list):
+    """Write the category's articles file"""
+    if articles:
+        category_path = os.path.join(ARTICLES_DIR, f"{category_id}.json")
+        with open(category_path, 'w', encoding='utf-8') as f:
+            json.dump(articles, f, indent=2, ensure_ascii=False)
+        print(f"\n   💾 Saved: {category_path}")
+
+
+def scrape_category(category_id: str, category_data: dict, dry_run: bool = False,
+                    journal: RunJournal = None, manifest: RunManifest = None,
+                    only: dict = None, save: bool = True) -> list:
+    """
+    Scrape all URLs for a single category and generate Gemini summaries.
+    With a journal, each URL's record is journaled as it finishes and URLs
+    done by an interrupted run are reused from it (no second Gemini call).
+    With only (incremental runs), the other URLs - and due URLs that fail
+    this time - keep their records from the saved category file.
+    save=False leaves writing the category file to the caller (job_queue).
+    """
     title = category_data.get('title', category_id)
     emoji = category_data.get('emoji', '📖')
     color = category_data.get('color', '#333333')
@@ -572,15 +539,52 @@ def scrape_category(category_id: str, category_data: dict, dry_run: bool = False
     print(f"   URLs to scrape: {len(urls)}")
     
     articles = []
+    scope = f"suggested/{category_id}"
+    saved = load_category(category_id) if only is not None else {}
+    if only is not None:
+        print(f"   Incremental: {len(only)} due, the rest keep their records")
+    
+    def outcome(url, status, record=None):
+        if journal:
+            journal.record(category_id, url, status, record)
+        if manifest:
+            manifest.record(category_id, url, status)
     
     for i, url in enumerate(urls, 1):
+        if only is not None and url not in only:
+            if url in saved:
+                articles.append(saved[url])
+            continue
         domain = urlparse(url).netloc
         print(f"\n   [{i}/{len(urls)}] {domain}")
         
-        # Extract article content
-        article = extract_article(url)
+        done = journal.done(category_id, url) if journal else None
+        if done:
+            articles.append(done['record'])
+            if manifest:
+                manifest.record(category_id, url, done['status'])
+            print(f"      ↻ Done before the interruption: {done['record'].get('title', 'Untitled')[:40]}...")
+            continue
+        
+        # Extract article content (dry runs never revalidate or store records)
+        article = extract_article(url, cache_scopes=None if dry_run else [scope])
+        
+        if article is http_cache.NOT_MODIFIED:
+            # Unchanged since last run - reuse the stored record, summary included
+            record = http_cache.get_record(url, scope)
+            if record is not None:
+                articles.append(record)
+                outcome(url, 'not_modified', record)
+                print(f"      ↺ Not modified: {record.get('title', 'Untitled')[:40]}...")
+                continue
+            # Validators without a stored record (edited cache, new scope) - download it in full
+            print(f"      ↺ Not modified, but no stored record - fetching in full")
+            article = extract_article(url)
         
         if not article:
+            outcome(url, 'failed')
+            if url in saved:
+                articles.append(saved[url])  # Keep the last good record until a retry works
             print(f"      ⚠️  Could not extract content")
             continue
         
@@ -606,6 +610,7 @@ def scrape_category(category_id: str, category_data: dict, dry_run: bool = False
                 'scraped_at': datetime.now().isoformat()
             }
             articles.append(record)
+            outcome(url, 'saved', record)
             print(f"      📎 {'Video' if article.get('is_video') else 'PDF'}: {article.get('title', 'Untitled')[:40]}...")
             continue
         
@@ -669,39 +674,23 @@ def scrape_category(category_id: str, category_data: dict, dry_run: bool = False
             'scraped_at': datetime.now().isoformat()
         }
         
+        if not dry_run:
+            http_cache.store_record(url, scope, record)
         articles.append(record)
+        outcome(url, 'saved', record)
+    
+    http_cache.save()
     
     # Save category articles
-    if articles:
-        category_path = os.path.join(ARTICLES_DIR, f"{category_id}.json")
-        with open(category_path, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, indent=2, ensure_ascii=False)
-        print(f"\n   💾 Saved: {category_path}")
+    if save:
+        save_category(category_id, articles)
     
     print(f"\n   📊 Category '{title}': {len(articles)}/{len(urls)} articles processed")
     return articles
 
 
-def scrape_all(dry_run: bool = False):
-    """Scrape all categories"""
-    print("\n" + "="*60)
-    print("🚀 PARENTBUD SUGGESTED ARTICLES SCRAPER")
-    print("="*60)
-    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Categories: {len(SUGGESTED_URLS)}")
-    print(f"Dry run: {dry_run}")
-    
-    total_urls = sum(len(cat['urls']) for cat in SUGGESTED_URLS.values())
-    print(f"Total URLs: {total_urls}")
-    
-    all_articles = {}
-    total_collected = 0
-    
-    for category_id, category_data in SUGGESTED_URLS.items():
-        articles = scrape_category(category_id, category_data, dry_run)
-        all_articles[category_id] = articles
-        total_collected += len(articles)
-    
+def save_outputs(all_articles: dict):
+    """Write all_suggested_articles.json and scrape_summary.json from {category_id: [records]}"""
     # Save master file with all articles
     all_flat = []
     for articles in all_articles.values():
@@ -714,7 +703,7 @@ def scrape_all(dry_run: bool = False):
     # Save summary
     summary = {
         'scraped_at': datetime.now().isoformat(),
-        'total_articles': total_collected,
+        'total_articles': len(all_flat),
         'categories': {
             cat_id: {
                 'title': SUGGESTED_URLS[cat_id]['title'],
@@ -729,17 +718,129 @@ def scrape_all(dry_run: bool = False):
     summary_path = os.path.join(ARTICLES_DIR, "scrape_summary.json")
     with open(summary_path, 'w') as f:
         json.dump(summary, f, indent=2)
+
+
+def use_shard(shard: tuple):
+    """Write this run's outputs to the shard's directory (shards.shard_dir) instead of data/"""
+    global ARTICLES_DIR
+    ARTICLES_DIR = os.path.join(shards.shard_dir('suggested', shard), "suggested_articles")
+    os.makedirs(ARTICLES_DIR, exist_ok=True)
+
+
+def scrape_all(dry_run: bool = False, resume: bool = False, incremental: bool = False,
+               shard: tuple = None):
+    """
+    Scrape all categories.
+
+    resume: continue an interrupted run. incremental: scrape only URLs that
+    are new, stale (older than the category's max_age_days) or failed last
+    time (run_manifest); category files are updated in place. shard (i, N):
+    only this machine's share of the URLs (shards), written to its shard
+    directory for merge_shards().
+    """
+    print("\n" + "="*60)
+    print("🚀 PARENTBUD SUGGESTED ARTICLES SCRAPER")
+    print("="*60)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Categories: {len(SUGGESTED_URLS)}")
+    print(f"Dry run: {dry_run}")
+    
+    categories = shards.select_topics(SUGGESTED_URLS, shard)
+    if shard:
+        use_shard(shard)
+        print(f"Shard: {shard[0]}/{shard[1]}")
+    all_urls = [url for cat in categories.values() for url in cat['urls']]
+    pages, _ = url_index.dedupe(all_urls)
+    print(f"Total URLs: {len(all_urls)} ({len(pages)} distinct pages - each downloaded once)")
+    
+    all_articles = {}
+    total_collected = 0
+    # Dry runs make placeholder summaries - never journal, resume or record those
+    journal = None if dry_run else RunJournal('suggested' + shards.suffix(shard), resume=resume)
+    manifest = None if dry_run else RunManifest('suggested' + shards.suffix(shard))
+    
+    due = None
+    if manifest:
+        # Config diff against the last run: categories dropped from the config lose their files
+        removed = {cat_id: manifest.removed(cat_id, cat['urls']) for cat_id, cat in categories.items()}
+        for cat_id in [cat_id for cat_id in manifest.entries if cat_id not in categories]:
+            removed[cat_id] = manifest.entries.pop(cat_id)
+            category_path = os.path.join(ARTICLES_DIR, f"{cat_id}.json")
+            if os.path.exists(category_path):
+                os.remove(category_path)
+        if incremental:
+            due = {cat_id: manifest.due(cat_id, cat['urls'], cat.get('max_age_days'))
+                   for cat_id, cat in categories.items()}
+            print_plan('scrape', due, removed)
+    
+    for category_id, category_data in categories.items():
+        articles = scrape_category(category_id, category_data, dry_run, journal, manifest,
+                                   only=due[category_id] if due is not None else None)
+        if manifest:
+            manifest.save()
+        all_articles[category_id] = articles
+        total_collected += len(articles)
+    
+    save_outputs(all_articles)
+    if shard:
+        # save_category skips empty categories
+        shards.write_index('suggested', shard,
+                           [os.path.join("suggested_articles", f"{cat_id}.json")
+                            for cat_id, articles in all_articles.items() if articles],
+                           {cat_id: len(articles) for cat_id, articles in all_articles.items()})
+    if journal:
+        journal.finish()
     
     # Print summary
     print("\n" + "="*60)
     print("✅ SCRAPING COMPLETE")
     print("="*60)
     for cat_id, articles in all_articles.items():
-        cat = SUGGESTED_URLS[cat_id]
+        cat = categories[cat_id]
         print(f"   {cat['emoji']} {cat['title']}: {len(articles)}/{len(cat['urls'])} articles")
     print(f"\n   Total: {total_collected} articles with Gemini summaries")
     print(f"   Saved to: {ARTICLES_DIR}")
+    http_pool.print_pool_stats()
+    downloads.print_download_stats()
+    print_extraction_stats()
+    http_cache.print_cache_stats()
+    page_cache.print_cache_stats()
+    url_index.print_index_stats()
+    article_store.print_store_stats()
+    if journal:
+        journal.print_stats()
+    
+    return all_articles
+
+
+def merge_shards():
+    """Combine the shards of a sharded run (--shard i/N on each machine) into data/suggested_articles"""
+    print("\n" + "="*60)
+    print("🧩 MERGING SUGGESTED ARTICLES SHARDS")
+    print("="*60)
+    indexes = shards.read_indexes('suggested')
+    if not indexes:
+        print(f"❌ No finished shards in {os.path.join(shards.SHARDS_DIR, 'suggested')}")
+        return {}
     
+    # Only the category files the indexes list are read; records go back into config order
+    all_articles = {}
+    for cat_id, cat in SUGGESTED_URLS.items():
+        position = {url: i for i, url in enumerate(cat['urls'])}
+        articles = []
+        for index in indexes:
+            relative = os.path.join("suggested_articles", f"{cat_id}.json")
+            if relative in index['files']:
+                with open(os.path.join(index['dir'], relative), 'r', encoding='utf-8') as f:
+                    articles.extend(json.load(f))
+        articles.sort(key=lambda record: position.get(record['url'], len(position)))
+        save_category(cat_id, articles)
+        all_articles[cat_id] = articles
+    save_outputs(all_articles)
+    
+    total = sum(len(articles) for articles in all_articles.values())
+    print(f"\n   Total: {total} articles from {len(indexes)} shards")
+    print(f"   Saved to: {ARTICLES_DIR}")
     return all_articles
 
 
@@ -750,7 +851,11 @@ def scrape_single_category(category_id: str, dry_run: bool = False):
         print(f"Available: {list(SUGGESTED_URLS.keys())}")
         return []
     
-    return scrape_category(category_id, SUGGESTED_URLS[category_id], dry_run)
+    manifest = None if dry_run else RunManifest('suggested')
+    articles = scrape_category(category_id, SUGGESTED_URLS[category_id], dry_run, manifest=manifest)
+    if manifest:
+        manifest.save()
+    return articles
 
 
 # ─────────────────────────────────────────────────────────────
@@ -760,10 +865,19 @@ if __name__ == '__main__':
     import sys
     
     dry_run = '--dry-run' in sys.argv
-    args = [a for a in sys.argv[1:] if not a.startswith('--')]
-    
-    if args:
+    if '--full-refresh' in sys.argv:
+        http_cache.ENABLED = False  # Download every page even if unchanged
+        page_cache.ENABLED = False
+    # --shard i/N: scrape this machine's share only; --merge-shards combines them
+    shard, argv = shards.from_argv(sys.argv[1:])
+    args = [a for a in argv if not a.startswith('--')]
+    
+    if '--merge-shards' in argv:
+        merge_shards()
+    elif args:
         category = args[0]
         scrape_single_category(category, dry_run)
     else:
-        scrape_all(dry_run)
+        # --resume: continue an interrupted run, skipping the URLs it finished
+        # --incremental: only new, stale and previously failed URLs
+        scrape_all(dry_run, resume='--resume' in argv, incremental='--incremental' in argv, shard=shard)
@@ -0,0 +1,256 @@
+"""
+ParentBud URL Index
+-------------------
+URL canonicalization, redirect memory and dedup for every pipeline.
+
+The same page turns up in several configs (curated_urls_v2.json,
+SUGGESTED_URLS, TOPIC_URLS, URLS_BY_TOPIC) and in several topics of one
+config, often written slightly differently - www. or not, http or https,
+upper/lower-case host, a trailing slash, tracking parameters, a #fragment.
+Paths keep their case: on most servers /Sleep and /sleep (or two
+youtu.be IDs) are different pages.
+
+- canonical(url) maps all of those spellings to one key
+- Redirects seen by downloads.fetch are remembered (data/url_index.json),
+  so resolve(url) skips the redirect hop next time, and two configured
+  URLs that end on the same page share one key
+- dedupe(urls) merges a config's URLs before fetching: one fetch per
+  canonical page, no matter how many topics or categories list it
+- page_cache keys pages by canonical URL, so a page is downloaded once per
+  run even across pipelines
+
+Usage:
+    fetch_urls, fetch_url_for = url_index.dedupe(all_configured_urls)
+    key = url_index.canonical(url)
+
+    python3 url_index.py          # Report URLs duplicated across the configs
+"""
+
+import ast
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import shared_index
+
+# ─────────────────────────────────────────────────────────────
+# SETTINGS
+# ─────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(__file__)
+INDEX_FILE = os.path.join(BASE_DIR, "data", "url_index.json")
+
+REDIRECT_TTL = 30 * 24 * 3600    # Remembered redirects are re-checked after this
+MAX_REDIRECT_HOPS = 5            # Chains followed by resolve()
+
+TRACKING_PARAMS = ('utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
+                   'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid',
+                   'igshid', 'ref', 'ref_src', '_ga', '_gl')
+
+# Where URLs are configured: JSON files, and module-level dicts (read with ast, not imported)
+CONFIG_FILES = ['curated_urls_v2.json', 'curated_urls.json']
+CONFIG_DICTS = [
+    ('suggested_articles_scraper.py', 'SUGGESTED_URLS'),
+    ('enhanced_card_generator.py', 'TOPIC_URLS'),
+    ('enhanced_scraper.py', 'URLS_BY_TOPIC'),
+    ('enhanced_scraper_v2.py', 'URLS_BY_TOPIC'),
+]
+
+
+# ─────────────────────────────────────────────────────────────
+# CANONICALIZATION
+# ─────────────────────────────────────────────────────────────
+def canonical(url):
+    """
+    One key for every spelling of a URL: https, lower-case host without
+    www./default port, path (case kept) without a trailing slash, tracking
+    parameters dropped and the rest sorted, no fragment.
+    """
+    parts = urlsplit(url.strip())
+    if parts.scheme.lower() not in ('http', 'https') or not parts.hostname:
+        return url.strip()
+    host = parts.hostname.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if len(path) > 1:
+        path = path.rstrip('/')
+    params = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                    if k.lower() not in TRACKING_PARAMS and not k.lower().startswith('utm_'))
+    query = f"?{urlencode(params)}" if params else ''
+    return f"https://{host}{path}{query}"
+
+
+# ─────────────────────────────────────────────────────────────
+# REDIRECTS (persisted)
+# ─────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_redirects = None   # {canonical(url): {'url': final url, 'expires_at'}}
+_stats = {'redirects_learned': 0, 'redirects_skipped': 0, 'merged': 0}
+_changes = shared_index.Changes()
+
+
+def _load():
+    global _redirects
+    if _redirects is None:
+        _redirects = shared_index.load(INDEX_FILE)
+        _drop_expired(_redirects)
+    return _redirects
+
+
+def _drop_expired(entries):
+    now = time.time()
+    for key in [k for k, e in entries.items() if e['expires_at'] <= now]:
+        del entries[key]
+
+
+def save():
+    """Write the remembered redirects to disk (merged with other processes' changes)"""
+    global _redirects
+    with _lock:
+        if not _changes:
+            return
+        _redirects = shared_index.merge_save(INDEX_FILE, _redirects, _changes, prepare=_drop_expired, indent=2)
+
+
+atexit.register(save)
+
+
+def record_redirect(url, final_url):
+    """Remember that url ends up at final_url (http→https and slash redirects included)"""
+    if not final_url or final_url == url:
+        return
+    key = canonical(url)
+    with _lock:
+        entry = _load().get(key)
+        if entry is None or entry['url'] != final_url:
+            _stats['redirects_learned'] += 1
+        _redirects[key] = {'url': final_url, 'expires_at': time.time() + REDIRECT_TTL}
+        _changes.set(key)
+
+
+def _follow(url):
+    with _lock:
+        redirects = _load()
+        resolved = url
+        for _ in range(MAX_REDIRECT_HOPS):
+            entry = redirects.get(canonical(resolved))
+            if entry is None or entry['url'] == resolved:
+                break
+            resolved = entry['url']
+    return resolved
+
+
+def resolve(url):
+    """The URL to request for url - the remembered redirect target if there is one"""
+    resolved = _follow(url)
+    if resolved != url:
+        with _lock:
+            _stats['redirects_skipped'] += 1
+    return resolved
+
+
+def page_key(url):
+    """Canonical key of the page url ends up on (after remembered redirects)"""
+    return canonical(_follow(url))
+
+
+# ─────────────────────────────────────────────────────────────
+# DEDUP
+# ─────────────────────────────────────────────────────────────
+def dedupe(urls):
+    """
+    Merge URLs that are the same page. Returns (fetch_urls, fetch_url_for):
+    the unique URLs to fetch, in first-seen order, and {url: its fetch URL}.
+    """
+    fetch_by_key = {}
+    fetch_url_for = {}
+    for url in urls:
+        key = page_key(url)
+        if key not in fetch_by_key:
+            fetch_by_key[key] = _follow(url)
+        elif url not in fetch_url_for:
+            with _lock:
+                _stats['merged'] += 1
+        fetch_url_for[url] = fetch_by_key[key]
+    return list(fetch_by_key.values()), fetch_url_for
+
+
+def print_index_stats():
+    """Print how many duplicate URLs were merged and redirects skipped"""
+    with _lock:
+        stats = dict(_stats)
+    if any(stats.values()):
+        print(f"   🔗 URL index: {stats['merged']} duplicate URLs merged, "
+              f"{stats['redirects_skipped']} redirect hops skipped, "
+              f"{stats['redirects_learned']} redirects learned")
+
+
+# ─────────────────────────────────────────────────────────────
+# CONFIGURED URLS
+# ─────────────────────────────────────────────────────────────
+def _urls_in(value):
+    """Every http(s) string in a nested config value"""
+    if isinstance(value, str):
+        return [value] if value.startswith(('http://', 'https://')) else []
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return [url for item in value for url in _urls_in(item)]
+    return []
+
+
+def _config_dict(filename, name):
+    """A module-level literal (e.g. SUGGESTED_URLS) without importing the module"""
+    with open(os.path.join(BASE_DIR, filename), 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == name for t in node.targets):
+            return ast.literal_eval(node.value)
+    return {}
+
+
+def configured_urls():
+    """[(origin, group, url)] for every URL in the pipeline configs"""
+    found = []
+    for filename in CONFIG_FILES:
+        try:
+            with open(os.path.join(BASE_DIR, filename), 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for group, value in config.items():
+            found += [(filename, group, url) for url in _urls_in(value)]
+    for filename, name in CONFIG_DICTS:
+        try:
+            config = _config_dict(filename, name)
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for group, value in config.items():
+            found += [(f"{filename}:{name}", group, url) for url in _urls_in(value)]
+    return found
+
+
+def print_duplicates():
+    """Report canonical pages listed more than once across (or within) the configs"""
+    groups = {}
+    entries = configured_urls()
+    for origin, group, url in entries:
+        groups.setdefault(page_key(url), []).append((origin, group, url))
+    duplicates = {key: uses for key, uses in groups.items() if len(uses) > 1}
+
+    print(f"\n🔗 {len(entries)} configured URLs → {len(groups)} canonical pages "
+          f"({len(duplicates)} listed more than once)")
+    for key, uses in sorted(duplicates.items(), key=lambda kv: -len(kv[1])):
+        print(f"\n   {key}")
+        for origin, group, url in uses:
+            print(f"      {origin} [{group}] {url if url != key else ''}")
+
+
+if __name__ == '__main__':
+    print_duplicates()